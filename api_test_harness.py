@@ -1,141 +1,412 @@
 """
-End-to-end API integration test for a migration management service.
+End-to-end API test harness and load generator for the migration management service.
 
-This script simulates a complete user workflow via the REST API, including:
-  0. Authenticating to get a JWT token.
-  1. Creating credential and workload objects.
-  2. Defining a migration target.
-  3. Creating and initiating a migration task.
-  4. Polling for the migration's final status.
+Every virtual user authenticates once, reuses its JWT for all of its requests
+and repeatedly runs actions drawn from a configurable request mix. The main
+action is the full migration workflow:
+  1. Creating source and target credentials.
+  2. Creating source and target workloads (with generated, unique IPs).
+  3. Defining a migration target.
+  4. Creating and initiating a migration.
+  5. Polling for the migration's final status.
+
+Run without options it behaves as a single end-to-end test: one user runs the
+workflow once and the exit status tells whether it succeeded. With ``--users``
+it becomes a load test that reports throughput and p50/p95/p99 latency per
+endpoint.
+
+Examples:
+    python api_test_harness.py
+    python api_test_harness.py --users 50 --ramp-up 30 --duration 300 \\
+        --mix flow=1,list_workloads=5,get_migration=3 --report-json report.json
+
+Credentials are read from --username/--password, then from the
+HARNESS_USERNAME/HARNESS_PASSWORD environment variables, and are prompted for
+(once) only if neither is set.
 
 Prerequisites:
     - The Django development server must be running.
     - The Celery worker must be running.
+    - The outbox relay (python manage.py relay_outbox) must be running; it
+      queues the tasks of started migrations.
     - The Redis server must be available.
     - A user (e.g., superuser) must exist in the database.
 """
+import argparse
+import ipaddress
+import json
+import math
+import os
+import random
+import sys
+import threading
 import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from getpass import getpass
+
 import requests
-import sys
-from getpass import getpass 
 
 # Script configuration
 BASE_URL = "http://127.0.0.1:8000/api/v1"
 POLL_INTERVAL_SECONDS = 2
 MAX_POLL_ATTEMPTS = 15
+DEFAULT_MIX = "flow=1"
+REQUEST_TIMEOUT_SECONDS = 30
+
+
+class ApiError(Exception):
+    """Raised when an API call fails or returns an unexpected response."""
+
+
+class IpAllocator:
+    """
+    Hands out unique IPv4 addresses from 10.0.0.0/8.
+
+    The starting offset is random per run, so consecutive runs against the
+    same database do not collide on the unique ``ip_address`` constraint.
+    """
+
+    def __init__(self, network="10.0.0.0/8", seed=None):
+        self._network = ipaddress.ip_network(network)
+        self._next = random.Random(seed).randrange(1, self._network.num_addresses // 2)
+        self._lock = threading.Lock()
+
+    def allocate(self):
+        with self._lock:
+            address = self._network[self._next]
+            self._next += 1
+        return str(address)
+
+
+class Metrics:
+    """Thread-safe collector of per-endpoint latencies and failures."""
 
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies = defaultdict(list)
+        self._errors = defaultdict(int)
+        self.flows_succeeded = 0
+        self.flows_failed = 0
+        self.started_at = time.perf_counter()
 
-def make_request(method, endpoint, json_data=None, token=None):
-    """Wraps the requests library to perform an API call and handle errors."""
-    url = f"{BASE_URL}{endpoint}"
-    headers = {}
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
-        
-    try:
-        response = requests.request(method, url, json=json_data, headers=headers)
-        response.raise_for_status()
+    def record(self, endpoint, seconds, ok):
+        with self._lock:
+            self._latencies[endpoint].append(seconds)
+            if not ok:
+                self._errors[endpoint] += 1
+
+    def record_flow(self, ok):
+        with self._lock:
+            if ok:
+                self.flows_succeeded += 1
+            else:
+                self.flows_failed += 1
+
+    @staticmethod
+    def _percentile(sorted_values, percent):
+        """Nearest-rank percentile of an already sorted list."""
+        rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+        return sorted_values[rank - 1]
+
+    def summary(self):
+        """Return the aggregated report as a JSON-serializable dict."""
+        elapsed = time.perf_counter() - self.started_at
+        endpoints = {}
+        total_requests = 0
+        with self._lock:
+            for endpoint, values in sorted(self._latencies.items()):
+                values = sorted(values)
+                total_requests += len(values)
+                endpoints[endpoint] = {
+                    "requests": len(values),
+                    "errors": self._errors[endpoint],
+                    "throughput_rps": len(values) / elapsed if elapsed else 0.0,
+                    "p50_ms": self._percentile(values, 50) * 1000,
+                    "p95_ms": self._percentile(values, 95) * 1000,
+                    "p99_ms": self._percentile(values, 99) * 1000,
+                    "max_ms": values[-1] * 1000,
+                }
+            return {
+                "elapsed_s": elapsed,
+                "requests": total_requests,
+                "throughput_rps": total_requests / elapsed if elapsed else 0.0,
+                "flows_succeeded": self.flows_succeeded,
+                "flows_failed": self.flows_failed,
+                "endpoints": endpoints,
+            }
+
+
+class ApiClient:
+    """
+    A virtual user's HTTP session.
+
+    Authenticates once and reuses the access token for every request,
+    refreshing it with the refresh token when it expires.
+    """
+
+    def __init__(self, base_url, username, password, metrics):
+        self.base_url = base_url
+        self.metrics = metrics
+        self.session = requests.Session()
+        self._username = username
+        self._password = password
+        self._access = None
+        self._refresh = None
+
+    def authenticate(self):
+        """Authenticates with username/password to get a JWT token pair."""
+        token_data = self.request(
+            "POST", "/token/", "POST /token/", {"username": self._username, "password": self._password}, auth=False
+        )
+        if not token_data or "access" not in token_data:
+            raise ApiError("'access' token not found in authentication response.")
+        self._access, self._refresh = token_data["access"], token_data.get("refresh")
+
+    def _refresh_access_token(self):
+        if not self._refresh:
+            return self.authenticate()
+        token_data = self.request("POST", "/token/refresh/", "POST /token/refresh/", {"refresh": self._refresh}, auth=False)
+        self._access = token_data["access"]
+
+    def request(self, method, endpoint, label, json_data=None, auth=True, _retry=True):
+        """
+        Performs an API call, records its latency under ``label`` and returns the JSON body.
+
+        Raises:
+            ApiError: If the request fails or returns an error status.
+        """
+        url = f"{self.base_url}{endpoint}"
+        headers = {"Authorization": f"Bearer {self._access}"} if auth else {}
+        start = time.perf_counter()
+        try:
+            response = self.session.request(
+                method, url, json=json_data, headers=headers, timeout=REQUEST_TIMEOUT_SECONDS
+            )
+        except requests.exceptions.RequestException as e:
+            self.metrics.record(label, time.perf_counter() - start, ok=False)
+            raise ApiError(f"Request to {method.upper()} {url} failed: {e}") from e
+        will_retry = response.status_code == 401 and auth and _retry
+        self.metrics.record(label, time.perf_counter() - start, ok=response.ok or will_retry)
+
+        if will_retry:
+            self._refresh_access_token()
+            return self.request(method, endpoint, label, json_data, auth=auth, _retry=False)
+        if not response.ok:
+            raise ApiError(f"Request to {method.upper()} {url} failed with {response.status_code}: {response.text}")
         # Handle 204 No Content for DELETE requests
         return response.json() if response.status_code != 204 else None
-    except requests.exceptions.RequestException as e:
-        print(f"\nERROR: Request to {method.upper()} {url} failed.")
-        print(f"   Reason: {e}")
-        if e.response is not None:
-            print(f"   Response Body: {e.response.text}")
-        sys.exit(1)
-
-def get_auth_token(username, password):
-    """Authenticates with username/password to get a JWT access token."""
-    print("\n--- Authenticating to get JWT token ---")
-    auth_payload = {"username": username, "password": password}
-    token_data = make_request("POST", "/token/", auth_payload)
-    if not token_data or "access" not in token_data:
-        print("ERROR: 'access' token not found in authentication response.")
-        sys.exit(1)
-    print("Authentication successful.")
-    return token_data["access"]
-
-
-def main():
-    """Runs the main end-to-end test scenario."""
+
+
+class VirtualUser:
+    """Runs actions from the request mix on behalf of one simulated client."""
+
+    def __init__(self, index, client, ip_allocator, options, verbose=False):
+        self.index = index
+        self.client = client
+        self.ip_allocator = ip_allocator
+        self.options = options
+        self.verbose = verbose
+        self.migration_ids = []
+        self.rng = random.Random(index)
+
+    def log(self, message):
+        if self.verbose:
+            print(message)
+
+    def run_flow(self):
+        """Runs the create -> target -> migrate -> poll workflow once."""
+        client = self.client
+        tag = f"u{self.index}"
+
+        # Step 1: Create Credentials
+        self.log("\n--- Step 1: Creating Credentials ---")
+        source_creds = client.request(
+            "POST", "/credentials/", "POST /credentials/",
+            {"username": f"harness_source_user_{tag}", "password": "secure_password_1"},
+        )
+        target_creds = client.request(
+            "POST", "/credentials/", "POST /credentials/",
+            {"username": f"harness_target_user_{tag}", "password": "secure_password_2"},
+        )
+        self.log("Source and Target credentials created successfully.")
+
+        # Step 2: Create Source and Target Workloads
+        self.log("\n--- Step 2: Creating Source and Target Workloads ---")
+        source_workload = client.request(
+            "POST", "/workloads/", "POST /workloads/",
+            {
+                "name": f"E2E Test Source Server {tag}", "ip_address": self.ip_allocator.allocate(),
+                "credentials": source_creds['id'],
+                "mount_points": [{"name": "C:\\", "size_gb": 100}, {"name": "D:\\", "size_gb": 500}],
+            },
+        )
+        target_workload = client.request(
+            "POST", "/workloads/", "POST /workloads/",
+            {
+                "name": f"E2E Test Target VM {tag}", "ip_address": self.ip_allocator.allocate(),
+                "credentials": target_creds['id'], "mount_points": [],
+            },
+        )
+        self.log("Source and Target workloads created successfully.")
+        c_drive = next(mp for mp in source_workload['mount_points'] if mp['name'] == "C:\\")
+
+        # Step 3: Create Migration Target
+        self.log("\n--- Step 3: Creating Migration Target ---")
+        migration_target = client.request(
+            "POST", "/migration-targets/", "POST /migration-targets/",
+            {"cloud_type": "aws", "cloud_credentials": target_creds['id'], "target_vm": target_workload['id']},
+        )
+        self.log("Migration Target created successfully.")
+
+        # Step 4: Create and Run Migration
+        self.log("\n--- Step 4: Creating and Running Migration ---")
+        migration = client.request(
+            "POST", "/migrations/", "POST /migrations/",
+            {"source": source_workload['id'], "target": migration_target['id'], "selected_mount_points": [c_drive['id']]},
+        )
+        migration_id = migration['id']
+        self.migration_ids.append(migration_id)
+        self.log(f"Migration created with ID: {migration_id}")
+
+        run_response = client.request("POST", f"/migrations/{migration_id}/run/", "POST /migrations/{id}/run/")
+        self.log(f"Migration run command sent. Initial status: {run_response['state']}")
+
+        # Step 5: Monitor Migration Status
+        self.log("\n--- Step 5: Monitoring migration status ---")
+        for i in range(self.options.max_poll_attempts):
+            self.log(f"   Polling attempt {i + 1}/{self.options.max_poll_attempts}...")
+            migration_status = client.request("GET", f"/migrations/{migration_id}/", "GET /migrations/{id}/")
+            current_state = migration_status['state']
+            if current_state in ("success", "error"):
+                self.log(f"Migration finished with state: {current_state.upper()}")
+                return current_state == "success"
+            time.sleep(self.options.poll_interval)
+
+        self.log("Migration did not complete in the allotted time.")
+        return False
+
+    def list_workloads(self):
+        self.client.request("GET", "/workloads/", "GET /workloads/")
+        return True
+
+    def list_migrations(self):
+        self.client.request("GET", "/migrations/", "GET /migrations/")
+        return True
+
+    def get_migration(self):
+        if not self.migration_ids:
+            return self.list_migrations()
+        migration_id = self.rng.choice(self.migration_ids)
+        self.client.request("GET", f"/migrations/{migration_id}/", "GET /migrations/{id}/")
+        return True
+
+    ACTIONS = ("flow", "list_workloads", "list_migrations", "get_migration")
+
+    def run(self, mix, deadline, iterations, metrics):
+        """Runs actions until the deadline (or iteration count) is reached."""
+        actions, weights = zip(*mix.items())
+        completed = 0
+        while (deadline and time.monotonic() < deadline) or (not deadline and completed < iterations):
+            action = self.rng.choices(actions, weights)[0]
+            try:
+                ok = self.run_flow() if action == "flow" else getattr(self, action)()
+            except ApiError as e:
+                print(f"\nERROR [user {self.index}, {action}]: {e}", file=sys.stderr)
+                ok = False
+            if action == "flow":
+                metrics.record_flow(ok)
+            completed += 1
+
+
+def parse_mix(value):
+    """Parses ``action=weight,...`` into a dict, validating action names."""
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in VirtualUser.ACTIONS:
+            raise argparse.ArgumentTypeError(f"Unknown action '{name}'. Choose from: {', '.join(VirtualUser.ACTIONS)}.")
+        mix[name] = float(weight or 1)
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("The request mix needs at least one action with a positive weight.")
+    return mix
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--username", default=os.environ.get("HARNESS_USERNAME"))
+    parser.add_argument("--password", default=os.environ.get("HARNESS_PASSWORD"))
+    parser.add_argument("--users", type=int, default=1, help="Number of concurrent virtual users.")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Seconds over which user start-up is spread.")
+    parser.add_argument("--duration", type=float, default=0.0, help="Run for this many seconds (overrides --iterations).")
+    parser.add_argument("--iterations", type=int, default=1, help="Actions per user when no --duration is given.")
+    parser.add_argument(
+        "--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help="Weighted actions, e.g. flow=1,list_workloads=4."
+    )
+    parser.add_argument("--poll-interval", type=float, default=POLL_INTERVAL_SECONDS)
+    parser.add_argument("--max-poll-attempts", type=int, default=MAX_POLL_ATTEMPTS)
+    parser.add_argument("--seed", type=int, default=None, help="Seed for IP allocation and action choice.")
+    parser.add_argument("--report-json", help="Also write the report to this file.")
+    return parser.parse_args(argv)
+
+
+def print_report(report):
+    print("\n=== Load test report ===")
+    print(
+        f"Elapsed: {report['elapsed_s']:.1f}s  Requests: {report['requests']}  "
+        f"Throughput: {report['throughput_rps']:.1f} req/s  "
+        f"Flows: {report['flows_succeeded']} ok / {report['flows_failed']} failed"
+    )
+    print(f"\n{'Endpoint':<32} {'Reqs':>7} {'Errs':>6} {'RPS':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for endpoint, stats in report["endpoints"].items():
+        print(
+            f"{endpoint:<32} {stats['requests']:>7} {stats['errors']:>6} {stats['throughput_rps']:>8.1f} "
+            f"{stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f}"
+        )
+
+
+def main(argv=None):
+    """Runs the configured number of virtual users and reports the results."""
+    options = parse_args(argv)
     print("Starting API Test Harness...")
-    
-    # Step 0 - Authentication
-    username = input("Enter your Django superuser username: ")
-    password = getpass("Enter your Django superuser password: ")
-    access_token = get_auth_token(username, password)
-
-    # Step 1: Create Credentials
-    print("\n--- Step 1: Creating Credentials ---")
-    source_creds_payload = {"username": "harness_source_user", "password": "secure_password_1"}
-    target_creds_payload = {"username": "harness_target_user", "password": "secure_password_2"}
-    source_creds = make_request("POST", "/credentials/", source_creds_payload, token=access_token)
-    target_creds = make_request("POST", "/credentials/", target_creds_payload, token=access_token)
-    print("Source and Target credentials created successfully.")
-
-    # Step 2: Create Source and Target Workloads
-    print("\n--- Step 2: Creating Source and Target Workloads ---")
-   
-    source_workload_payload = {
-        "name": "E2E Test Source Server", "ip_address": "192.168.1.102",
-        "credentials": source_creds['id'],
-        "mount_points": [{"name": "C:\\", "size_gb": 100}, {"name": "D:\\", "size_gb": 500}]
-    }
-    target_workload_payload = {
-        "name": "E2E Test Target VM", "ip_address": "10.0.0.102",
-        "credentials": target_creds['id'], "mount_points": []
-    }
- 
-    source_workload = make_request("POST", "/workloads/", source_workload_payload, token=access_token)
-    target_workload = make_request("POST", "/workloads/", target_workload_payload, token=access_token)
-    print("Source and Target workloads created successfully.")
-    
-    c_drive = next(mp for mp in source_workload['mount_points'] if mp['name'] == "C:\\")
-
-    # Step 3: Create Migration Target
-    print("\n--- Step 3: Creating Migration Target ---")
-    migration_target_payload = {
-        "cloud_type": "aws", "cloud_credentials": target_creds['id'],
-        "target_vm": target_workload['id']
-    }
- 
-    migration_target = make_request("POST", "/migration-targets/", migration_target_payload, token=access_token)
-    print("Migration Target created successfully.")
-
-    # Step 4: Create and Run Migration
-    print("\n--- Step 4: Creating and Running Migration ---")
-    migration_payload = {
-        "source": source_workload['id'], "target": migration_target['id'],
-        "selected_mount_points": [c_drive['id']]
-    }
-
-    migration = make_request("POST", "/migrations/", migration_payload, token=access_token)
-    migration_id = migration['id']
-    print(f"Migration created with ID: {migration_id}")
-
-    run_response = make_request("POST", f"/migrations/{migration_id}/run/", token=access_token)
-    print(f"Migration run command sent. Initial status: {run_response['state']}")
-
-    # Step 5: Monitor Migration Status
-    print("\n--- Step 5: Monitoring migration status ---")
-    for i in range(MAX_POLL_ATTEMPTS):
-        print(f"   Polling attempt {i + 1}/{MAX_POLL_ATTEMPTS}...")
-        
-        migration_status = make_request("GET", f"/migrations/{migration_id}/", token=access_token)
-        current_state = migration_status['state']
-
-        if current_state in ("success", "error"):
-            print(f"Migration finished with state: {current_state.upper()}")
-            if current_state == "success":
-                print("\nTEST PASSED! End-to-end migration successful.")
-            else:
-                print("\nTEST FAILED! Migration ended in ERROR state.")
-            sys.exit(0 if current_state == "success" else 1)
 
-        time.sleep(POLL_INTERVAL_SECONDS)
+    # Step 0 - Authentication (credentials are asked for once, not per user)
+    username = options.username or input("Enter your Django superuser username: ")
+    password = options.password or getpass("Enter your Django superuser password: ")
+
+    metrics = Metrics()
+    ip_allocator = IpAllocator(seed=options.seed)
+    verbose = options.users == 1
+    deadline = time.monotonic() + options.ramp_up + options.duration if options.duration else None
+
+    def run_user(index):
+        # Spread user start-up evenly over the ramp-up period.
+        if options.users > 1 and options.ramp_up:
+            time.sleep(options.ramp_up * index / options.users)
+        client = ApiClient(options.base_url, username, password, metrics)
+        try:
+            client.authenticate()
+        except ApiError as e:
+            print(f"\nERROR [user {index}]: authentication failed: {e}", file=sys.stderr)
+            metrics.record_flow(False)
+            return
+        VirtualUser(index, client, ip_allocator, options, verbose).run(options.mix, deadline, options.iterations, metrics)
+
+    with ThreadPoolExecutor(max_workers=options.users) as executor:
+        list(executor.map(run_user, range(options.users)))
+
+    report = metrics.summary()
+    print_report(report)
+    if options.report_json:
+        with open(options.report_json, "w") as f:
+            json.dump(report, f, indent=2)
 
-    print("\nTEST FAILED! Migration did not complete in the allotted time.")
-    sys.exit(1)
+    failed = report["flows_failed"] > 0 or any(stats["errors"] for stats in report["endpoints"].values())
+    if verbose and options.iterations == 1 and not options.duration:
+        print("\nTEST FAILED!" if failed else "\nTEST PASSED! End-to-end migration successful.")
+    sys.exit(1 if failed else 0)
 
 
 if __name__ == "__main__":
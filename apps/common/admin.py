@@ -0,0 +1,155 @@
+"""
+Admin building blocks for tables with millions of rows.
+
+The stock changelist runs an exact ``COUNT(*)`` (twice with a search or
+filter), searches with ``icontains`` across joins and renders ``__str__``
+of every related object, one query each. :class:`ScalableModelAdmin`
+replaces those with:
+
+  * :class:`EstimatedCountPaginator`, which takes the row count from the
+    PostgreSQL statistics once it is above ``ADMIN_EXACT_COUNT_LIMIT``;
+  * prefix search: every search field is matched with ``istartswith``, and
+    a search term that is an IP address matches the ``ip_search_fields``
+    exactly, both of which can use an index. Fields on related models are
+    resolved to primary keys first, so the search never filters a join;
+  * autocomplete results that select only the columns ``__str__`` needs.
+"""
+import json
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.utils import get_fields_from_path, lookup_spawns_duplicates
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.core.validators import validate_ipv46_address
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+
+def estimate_count(queryset):
+    """
+    Return the planner's estimate of the rows in ``queryset``, or None.
+
+    Unfiltered querysets use the table statistics (``pg_class.reltuples``),
+    filtered ones the row estimate of ``EXPLAIN``. Only PostgreSQL keeps
+    such estimates; other databases and never-analysed tables return None.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        if not queryset.query.where and not queryset.query.distinct:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            estimate = cursor.fetchone()[0]
+        else:
+            sql, params = queryset.order_by().query.sql_with_params()
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            estimate = plan[0]["Plan"]["Plan Rows"]
+    return estimate if estimate >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that counts exactly only small result sets.
+
+    When the estimate of :func:`estimate_count` reaches
+    ``ADMIN_EXACT_COUNT_LIMIT``, it is used as the count, so the number of
+    results and pages shown is approximate.
+    """
+
+    @cached_property
+    def count(self):
+        estimate = estimate_count(self.object_list) if hasattr(self.object_list, "query") else None
+        if estimate is None or estimate < getattr(settings, "ADMIN_EXACT_COUNT_LIMIT", 10000):
+            return super().count
+        return estimate
+
+
+def _is_ip_address(value):
+    try:
+        validate_ipv46_address(value)
+    except ValidationError:
+        return False
+    return True
+
+
+class ScalableModelAdmin(admin.ModelAdmin):
+    """
+    ``ModelAdmin`` for large tables (see the module docstring).
+
+    ``search_fields`` are plain field paths, matched by prefix with the whole
+    search term.
+
+    Attributes:
+        ip_search_fields (tuple): Field paths matched exactly when the search
+            term is an IP address.
+        autocomplete_select_related (tuple): Relations ``__str__`` reads, joined
+            into autocomplete results and the selected options of widgets.
+        autocomplete_only (tuple): Fields ``__str__`` reads. When set,
+            autocomplete results load only these columns.
+    """
+
+    paginator = EstimatedCountPaginator
+    # The "N total" link of a filtered changelist costs a second COUNT(*).
+    show_full_result_count = False
+    ip_search_fields = ()
+    autocomplete_select_related = ()
+    autocomplete_only = ()
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        match = getattr(request, "resolver_match", None)
+        if match is not None and match.url_name == "autocomplete":
+            if self.autocomplete_select_related:
+                queryset = queryset.select_related(*self.autocomplete_select_related)
+            if self.autocomplete_only:
+                queryset = queryset.only(*self.autocomplete_only)
+        return queryset
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        if self.ip_search_fields and _is_ip_address(term):
+            fields, lookup = self.ip_search_fields, "exact"
+        else:
+            fields, lookup = self.get_search_fields(request), "istartswith"
+        condition = Q()
+        for field in fields:
+            condition |= self._search_condition(field, lookup, term)
+        may_have_duplicates = any(lookup_spawns_duplicates(self.opts, field) for field in fields)
+        return queryset.filter(condition), may_have_duplicates
+
+    def _search_condition(self, field, lookup, term):
+        relation, _, name = field.rpartition("__")
+        if not relation:
+            return Q(**{f"{field}__{lookup}": term})
+        # Matching the related rows first keeps each condition on an index of
+        # this table; an OR across joined tables cannot use one.
+        related_model = get_fields_from_path(self.model, relation)[-1].related_model
+        limit = getattr(settings, "ADMIN_SEARCH_RELATED_LIMIT", 1000)
+        pks = list(
+            related_model._default_manager.filter(**{f"{name}__{lookup}": term})
+            .order_by()
+            .values_list("pk", flat=True)[: limit + 1]
+        )
+        if len(pks) > limit:
+            return Q(**{f"{field}__{lookup}": term})
+        return Q(**{f"{relation}__in": pks})
+
+    def get_field_queryset(self, db, db_field, request):
+        queryset = super().get_field_queryset(db, db_field, request)
+        related_admin = self.admin_site._registry.get(db_field.remote_field.model)
+        related = getattr(related_admin, "autocomplete_select_related", ())
+        if related:
+            if queryset is None:
+                queryset = db_field.remote_field.model._default_manager.using(db)
+            queryset = queryset.select_related(*related)
+        return queryset
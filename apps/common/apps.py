@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class CommonConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.common'
+
+    def ready(self):
+        from . import tracing, user_state
+
+        tracing.connect_signals()
+        user_state.connect_signals()
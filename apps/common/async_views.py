@@ -0,0 +1,107 @@
+"""
+Async-native read views served under ``/api/v1/async/``.
+
+DRF views are synchronous. Under an ASGI server each request to one runs in
+a worker thread and holds it until the response is written. Views wrapped
+with :func:`async_read_view` run on the event loop instead: they
+authenticate the JWT, read through the async ORM and the readers' async
+methods, and answer with the same JSON as the matching DRF endpoint. A
+client polling a migration's status then costs a coroutine rather than a
+thread, so one ASGI process can hold many more open connections than a sync
+worker pool.
+
+Only reads are offered; writes stay on the DRF endpoints.
+"""
+import functools
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .authentication import check_token
+from .renderers import dumps, orjson
+from .user_state import aget_user_state, aload_user_state
+
+# Readers may hand datetimes to dumps() unformatted when orjson encodes them.
+NATIVE_VALUES = orjson is not None
+
+_jwt = JWTAuthentication()
+
+
+class ValidationError(Exception):
+    """Raised by a view for a bad request; ``detail`` becomes the 400 response body."""
+
+    def __init__(self, detail):
+        super().__init__(detail)
+        self.detail = detail
+
+
+def json_response(data, status=200, headers=None):
+    return HttpResponse(dumps(data), status=status, headers=headers, content_type="application/json")
+
+
+async def authenticate(request):
+    """
+    Return the user authenticated by the request's JWT, or None without credentials.
+
+    The checks are those of ``JWT_AUTH_MODE``: with ``"cached"`` the user
+    state comes from the auth cache, otherwise it is read from the database.
+
+    Raises:
+        InvalidToken: The token is malformed, expired or names no user.
+        AuthenticationFailed: The user is gone, inactive or the token was revoked.
+    """
+    header = _jwt.get_header(request)
+    raw_token = _jwt.get_raw_token(header) if header is not None else None
+    if raw_token is None:
+        return None
+    token = _jwt.get_validated_token(raw_token)
+    user_id = token.get(api_settings.USER_ID_CLAIM)
+    if user_id is None:
+        raise InvalidToken("Token contained no recognizable user identification")
+    if getattr(settings, "JWT_AUTH_MODE", "database") == "cached":
+        state = await aget_user_state(user_id)
+    else:
+        state = await aload_user_state(user_id)
+    check_token(token, state)
+    return api_settings.TOKEN_USER_CLASS(token)
+
+
+def async_read_view(view):
+    """
+    Turn ``async def view(request, ...)`` returning JSON data into a Django view.
+
+    The wrapper allows only GET and HEAD, requires a valid JWT and renders
+    errors the way DRF does: 401 with a ``WWW-Authenticate`` header, 404 for
+    ``Http404`` and 400 for :class:`ValidationError`.
+    """
+
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return json_response(
+                {"detail": f'Method "{request.method}" not allowed.'}, status=405, headers={"Allow": "GET, HEAD"}
+            )
+        challenge = {"WWW-Authenticate": _jwt.authenticate_header(request)}
+        try:
+            user = await authenticate(request)
+        except (InvalidToken, AuthenticationFailed) as exc:
+            detail = exc.detail if isinstance(exc.detail, dict) else {"detail": exc.detail}
+            return json_response(detail, status=401, headers=challenge)
+        if user is None:
+            return json_response(
+                {"detail": "Authentication credentials were not provided."}, status=401, headers=challenge
+            )
+        request.user = user
+
+        try:
+            data = await view(request, *args, **kwargs)
+        except Http404:
+            return json_response({"detail": "Not found."}, status=404)
+        except ValidationError as exc:
+            return json_response(exc.detail, status=400)
+        return json_response(data)
+
+    return wrapper
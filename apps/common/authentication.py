@@ -0,0 +1,93 @@
+"""
+Stateless JWT authentication backed by a short-lived user state cache.
+
+``CachedJWTAuthentication`` builds ``request.user`` from the token claims (a
+simplejwt ``TokenUser``) instead of loading the ``User`` row. Each request is
+still checked against the user's current state: active flag, password hash,
+staff and superuser flags, and the time before which their tokens were
+revoked. That state is kept in the ``auth`` cache for
+``AUTH_USER_CACHE_TTL`` seconds and dropped whenever the user or their
+revocation record is saved (see :mod:`apps.common.user_state`).
+
+Enable it with ``JWT_AUTH_MODE=cached``. The cache is in-process by default.
+Point ``AUTH_CACHE_URL`` at Redis so that all workers share it and see
+revocations immediately; otherwise a revocation made in another process
+takes effect within the TTL.
+"""
+import logging
+import time
+
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import serializers as jwt_serializers
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import TokenRevocation
+from .user_state import ROLE_CLAIMS, get_user_state, load_user_state
+
+logger = logging.getLogger(__name__)
+
+AUTH_TIME_CLAIM = "auth_time"
+
+
+def check_token(token, state):
+    """
+    Raise ``AuthenticationFailed`` unless ``token`` is still valid for a user in ``state``.
+    """
+    if state is None:
+        raise AuthenticationFailed(_("User not found"), code="user_not_found")
+    if not state["is_active"]:
+        raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+    if api_settings.CHECK_REVOKE_TOKEN and token.get(api_settings.REVOKE_TOKEN_CLAIM) != state["password"]:
+        raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+    revoked_before = state["revoked_before"]
+    if revoked_before is not None and token.get(AUTH_TIME_CLAIM, token.get("iat", 0)) <= revoked_before:
+        raise AuthenticationFailed(_("Token has been revoked."), code="token_revoked")
+    if any(token.get(claim, False) != state[claim] for claim in ROLE_CLAIMS):
+        raise AuthenticationFailed(_("The user's permissions have changed."), code="token_stale")
+
+
+def revoke_tokens(user):
+    """Revoke every token issued to ``user`` so far; they must log in again."""
+    # Tokens carry whole-second timestamps, so a token issued in the same
+    # second as the revocation is revoked too.
+    revoked_before = timezone.now().replace(microsecond=0)
+    TokenRevocation.objects.update_or_create(user=user, defaults={"revoked_before": revoked_before})
+    logger.info(f"Revoked all tokens issued to user {user.pk} before {revoked_before.isoformat()}.")
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """Authenticates a JWT without reading the user table on cache hits."""
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        check_token(validated_token, get_user_state(validated_token[api_settings.USER_ID_CLAIM]))
+        return api_settings.TOKEN_USER_CLASS(validated_token)
+
+
+class TokenObtainPairSerializer(jwt_serializers.TokenObtainPairSerializer):
+    """Adds the claims ``CachedJWTAuthentication`` builds the request user from."""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token["username"] = user.get_username()
+        for claim in ROLE_CLAIMS:
+            token[claim] = getattr(user, claim)
+        # Unlike "iat", this claim is copied into refreshed access tokens.
+        token[AUTH_TIME_CLAIM] = int(time.time())
+        return token
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    """Refuses to refresh tokens that ``CachedJWTAuthentication`` would reject."""
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        user_id = refresh.get(api_settings.USER_ID_CLAIM)
+        if user_id is not None:
+            check_token(refresh, load_user_state(user_id))
+        return super().validate(attrs)
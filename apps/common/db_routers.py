@@ -0,0 +1,190 @@
+"""
+Read-replica routing.
+
+When ``DATABASE_REPLICA_URLS`` lists replicas, they are configured as the
+``replica_<n>`` database aliases and :class:`ReplicaRouter` is installed.
+Reads go to a random replica only while replica reads are enabled for the
+current context, which :class:`ReplicaRoutingMiddleware` does for:
+
+  * safe-method (GET, HEAD, OPTIONS) API requests, and
+  * admin changelist pages.
+
+Everything else reads and writes the primary (``default``): unsafe requests,
+Celery tasks, management commands and code wrapped in :func:`use_primary`.
+Once a context writes, its later reads go to the primary too. A response to
+an unsafe request sets the ``REPLICA_STICKY_COOKIE`` cookie for
+``REPLICA_STICKY_SECONDS``; requests carrying it read from the primary, so
+clients see their own writes despite replication lag.
+
+A streaming response is consumed after the middleware has returned, so its
+reads would otherwise go to the primary; views wrap the stream in
+:func:`routed_iterator` to keep reading where the request does.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+API_PATH_PREFIX = "/api/"
+REPLICA_ALIAS_PREFIX = "replica_"
+
+
+class _RoutingState:
+    __slots__ = ("replica_reads",)
+
+    def __init__(self, replica_reads):
+        self.replica_reads = replica_reads
+
+
+_state = ContextVar("db_routing_state", default=None)
+
+
+def _database(alias):
+    settings_dict = connections[alias].settings_dict
+    return settings_dict["NAME"], settings_dict["HOST"], settings_dict["PORT"]
+
+
+def replica_aliases():
+    """
+    Return the aliases of the replicas that are separate databases from the primary.
+
+    A replica that points at the primary's own database, as a test mirror
+    does, is skipped: reading through the primary's connection also sees
+    rows the current transaction has not committed yet.
+    """
+    primary = _database(DEFAULT_DB_ALIAS)
+    return [
+        alias
+        for alias in settings.DATABASES
+        if alias.startswith(REPLICA_ALIAS_PREFIX) and _database(alias) != primary
+    ]
+
+
+@contextmanager
+def _routing(replica_reads):
+    token = _state.set(_RoutingState(replica_reads))
+    try:
+        yield
+    finally:
+        _state.reset(token)
+
+
+def use_replicas():
+    """Read from the replicas inside the block (context manager or decorator)."""
+    return _routing(True)
+
+
+def use_primary():
+    """Read from the primary inside the block (context manager or decorator)."""
+    return _routing(False)
+
+
+def routed_iterator(iterable):
+    """
+    Return an iterator over ``iterable`` that reads from the database the current context reads from.
+
+    Each item is produced in a routing context of its own, because a
+    streaming response is iterated after the request's context has ended,
+    possibly in another thread.
+    """
+    replica_reads = reading_from_replicas()
+
+    def items(iterator):
+        while True:
+            with _routing(replica_reads):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    return items(iter(iterable))
+
+
+def reading_from_replicas():
+    """Return True if reads in the current context may go to a replica."""
+    state = _state.get()
+    return state is not None and state.replica_reads
+
+
+class ReplicaRouter:
+    """Sends reads to a replica when the context allows it and everything else to the primary."""
+
+    def db_for_read(self, model, **hints):
+        if reading_from_replicas():
+            replicas = replica_aliases()
+            if replicas:
+                return random.choice(replicas)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Later reads in this context must see the write.
+        state = _state.get()
+        if state is not None:
+            state.replica_reads = False
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        databases = (obj1._state.db, obj2._state.db)
+        if all(db == DEFAULT_DB_ALIAS or db.startswith(REPLICA_ALIAS_PREFIX) for db in databases):
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive the schema through replication.
+        return not db.startswith(REPLICA_ALIAS_PREFIX)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Enables replica reads for safe API requests and admin changelists.
+
+    Responses to unsafe requests set the sticky cookie, so the client's next
+    reads go to the primary for ``REPLICA_STICKY_SECONDS``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.cookie_name = getattr(settings, "REPLICA_STICKY_COOKIE", "db_primary")
+        self.sticky_seconds = getattr(settings, "REPLICA_STICKY_SECONDS", 10)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with _routing(self.reads_from_replica(request)):
+            response = self.get_response(request)
+        return self.process_response(request, response)
+
+    async def __acall__(self, request):
+        with _routing(self.reads_from_replica(request)):
+            response = await self.get_response(request)
+        return self.process_response(request, response)
+
+    def reads_from_replica(self, request):
+        if request.method not in SAFE_METHODS or request.COOKIES.get(self.cookie_name):
+            return False
+        if request.path_info.startswith(API_PATH_PREFIX):
+            return True
+        # Deferred so that importing the router (as every process does) does not load the URL machinery.
+        from django.urls import Resolver404, resolve
+
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return False
+        return match.namespace == "admin" and (match.url_name or "").endswith("_changelist")
+
+    def process_response(self, request, response):
+        if request.method not in SAFE_METHODS and self.sticky_seconds > 0:
+            response.set_cookie(self.cookie_name, "1", max_age=self.sticky_seconds, httponly=True, samesite="Lax")
+        return response
@@ -0,0 +1,143 @@
+"""
+Named exclusive locks shared by every process.
+
+:func:`exclusive` holds a lock for the duration of a block. Callers wait in
+line for it for up to ``LOCK_WAIT_TIMEOUT`` seconds, then get
+:class:`LockTimeout`. The backend is chosen with ``LOCK_BACKEND``:
+
+  * ``"database"``: PostgreSQL transaction-level advisory locks. The block
+    runs in a transaction that holds the lock until it commits or rolls back,
+    and a crashed holder releases it with its connection. Waiters are served
+    in arrival order.
+  * ``"redis"``: a Redis lock on ``LOCK_REDIS_URL``, expiring after
+    ``LOCK_REDIS_TTL`` seconds if its holder dies. Waiters poll, so the order
+    they get the lock in is not guaranteed.
+  * ``"local"``: a lock per name in this process only; for development and
+    tests on SQLite.
+  * ``"auto"`` (default): ``"database"`` on PostgreSQL, ``"local"`` otherwise.
+"""
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+
+from .tracing import span
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("auto", "database", "redis", "local")
+
+_local_locks = {}
+_local_guard = threading.Lock()
+
+
+class LockTimeout(Exception):
+    """The lock was not acquired within the wait timeout."""
+
+
+def lock_key(name):
+    """Return the signed 64-bit advisory lock key of the lock ``name``."""
+    return int.from_bytes(hashlib.blake2b(name.encode(), digest_size=8).digest(), "big", signed=True)
+
+
+def get_backend():
+    """Return the configured lock backend, with ``"auto"`` resolved."""
+    backend = getattr(settings, "LOCK_BACKEND", "auto")
+    if backend not in BACKENDS:
+        raise ValueError(f"LOCK_BACKEND must be one of {', '.join(BACKENDS)}, not '{backend}'.")
+    if backend == "auto":
+        return "database" if connections[DEFAULT_DB_ALIAS].vendor == "postgresql" else "local"
+    return backend
+
+
+@contextmanager
+def exclusive(name, timeout=None):
+    """
+    Hold the lock ``name`` for the duration of the block.
+
+    Args:
+        name (str): Lock name; unrelated names never block each other.
+        timeout (float): Seconds to wait for the lock (default
+            ``LOCK_WAIT_TIMEOUT``); 0 fails at once if it is held.
+
+    Raises:
+        LockTimeout: The lock is still held by another holder after ``timeout``.
+    """
+    if timeout is None:
+        timeout = getattr(settings, "LOCK_WAIT_TIMEOUT", 300)
+    backend = get_backend()
+    acquire = {"database": _database_lock, "redis": _redis_lock, "local": _local_lock}[backend]
+    with acquire(name, timeout):
+        yield
+
+
+@contextmanager
+def _database_lock(name, timeout):
+    connection = connections[DEFAULT_DB_ALIAS]
+    with transaction.atomic(using=DEFAULT_DB_ALIAS):
+        with span("lock.wait", lock=name, backend="database"), connection.cursor() as cursor:
+            if timeout <= 0:
+                cursor.execute("SELECT pg_try_advisory_xact_lock(%s)", [lock_key(name)])
+                if not cursor.fetchone()[0]:
+                    raise LockTimeout(f"Lock '{name}' is held.")
+            else:
+                cursor.execute("SELECT current_setting('lock_timeout')")
+                previous = cursor.fetchone()[0]
+                cursor.execute("SELECT set_config('lock_timeout', %s, true)", [f"{int(timeout * 1000)}ms"])
+                try:
+                    cursor.execute("SELECT pg_advisory_xact_lock(%s)", [lock_key(name)])
+                except OperationalError as exc:
+                    raise LockTimeout(f"Lock '{name}' was not acquired within {timeout}s.") from exc
+                # The rest of the transaction keeps the usual lock timeout.
+                cursor.execute("SELECT set_config('lock_timeout', %s, true)", [previous])
+        yield
+
+
+@lru_cache(maxsize=None)
+def _redis_client(url):
+    import redis
+
+    return redis.Redis.from_url(url)
+
+
+@contextmanager
+def _redis_lock(name, timeout):
+    from redis.exceptions import LockError
+
+    client = _redis_client(settings.LOCK_REDIS_URL)
+    lock = client.lock(f"lock:{name}", timeout=getattr(settings, "LOCK_REDIS_TTL", 600))
+    with span("lock.wait", lock=name, backend="redis"):
+        if not lock.acquire(blocking=timeout > 0, blocking_timeout=timeout if timeout > 0 else None):
+            raise LockTimeout(f"Lock '{name}' was not acquired within {timeout}s.")
+    try:
+        yield
+    finally:
+        try:
+            lock.release()
+        except LockError:
+            logger.warning(f"Lock '{name}' expired before it was released; raise LOCK_REDIS_TTL.")
+
+
+@contextmanager
+def _local_lock(name, timeout):
+    with _local_guard:
+        entry = _local_locks.setdefault(name, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with span("lock.wait", lock=name, backend="local"):
+            acquired = entry[0].acquire(timeout=timeout) if timeout > 0 else entry[0].acquire(blocking=False)
+        if not acquired:
+            raise LockTimeout(f"Lock '{name}' was not acquired within {timeout}s.")
+        try:
+            yield
+        finally:
+            entry[0].release()
+    finally:
+        with _local_guard:
+            entry[1] -= 1
+            if not entry[1]:
+                del _local_locks[name]
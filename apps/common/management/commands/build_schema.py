@@ -0,0 +1,43 @@
+"""
+Management command that pre-renders the OpenAPI schema.
+
+Writes the schema in every format served by ``/api/v1/schema/`` to
+``OPENAPI_SCHEMA_DIR``, named after the current code version, and removes
+files left by earlier versions. Run it at build or deploy time so that API
+processes read the schema from disk instead of generating it.
+
+Example:
+    python manage.py build_schema
+"""
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.common.schema import code_version, generate_schema, render_schema, schema_path
+
+
+class Command(BaseCommand):
+    help = "Pre-render the OpenAPI schema for the current code version."
+
+    def handle(self, *args, **options):
+        if not settings.ROOT_URLCONF or not apps.is_installed("drf_spectacular"):
+            raise CommandError("The OpenAPI schema needs the API settings; config.settings_worker has no API.")
+        directory = Path(settings.OPENAPI_SCHEMA_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        version = code_version()
+        written = set()
+        for schema_format, content in render_schema(generate_schema()).items():
+            path = schema_path(schema_format, version)
+            temporary = path.with_suffix(path.suffix + ".tmp")
+            temporary.write_bytes(content)
+            # Running servers may read the file concurrently; never expose a partial one.
+            temporary.replace(path)
+            written.add(path)
+            self.stdout.write(f"Wrote {path}")
+
+        for stale in directory.glob("openapi-*.*"):
+            if stale not in written:
+                stale.unlink()
+        self.stdout.write(self.style.SUCCESS(f"OpenAPI schema version {version} is ready."))
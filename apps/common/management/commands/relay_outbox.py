@@ -0,0 +1,63 @@
+"""
+Management command that publishes queued Celery tasks from the outbox.
+
+Runs until interrupted: publishes pending messages in batches, waits
+``OUTBOX_POLL_INTERVAL`` seconds whenever none are left, backs off while
+the broker is unavailable and deletes messages published more than
+``OUTBOX_RETENTION_HOURS`` ago. Several relays may run at once.
+
+Example:
+    python manage.py relay_outbox
+    python manage.py relay_outbox --once
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.common.db_routers import use_primary
+from apps.common.outbox import prune_published, publish_pending
+
+# Seconds between pruning runs.
+PRUNE_INTERVAL = 3600
+# Longest wait after repeated broker failures, in seconds.
+MAX_BACKOFF = 30
+
+
+class Command(BaseCommand):
+    help = "Publish the Celery tasks queued in the transactional outbox."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=None, help="Messages per batch (default OUTBOX_BATCH_SIZE)."
+        )
+        parser.add_argument(
+            "--interval", type=float, default=None, help="Idle wait in seconds (default OUTBOX_POLL_INTERVAL)."
+        )
+        parser.add_argument("--once", action="store_true", help="Publish every pending message, then exit.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"] or settings.OUTBOX_BATCH_SIZE
+        interval = settings.OUTBOX_POLL_INTERVAL if options["interval"] is None else options["interval"]
+        backoff = interval
+        next_prune = time.monotonic()
+        with use_primary():
+            while True:
+                published, failed = publish_pending(batch_size)
+                if published:
+                    self.stdout.write(f"Published {published} task(s).")
+                if failed:
+                    if options["once"]:
+                        raise CommandError("The broker rejected a message; see the log.")
+                    time.sleep(backoff)
+                    backoff = min(max(backoff, 0.5) * 2, MAX_BACKOFF)
+                    continue
+                backoff = interval
+                if published == batch_size:
+                    continue
+                if options["once"]:
+                    break
+                if time.monotonic() >= next_prune:
+                    prune_published()
+                    next_prune = time.monotonic() + PRUNE_INTERVAL
+                time.sleep(interval)
@@ -0,0 +1,33 @@
+"""
+Management command that revokes every JWT issued to a user.
+
+Access and refresh tokens issued so far stop working immediately on servers
+sharing the user state cache, and within ``AUTH_USER_CACHE_TTL`` seconds
+elsewhere.
+
+Example:
+    python manage.py revoke_tokens automation-bot
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.common.authentication import revoke_tokens
+
+
+class Command(BaseCommand):
+    help = "Revoke every JWT issued to the given users."
+
+    def add_arguments(self, parser):
+        parser.add_argument("usernames", nargs="+", help="Users whose tokens are revoked.")
+
+    def handle(self, *args, usernames, **options):
+        user_model = get_user_model()
+        users = {user.get_username(): user for user in user_model.objects.filter(**{
+            f"{user_model.USERNAME_FIELD}__in": usernames
+        })}
+        missing = sorted(set(usernames) - set(users))
+        if missing:
+            raise CommandError(f"Unknown users: {', '.join(missing)}")
+        for username in usernames:
+            revoke_tokens(users[username])
+            self.stdout.write(self.style.SUCCESS(f"Revoked tokens of {username}."))
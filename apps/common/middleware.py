@@ -0,0 +1,167 @@
+"""
+Request-level middleware shared by all API applications.
+
+The profiling middleware in this module is opt-in: it is always listed in
+``settings.MIDDLEWARE`` but removes itself from the stack at startup unless
+``PROFILING_ENABLED`` is set, so it costs nothing in a normal deployment.
+"""
+import cProfile
+import logging
+import random
+import re
+import time
+import uuid
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9_-]+")
+
+
+class _RequestTimings:
+    """Mutable accumulator for the timings collected during one request."""
+
+    __slots__ = ("db_seconds", "query_count", "render_started", "render_seconds")
+
+    def __init__(self):
+        self.db_seconds = 0.0
+        self.query_count = 0
+        self.render_started = None
+        self.render_seconds = 0.0
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        """A database execute wrapper that times every query it sees."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - start
+            self.query_count += 1
+
+
+class RequestProfilingMiddleware:
+    """
+    Measures where the time of a request goes and reports it.
+
+    For every request the middleware:
+      * attaches a ``Server-Timing`` header with the time spent in SQL (plus
+        the query count), in the view outside of SQL (serializer field
+        conversion, ``EncryptedCharField`` decryption, business logic), in
+        response rendering (JSON encoding) and in total;
+      * logs the request through the ``apps`` JSON logger when it is slower
+        than ``PROFILING_SLOW_REQUEST_MS`` or runs more queries than
+        ``PROFILING_QUERY_THRESHOLD``;
+      * for a ``PROFILING_SAMPLE_RATE`` fraction of requests, runs the request
+        under cProfile and writes a pstats-compatible dump into
+        ``PROFILING_DUMP_DIR`` for offline analysis (``python -m pstats``,
+        snakeviz, ...).
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PROFILING_ENABLED", False):
+            raise MiddlewareNotUsed("Request profiling is disabled.")
+        self.get_response = get_response
+        self.slow_request_ms = settings.PROFILING_SLOW_REQUEST_MS
+        self.query_threshold = settings.PROFILING_QUERY_THRESHOLD
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+        self.dump_dir = Path(settings.PROFILING_DUMP_DIR)
+
+    def __call__(self, request):
+        timings = _RequestTimings()
+        request._profiling_timings = timings
+        profiler = cProfile.Profile() if self._should_sample() else None
+
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timings.db_wrapper))
+            if profiler is not None:
+                profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+        total_seconds = time.perf_counter() - start
+
+        dump_path = self._dump_profile(profiler, request) if profiler is not None else None
+        response["Server-Timing"] = self._server_timing(timings, total_seconds)
+        self._log_if_notable(request, response, timings, total_seconds, dump_path)
+        return response
+
+    def process_template_response(self, request, response):
+        """
+        Time the rendering step of DRF (and other template) responses.
+
+        Rendering happens after the view returns, so the start is recorded here
+        and the end in a post-render callback.
+        """
+        timings = getattr(request, "_profiling_timings", None)
+        if timings is not None:
+            timings.render_started = time.perf_counter()
+
+            def _record_render_end(rendered_response):
+                timings.render_seconds = time.perf_counter() - timings.render_started
+
+            response.add_post_render_callback(_record_render_end)
+        return response
+
+    def _should_sample(self):
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    @staticmethod
+    def _server_timing(timings, total_seconds):
+        """Build the ``Server-Timing`` header value (durations in milliseconds)."""
+        db_ms = timings.db_seconds * 1000
+        render_ms = timings.render_seconds * 1000
+        total_ms = total_seconds * 1000
+        app_ms = max(total_ms - db_ms - render_ms, 0.0)
+        return ", ".join(
+            (
+                f'db;dur={db_ms:.2f};desc="{timings.query_count} queries"',
+                f"app;dur={app_ms:.2f}",
+                f"serialize;dur={render_ms:.2f}",
+                f"total;dur={total_ms:.2f}",
+            )
+        )
+
+    def _dump_profile(self, profiler, request):
+        """Write the collected profile to disk and return its path."""
+        slug = _UNSAFE_FILENAME_CHARS.sub("_", request.path.strip("/")) or "root"
+        filename = f"{time.strftime('%Y%m%dT%H%M%S')}-{request.method}-{slug}-{uuid.uuid4().hex[:8]}.prof"
+        path = self.dump_dir / filename
+        try:
+            self.dump_dir.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(path)
+        except OSError as e:
+            logger.warning(f"Could not write profile dump to {path}: {e}")
+            return None
+        return path
+
+    def _log_if_notable(self, request, response, timings, total_seconds, dump_path):
+        total_ms = total_seconds * 1000
+        is_slow = total_ms >= self.slow_request_ms
+        is_chatty = timings.query_count >= self.query_threshold
+        if not (is_slow or is_chatty or dump_path):
+            return
+
+        extra = {
+            "method": request.method,
+            "path": request.path,
+            "status_code": response.status_code,
+            "duration_ms": round(total_ms, 2),
+            "db_ms": round(timings.db_seconds * 1000, 2),
+            "query_count": timings.query_count,
+            "serialize_ms": round(timings.render_seconds * 1000, 2),
+            "profile_dump": str(dump_path) if dump_path else None,
+        }
+        if is_slow or is_chatty:
+            reason = "slow" if is_slow else "query-heavy"
+            logger.warning(f"{reason.capitalize()} request: {request.method} {request.path}", extra=extra)
+        else:
+            logger.info(f"Profiled request: {request.method} {request.path}", extra=extra)
@@ -5,6 +5,7 @@ different applications within the project to enforce consistency and reduce
 code duplication, following the DRY (Don't Repeat Yourself) principle.
 """
 import uuid
+from django.conf import settings
 from django.db import models
 
 
@@ -36,3 +37,70 @@ class TimestampedModel(models.Model):
         abstract = True
         # Default ordering for queries, newest first.
         ordering = ['-created_at']
+
+
+class TokenRevocation(models.Model):
+    """Marks every JWT issued to a user before ``revoked_before`` as revoked.
+
+    Checked by :class:`apps.common.authentication.CachedJWTAuthentication`.
+
+    Attributes:
+        user (User): The user whose tokens are revoked.
+        revoked_before (DateTimeField): Tokens issued at or before this time are rejected.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="token_revocation",
+    )
+    revoked_before = models.DateTimeField(
+        help_text="Tokens issued at or before this time are rejected."
+    )
+
+    def __str__(self):
+        return f"Tokens of user {self.user_id} revoked before {self.revoked_before}"
+
+
+class OutboxMessage(models.Model):
+    """A Celery task to publish once the transaction that queued it commits.
+
+    Rows are written with :func:`apps.common.outbox.enqueue` in the same
+    transaction as the data the task reads, and published to the broker by
+    the ``relay_outbox`` command. A task is therefore never published for a
+    rolled-back change, and never lost when the broker is unavailable.
+
+    Attributes:
+        task_name (str): Registered name of the Celery task.
+        args (list): Positional arguments of the task.
+        kwargs (dict): Keyword arguments of the task.
+        trace_id (str): Trace the task continues (see apps.common.tracing).
+        parent_span_id (str): Span that queued the task.
+        created_at (DateTimeField): When the task was queued.
+        published_at (DateTimeField): When the relay published it; null while pending.
+        attempts (int): Failed publish attempts.
+        last_error (str): Error of the last failed attempt.
+    """
+    id = models.BigAutoField(primary_key=True)
+    task_name = models.CharField(max_length=255)
+    args = models.JSONField(default=list)
+    kwargs = models.JSONField(default=dict)
+    trace_id = models.CharField(max_length=32, blank=True)
+    parent_span_id = models.CharField(max_length=16, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    published_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        # Published in the order they were queued.
+        ordering = ['id']
+        indexes = [
+            # The relay only reads pending rows, a small part of the table.
+            models.Index(fields=['id'], name='outbox_pending_idx', condition=models.Q(published_at__isnull=True)),
+            models.Index(fields=['published_at'], name='outbox_published_idx'),
+        ]
+
+    def __str__(self):
+        state = f"published {self.published_at}" if self.published_at else "pending"
+        return f"{self.task_name} #{self.pk} ({state})"
@@ -0,0 +1,104 @@
+"""
+Transactional outbox for Celery tasks.
+
+``task.delay()`` inside a request makes the request wait for the broker,
+fails it when the broker is unavailable, and can publish a task before the
+data it reads is committed (or for a change that is then rolled back).
+:func:`enqueue` instead inserts an :class:`~apps.common.models.OutboxMessage`
+in the caller's transaction. The ``relay_outbox`` command publishes pending
+messages in batches with :func:`publish_pending`.
+
+Delivery is at least once: if the relay stops after publishing a batch but
+before marking it, the batch is published again. Each message is published
+with the task id ``outbox-<id>``, so a repeat can be recognised, and tasks
+must be idempotent.
+
+Configuration (``settings``):
+    OUTBOX_BATCH_SIZE: Messages published per transaction.
+    OUTBOX_POLL_INTERVAL: Seconds the relay waits when no messages are pending.
+    OUTBOX_RETENTION_HOURS: Hours published messages are kept.
+"""
+import logging
+from contextlib import nullcontext
+from datetime import timedelta
+
+from celery import current_app
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils import timezone
+
+from .models import OutboxMessage
+from .tracing import get_span_id, get_trace_id, trace_context
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(task, args=(), kwargs=None):
+    """
+    Queue ``task`` (a Celery task or its name) to be published after commit.
+
+    Call it inside the transaction that writes the data the task reads. The
+    current trace context is stored with the message and continued by the task.
+    """
+    return OutboxMessage.objects.using(DEFAULT_DB_ALIAS).create(
+        task_name=getattr(task, "name", task),
+        args=list(args),
+        kwargs=kwargs or {},
+        trace_id=get_trace_id() or "",
+        parent_span_id=get_span_id() or "",
+    )
+
+
+def _publish(message):
+    context = trace_context(message.trace_id, message.parent_span_id or None) if message.trace_id else nullcontext()
+    with context:
+        current_app.send_task(
+            message.task_name, args=message.args, kwargs=message.kwargs, task_id=f"outbox-{message.pk}"
+        )
+
+
+def publish_pending(batch_size=None):
+    """
+    Publish up to ``batch_size`` pending messages, oldest first.
+
+    Rows are locked with ``SKIP LOCKED``, so several relays can run side by
+    side. Publishing stops at the first broker error; the failed message
+    records the error and is retried on the next call.
+
+    Returns:
+        tuple: ``(published, failed)``, the number of messages published and
+        the number whose publishing failed (0 or 1).
+    """
+    batch_size = batch_size or getattr(settings, "OUTBOX_BATCH_SIZE", 100)
+    with transaction.atomic(using=DEFAULT_DB_ALIAS):
+        messages = list(
+            OutboxMessage.objects.using(DEFAULT_DB_ALIAS)
+            .select_for_update(skip_locked=True)
+            .filter(published_at__isnull=True)
+            .order_by("id")[:batch_size]
+        )
+        published = []
+        failed = []
+        for message in messages:
+            try:
+                _publish(message)
+            except Exception as exc:
+                logger.warning(f"Publishing outbox message {message.pk} ({message.task_name}) failed: {exc}")
+                message.attempts += 1
+                message.last_error = f"{type(exc).__name__}: {exc}"
+                failed.append(message)
+                break
+            message.published_at = timezone.now()
+            published.append(message)
+        OutboxMessage.objects.using(DEFAULT_DB_ALIAS).bulk_update(published, ["published_at"])
+        OutboxMessage.objects.using(DEFAULT_DB_ALIAS).bulk_update(failed, ["attempts", "last_error"])
+    return len(published), len(failed)
+
+
+def prune_published(retention=None):
+    """Delete messages published more than ``retention`` ago; return how many."""
+    if retention is None:
+        retention = timedelta(hours=getattr(settings, "OUTBOX_RETENTION_HOURS", 24))
+    cutoff = timezone.now() - retention
+    deleted, _ = OutboxMessage.objects.using(DEFAULT_DB_ALIAS).filter(published_at__lt=cutoff).delete()
+    return deleted
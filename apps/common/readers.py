@@ -0,0 +1,125 @@
+"""
+Values-based read path for list endpoints.
+
+A reader builds the same JSON structure as a viewset's serializer from
+``.values()`` rows and a few grouped child queries, without instantiating
+models or serializer fields. Each concrete reader mirrors one serializer's
+``Meta.fields``, and the contract tests compare both outputs byte for byte.
+
+Reader output keeps ``uuid.UUID`` values as they are; every JSON renderer in
+the project encodes them exactly as the serializers do. Datetimes are
+pre-formatted like DRF's ``DateTimeField`` unless the accepted renderer
+declares ``native_values`` (the orjson renderers), which encodes them in the
+same format itself.
+"""
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.response import Response
+
+# Ids per child-row query, keeping ``IN (...)`` lists within database limits.
+ID_BATCH_SIZE = 5000
+
+
+def batched(values, size=ID_BATCH_SIZE):
+    """Yield successive ``size``-long slices of the list ``values``."""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def prefixed_ordering(model, prefix):
+    """Return ``model``'s default ordering applied through the relation ``prefix``."""
+    return [
+        f"-{prefix}__{field[1:]}" if field.startswith("-") else f"{prefix}__{field}"
+        for field in model._meta.ordering
+    ]
+
+
+class ValuesReader:
+    """
+    Base class for readers that turn a queryset into serializer-shaped dicts.
+
+    Subclasses implement :meth:`build`, which turns rows from :meth:`values`
+    into representations, and fetch the child rows those need in
+    :meth:`load_related` and its async ORM counterpart :meth:`aload_related`.
+
+    Attributes:
+        columns (tuple): Columns selected by :meth:`values`.
+    """
+
+    columns = ()
+
+    def __init__(self, native_values=False):
+        self.native_values = native_values
+        self._timezone = timezone.get_current_timezone()
+        self._utc = str(self._timezone) == "UTC"
+
+    def values(self, queryset):
+        """Return ``queryset`` as a lazy ``.values()`` queryset of :attr:`columns`."""
+        return queryset.select_related(None).prefetch_related(None).values(*self.columns)
+
+    def load_related(self, rows):
+        """Return the child rows :meth:`build` needs for ``rows``."""
+        return {}
+
+    async def aload_related(self, rows):
+        """Async ORM version of :meth:`load_related`."""
+        return {}
+
+    def build(self, rows, related):
+        raise NotImplementedError
+
+    def hydrate(self, rows):
+        """Return the representations of ``rows``."""
+        return self.build(rows, self.load_related(rows))
+
+    async def ahydrate(self, rows):
+        """Return the representations of ``rows``, fetching child rows with the async ORM."""
+        return self.build(rows, await self.aload_related(rows))
+
+    def read(self, queryset):
+        """Return the representations of every object in ``queryset``."""
+        return self.hydrate(list(self.values(queryset)))
+
+    async def aread(self, queryset):
+        """Async ORM version of :meth:`read`."""
+        return await self.ahydrate([row async for row in self.values(queryset)])
+
+    def datetime(self, value):
+        """Represent a datetime the way ``serializers.DateTimeField`` does."""
+        if value is None:
+            return None
+        if not self._utc:
+            value = value.astimezone(self._timezone)
+        if self.native_values:
+            return value
+        value = value.isoformat()
+        return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+
+class FastListMixin:
+    """
+    Serves ``list`` from a :class:`ValuesReader` instead of the serializer.
+
+    Writes, retrieves and custom actions still use the serializer. Set
+    ``API_FAST_LIST_ENABLED = False`` to fall back to the serializer for lists too.
+
+    Attributes:
+        reader_class (type): The :class:`ValuesReader` mirroring ``serializer_class``.
+    """
+
+    reader_class = None
+
+    def get_reader(self):
+        native = getattr(getattr(self.request, "accepted_renderer", None), "native_values", False)
+        return self.reader_class(native_values=native)
+
+    def list(self, request, *args, **kwargs):
+        if not getattr(settings, "API_FAST_LIST_ENABLED", True):
+            return super().list(request, *args, **kwargs)
+
+        reader = self.get_reader()
+        rows = reader.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(reader.hydrate(list(page)))
+        return Response(reader.hydrate(list(rows)))
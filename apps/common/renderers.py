@@ -0,0 +1,177 @@
+"""
+Renderers and parsers for the REST API.
+
+``ORJSONRenderer`` and ``ORJSONParser`` are drop-in replacements for DRF's
+``JSONRenderer`` and ``JSONParser`` backed by `orjson`_. orjson encodes UUIDs
+and datetimes natively, in the same format as DRF's serializer fields
+(``2024-01-01T12:00:00.123456Z``), so fast read paths can hand it unconverted
+values. ``NDJSONRenderer`` writes list responses as one JSON document per line
+and ``CSVRenderer`` writes them as CSV rows.
+
+orjson is optional. The renderers are selected with the ``API_JSON_BACKEND`` and
+``API_NDJSON_ENABLED`` settings, and using the orjson classes without orjson
+installed raises ``ImproperlyConfigured``.
+
+.. _orjson: https://github.com/ijl/orjson
+"""
+import csv
+import io
+import json
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without the optional dependency
+    orjson = None
+
+_drf_encoder = encoders.JSONEncoder()
+
+
+def _require_orjson():
+    if orjson is None:
+        raise ImproperlyConfigured("API_JSON_BACKEND='orjson' requires the orjson package (pip install orjson).")
+
+
+def _default(obj):
+    """Encode what orjson does not support natively (Decimal, lazy strings, ...) the way DRF does."""
+    return _drf_encoder.default(obj)
+
+
+def dumps(data, indent=False):
+    """
+    Serialize ``data`` to compact UTF-8 JSON bytes.
+
+    Uses orjson when it is installed and falls back to the standard library
+    with DRF's encoder otherwise.
+    """
+    if orjson is not None:
+        option = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_default, option=option)
+    return json.dumps(
+        data, cls=encoders.JSONEncoder, ensure_ascii=False, indent=2 if indent else None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class ORJSONRenderer(renderers.BaseRenderer):
+    """Renders JSON with orjson."""
+
+    media_type = "application/json"
+    format = "json"
+    charset = None
+    # Read paths may pass native datetimes (see apps.common.readers).
+    native_values = True
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        _require_orjson()
+        if data is None:
+            return b""
+        return dumps(data, indent=self._wants_indent(accepted_media_type, renderer_context))
+
+    @staticmethod
+    def _wants_indent(accepted_media_type, renderer_context):
+        if renderer_context and renderer_context.get("indent"):
+            return True
+        if accepted_media_type:
+            _, params = renderers.parse_header_parameters(accepted_media_type)
+            return "indent" in params
+        return False
+
+
+class ORJSONParser(BaseParser):
+    """Parses JSON request bodies with orjson."""
+
+    media_type = "application/json"
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        _require_orjson()
+        encoding = (parser_context or {}).get("encoding", "utf-8")
+        try:
+            body = stream.read()
+            if encoding.lower().replace("_", "-") not in ("utf-8", "utf8"):
+                body = body.decode(encoding)
+            return orjson.loads(body)
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class NDJSONRenderer(renderers.BaseRenderer):
+    """
+    Renders list responses as newline-delimited JSON.
+
+    Each item of a list (or of the ``results`` of a paginated response) is
+    written on its own line. Any other payload, such as an error, is written
+    as a single line.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = None
+    native_values = orjson is not None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if isinstance(data, dict) and isinstance(data.get("results"), list):
+            data = data["results"]
+        items = data if isinstance(data, list) else [data]
+        return b"".join(self.render_line(item) for item in items)
+
+    @staticmethod
+    def render_line(item):
+        return dumps(item) + b"\n"
+
+
+def csv_cell(value):
+    """Represent a value in a CSV cell: nested structures as compact JSON, None as empty."""
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return dumps(value).decode("utf-8")
+    return value
+
+
+def flatten(item, columns):
+    """Return the values of ``columns`` (dotted paths into nested dicts) from ``item``."""
+    values = []
+    for column in columns:
+        value = item
+        for key in column.split("."):
+            value = value.get(key) if isinstance(value, dict) else None
+        values.append(csv_cell(value))
+    return values
+
+
+class CSVRenderer(renderers.BaseRenderer):
+    """
+    Renders list responses as CSV.
+
+    Columns come from the view's ``export_columns`` (dotted paths into each
+    item) or, failing that, from the keys of the first item.
+    """
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if isinstance(data, dict) and isinstance(data.get("results"), list):
+            data = data["results"]
+        items = data if isinstance(data, list) else [data]
+        view = (renderer_context or {}).get("view")
+        columns = getattr(view, "export_columns", None) or (list(items[0]) if items else [])
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        writer.writerows(flatten(item, columns) for item in items)
+        return buffer.getvalue().encode(self.charset)
@@ -0,0 +1,130 @@
+"""
+Pre-generated OpenAPI schema.
+
+drf-spectacular builds the schema by introspecting every view and
+serializer, which takes hundreds of milliseconds per request.
+:class:`CachedSpectacularAPIView` builds it once per code version and then
+serves the rendered bytes from memory, with an ``ETag`` so clients can
+revalidate with ``304 Not Modified``. ``manage.py build_schema`` writes the
+rendered files to ``OPENAPI_SCHEMA_DIR`` at build or deploy time; a new
+process then reads them instead of generating the schema.
+
+The code version is a hash of the project's Python sources, the installed
+Django, DRF and drf-spectacular versions, and ``SPECTACULAR_SETTINGS``.
+Any change yields a new version, so files from an older build are ignored.
+Set ``OPENAPI_SCHEMA_VERSION`` (for example to the git commit being
+deployed) to skip hashing the sources.
+"""
+import hashlib
+import threading
+from functools import lru_cache
+from importlib.metadata import version as package_version
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.views import SpectacularAPIView
+
+# Rendered formats; the other renderers of SpectacularAPIView produce the same bytes.
+RENDERERS = {"yaml": OpenApiYamlRenderer, "json": OpenApiJsonRenderer}
+SOURCE_DIRECTORIES = ("apps", "config")
+VERSIONED_PACKAGES = ("django", "djangorestframework", "drf-spectacular")
+
+_rendered = {}
+_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _source_hash():
+    digest = hashlib.sha256()
+    base_dir = Path(settings.BASE_DIR)
+    for directory in SOURCE_DIRECTORIES:
+        for path in sorted((base_dir / directory).rglob("*.py")):
+            if "tests" in path.relative_to(base_dir).parts:
+                continue
+            digest.update(str(path.relative_to(base_dir)).encode())
+            digest.update(path.read_bytes())
+    for package in VERSIONED_PACKAGES:
+        digest.update(f"{package}=={package_version(package)}".encode())
+    digest.update(repr(sorted(getattr(settings, "SPECTACULAR_SETTINGS", {}).items())).encode())
+    return digest.hexdigest()[:20]
+
+
+def code_version():
+    """Return the version the schema is cached under."""
+    return getattr(settings, "OPENAPI_SCHEMA_VERSION", "") or _source_hash()
+
+
+def schema_path(schema_format, version=None):
+    """Return the file ``build_schema`` writes the ``schema_format`` schema to."""
+    return Path(settings.OPENAPI_SCHEMA_DIR) / f"openapi-{version or code_version()}.{schema_format}"
+
+
+def generate_schema():
+    """Introspect the API and return the schema as a dict."""
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    return generator.get_schema(request=None, public=spectacular_settings.SERVE_PUBLIC)
+
+
+def render_schema(schema):
+    """Return ``{format: rendered bytes}`` for every format in :data:`RENDERERS`."""
+    return {schema_format: renderer().render(schema) for schema_format, renderer in RENDERERS.items()}
+
+
+def get_rendered_schema(schema_format):
+    """
+    Return the rendered schema in ``schema_format`` for the current code version.
+
+    The bytes come from memory, from the file ``build_schema`` wrote, or, for
+    the first request of a process without one, from :func:`generate_schema`.
+    """
+    version = code_version()
+    key = (version, schema_format)
+    if key not in _rendered:
+        with _lock:
+            if key not in _rendered:
+                path = schema_path(schema_format, version)
+                if path.exists():
+                    _rendered[key] = path.read_bytes()
+                else:
+                    for rendered_format, content in render_schema(generate_schema()).items():
+                        _rendered[(version, rendered_format)] = content
+    return _rendered[key]
+
+
+def clear_schema_cache():
+    """Forget the schemas rendered in this process."""
+    _rendered.clear()
+    _source_hash.cache_clear()
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """
+    ``SpectacularAPIView`` serving the schema pre-rendered, with ETag revalidation.
+
+    Requests for another language or API version, and views customised with
+    their own settings, URL patterns or urlconf, are generated on the fly
+    as before.
+    """
+
+    def _get_schema_response(self, request):
+        version = self.api_version or request.version or self._get_version_parameter(request)
+        customised = self.custom_settings or self.patterns or self.urlconf
+        if version or customised or request.GET.get("lang") or not getattr(settings, "OPENAPI_SCHEMA_CACHE", True):
+            return super()._get_schema_response(request)
+
+        renderer = request.accepted_renderer
+        etag = f'"{code_version()}-{renderer.format}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+        if etag in if_none_match or "*" in if_none_match:
+            return HttpResponseNotModified(headers=headers)
+
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type += f"; charset={renderer.charset}"
+        headers["Content-Disposition"] = f'inline; filename="{self._get_filename(request, None)}"'
+        return HttpResponse(get_rendered_schema(renderer.format), content_type=content_type, headers=headers)
@@ -0,0 +1,98 @@
+"""Tests for the admin classes for large tables."""
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from apps.common.admin import EstimatedCountPaginator
+from apps.migration_manager.models import Migration, MigrationTarget
+from apps.workloads.models import Credentials, MountPoint, Workload
+
+
+class ScalableModelAdminTests(TestCase):
+    """Test suite for ScalableModelAdmin and EstimatedCountPaginator."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user = User.objects.create_superuser("admin", password="password")
+        credentials = Credentials.objects.create(username="svc", password="secret")
+        cls.db_server = Workload.objects.create(name="db-01", ip_address="10.0.0.1", credentials=credentials)
+        cls.web_server = Workload.objects.create(name="web-01", ip_address="10.0.0.2", credentials=credentials)
+        cls.mount_points = [
+            MountPoint.objects.create(workload=workload, name=name, size_gb=10)
+            for workload in (cls.db_server, cls.web_server)
+            for name in ("/", "/var", "/data")
+        ]
+        vm = Workload.objects.create(name="aws-db-01", ip_address="10.1.0.1", credentials=credentials)
+        target = MigrationTarget.objects.create(cloud_type="aws", cloud_credentials=credentials, target_vm=vm)
+        cls.migration = Migration.objects.create(source=cls.db_server, target=target)
+        cls.migration.selected_mount_points.set(cls.mount_points[:3])
+
+    def setUp(self):
+        self.client.force_login(self.admin_user)
+
+    def _changelist(self, model, **params):
+        response = self.client.get(f"/admin/{model._meta.app_label}/{model._meta.model_name}/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.context["cl"]
+
+    def test_search_matches_name_prefixes(self):
+        results = self._changelist(Workload, q="db")
+        self.assertEqual(list(results.result_list), [self.db_server])
+        # The whole term is one prefix, not a set of words.
+        self.assertEqual(len(self._changelist(Workload, q="db-01 extra").result_list), 0)
+        self.assertEqual(len(self._changelist(Workload, q="01").result_list), 0)
+
+    def test_ip_address_search_is_exact(self):
+        self.assertEqual(list(self._changelist(Workload, q="10.0.0.2").result_list), [self.web_server])
+        mount_points = self._changelist(MountPoint, q="10.0.0.1").result_list
+        self.assertEqual({mount.workload_id for mount in mount_points}, {self.db_server.pk})
+
+    def test_related_search_filters_by_resolved_keys(self):
+        with CaptureQueriesContext(connection) as queries:
+            mount_points = self._changelist(MountPoint, q="web").result_list
+        self.assertEqual(len(mount_points), 3)
+        self.assertTrue(all(mount.workload_id == self.web_server.pk for mount in mount_points))
+        page = next(q["sql"] for q in queries if q["sql"].startswith('SELECT "workloads_mountpoint"."id"'))
+        self.assertIn(f'"workloads_mountpoint"."workload_id" IN (\'{self.web_server.pk.hex}\')', page)
+
+    def test_changelist_runs_a_single_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            self._changelist(MountPoint, q="/var")
+        self.assertEqual(len([q for q in queries if "COUNT(" in q["sql"]]), 1)
+
+    @override_settings(ADMIN_EXACT_COUNT_LIMIT=100)
+    def test_paginator_uses_large_estimates(self):
+        queryset = MountPoint.objects.all()
+        with mock.patch("apps.common.admin.estimate_count", return_value=5_000_000):
+            self.assertEqual(EstimatedCountPaginator(queryset, 100).count, 5_000_000)
+        with mock.patch("apps.common.admin.estimate_count", return_value=50):
+            self.assertEqual(EstimatedCountPaginator(queryset, 100).count, 6)
+        # Only PostgreSQL provides estimates.
+        self.assertEqual(EstimatedCountPaginator(queryset, 100).count, 6)
+
+    def test_autocomplete_loads_only_the_displayed_columns(self):
+        params = {
+            "app_label": "migration_manager",
+            "model_name": "migration",
+            "field_name": "selected_mount_points",
+            "term": "/",
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/admin/autocomplete/", params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), 6)
+        self.assertIn("db-01: / (10 GB)", {result["text"] for result in response.json()["results"]})
+        select = next(q["sql"] for q in queries if q["sql"].startswith("SELECT") and "size_gb" in q["sql"])
+        self.assertNotIn("updated_at", select)
+        # The workloads are read once, by the search; __str__ does not load them one by one.
+        self.assertEqual(len([q for q in queries if q["sql"].startswith('SELECT "workloads_workload"')]), 1)
+
+    def test_change_form_renders_selected_options_without_per_row_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"/admin/migration_manager/migration/{self.migration.pk}/change/")
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "db-01: /data (10 GB)")
+        self.assertLessEqual(len([q for q in queries if 'FROM "workloads_workload"' in q["sql"]]), 2)
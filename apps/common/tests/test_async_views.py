@@ -0,0 +1,99 @@
+"""Tests for the async read endpoints under /api/v1/async/."""
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.test import AsyncClient, TestCase
+from rest_framework.test import APIClient
+
+from apps.common.authentication import TokenObtainPairSerializer, revoke_tokens
+from apps.migration_manager.models import Migration, MigrationTarget
+from apps.workloads.models import Credentials, MountPoint, Workload
+
+
+class AsyncReadViewTests(TestCase):
+    """Test suite for the async migration and workload read views."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create a source, a target VM and a migration between them."""
+        credentials = Credentials.objects.create(username="admin", password="password", domain="CORP")
+        cls.source = Workload.objects.create(name="srv-1", ip_address="10.0.0.1", credentials=credentials)
+        MountPoint.objects.create(workload=cls.source, name="C:\\", size_gb=100)
+        cls.target_vm = Workload.objects.create(name="vm-1", ip_address="2001:db8::1", credentials=credentials)
+        target = MigrationTarget.objects.create(
+            cloud_type=MigrationTarget.CloudType.AWS, cloud_credentials=credentials, target_vm=cls.target_vm
+        )
+        cls.migration = Migration.objects.create(source=cls.source, target=target)
+        cls.migration.selected_mount_points.set(cls.source.mount_points.all())
+        cls.user = User.objects.create_user("api", password="password")
+
+    def setUp(self):
+        token = TokenObtainPairSerializer.get_token(self.user).access_token
+        self.client = AsyncClient()
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.sync_client = APIClient()
+        self.sync_client.force_authenticate(self.user)
+
+    async def test_detail_views_match_drf_endpoints(self):
+        for path in (f"migrations/{self.migration.pk}/", f"workloads/{self.source.pk}/"):
+            response = await self.client.get(f"/api/v1/async/{path}", headers=self.headers)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response["Content-Type"], "application/json")
+            expected = await self._sync_get(f"/api/v1/{path}")
+            self.assertEqual(response.json(), expected)
+
+    async def test_migration_status(self):
+        path = f"/api/v1/async/migrations/{self.migration.pk}/status/"
+        response = await self.client.get(path, headers=self.headers)
+        expected = await self._sync_get(f"/api/v1/migrations/{self.migration.pk}/")
+        self.assertEqual(
+            response.json(),
+            {
+                "id": expected["id"],
+                "state": expected["state"],
+                "progress": expected["progress"],
+                "heartbeat_at": expected["heartbeat_at"],
+                "updated_at": expected["updated_at"],
+            },
+        )
+
+    async def test_lookup_by_ip(self):
+        response = await self._lookup("10.0.0.1")
+        self.assertEqual(response.json()["id"], str(self.source.pk))
+
+        response = await self._lookup("2001:DB8:0::1")
+        self.assertEqual(response.json()["id"], str(self.target_vm.pk))
+
+        response = await self._lookup("10.0.0.99")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {"detail": "Not found."})
+
+        response = await self._lookup("not-an-ip")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("ip", response.json())
+
+    async def test_authentication_is_required(self):
+        response = await AsyncClient().get(f"/api/v1/async/migrations/{self.migration.pk}/status/")
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("Bearer", response["WWW-Authenticate"])
+
+        response = await AsyncClient().get(
+            f"/api/v1/async/workloads/{self.source.pk}/", headers={"Authorization": "Bearer invalid"}
+        )
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()["code"], "token_not_valid")
+
+    async def test_revoked_token_is_rejected(self):
+        path = f"/api/v1/async/migrations/{self.migration.pk}/status/"
+        self.assertEqual((await self.client.get(path, headers=self.headers)).status_code, 200)
+        await sync_to_async(revoke_tokens)(self.user)
+        self.assertEqual((await self.client.get(path, headers=self.headers)).status_code, 401)
+
+    async def test_only_reads_are_allowed(self):
+        response = await self.client.post(f"/api/v1/async/migrations/{self.migration.pk}/", headers=self.headers)
+        self.assertEqual(response.status_code, 405)
+
+    async def _sync_get(self, path):
+        return (await sync_to_async(self.sync_client.get)(path)).json()
+
+    async def _lookup(self, ip_address):
+        return await self.client.get("/api/v1/async/workloads/lookup/", {"ip": ip_address}, headers=self.headers)
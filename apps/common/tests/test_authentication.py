@@ -0,0 +1,101 @@
+"""Tests for the cached stateless JWT authentication."""
+import io
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+
+from apps.common.authentication import CachedJWTAuthentication, TokenObtainPairSerializer
+from apps.common.models import TokenRevocation
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    """Test suite for CachedJWTAuthentication and the token serializers."""
+
+    def setUp(self):
+        caches["auth"].clear()
+        self.user = User.objects.create_user("automation", password="password")
+        # Authentication classes are bound when the views are defined, so
+        # JWT_AUTH_MODE cannot be switched with override_settings.
+        patcher = mock.patch.object(APIView, "authentication_classes", [CachedJWTAuthentication])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _obtain(self, username="automation", password="password"):
+        response = APIClient().post("/api/v1/token/", {"username": username, "password": password}, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def _client(self, access):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        return client
+
+    def test_authenticated_get_does_not_query_user_table(self):
+        client = self._client(self._obtain()["access"])
+        self.assertEqual(client.get("/api/v1/workloads/").status_code, 200)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get("/api/v1/workloads/")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([q["sql"] for q in queries if "auth_user" in q["sql"]])
+
+    def test_request_user_is_built_from_claims(self):
+        token = TokenObtainPairSerializer.get_token(self.user).access_token
+        user, _ = CachedJWTAuthentication().authenticate(
+            type("Request", (), {"META": {"HTTP_AUTHORIZATION": f"Bearer {token}"}})()
+        )
+        self.assertEqual(user.id, str(self.user.pk))
+        self.assertEqual(user.username, "automation")
+        self.assertFalse(user.is_staff)
+        self.assertTrue(user.is_authenticated)
+
+    def test_revoked_tokens_are_rejected(self):
+        tokens = self._obtain()
+        client = self._client(tokens["access"])
+        self.assertEqual(client.get("/api/v1/workloads/").status_code, 200)
+
+        call_command("revoke_tokens", "automation", stdout=io.StringIO())
+        self.assertTrue(TokenRevocation.objects.filter(user=self.user).exists())
+        self.assertEqual(client.get("/api/v1/workloads/").status_code, 401)
+        response = APIClient().post("/api/v1/token/refresh/", {"refresh": tokens["refresh"]}, format="json")
+        self.assertEqual(response.status_code, 401)
+
+    def test_password_change_and_deactivation_are_seen_through_the_cache(self):
+        client = self._client(self._obtain()["access"])
+        self.assertEqual(client.get("/api/v1/workloads/").status_code, 200)
+        self.user.set_password("changed")
+        self.user.save()
+        self.assertEqual(client.get("/api/v1/workloads/").status_code, 401)
+
+        client = self._client(self._obtain(password="changed")["access"])
+        self.assertEqual(client.get("/api/v1/workloads/").status_code, 200)
+        self.user.is_active = False
+        self.user.save(update_fields=["is_active"])
+        self.assertEqual(client.get("/api/v1/workloads/").status_code, 401)
+
+    def test_role_change_requires_a_new_token(self):
+        client = self._client(self._obtain()["access"])
+        self.user.is_staff = True
+        self.user.save()
+        self.assertEqual(client.get("/api/v1/workloads/").status_code, 401)
+
+    def test_tokens_issued_after_revocation_are_accepted(self):
+        TokenRevocation.objects.create(user=self.user, revoked_before=timezone.now() - timedelta(hours=1))
+        client = self._client(self._obtain()["access"])
+        self.assertEqual(client.get("/api/v1/workloads/").status_code, 200)
+
+    @override_settings(AUTH_USER_CACHE_TTL=300)
+    def test_deleted_user_is_rejected(self):
+        client = self._client(self._obtain()["access"])
+        self.assertEqual(client.get("/api/v1/workloads/").status_code, 200)
+        self.user.delete()
+        self.assertEqual(client.get("/api/v1/workloads/").status_code, 401)
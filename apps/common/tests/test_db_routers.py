@@ -0,0 +1,104 @@
+"""Tests for the read-replica router and middleware."""
+from unittest import mock
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from apps.common.db_routers import (
+    ReplicaRouter,
+    ReplicaRoutingMiddleware,
+    routed_iterator,
+    use_primary,
+    use_replicas,
+)
+from apps.migration_manager.services import run_migration_logic
+from apps.workloads.models import Workload
+
+REPLICAS = ["replica_0", "replica_1"]
+
+
+@mock.patch("apps.common.db_routers.replica_aliases", return_value=REPLICAS)
+class ReplicaRouterTests(SimpleTestCase):
+    """Test suite for ReplicaRouter and ReplicaRoutingMiddleware."""
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+
+    def _read_db_during(self, request):
+        """Return the alias a read resolves to while the middleware handles ``request``."""
+        seen = {}
+
+        def view(request):
+            seen["db"] = self.router.db_for_read(Workload)
+            return HttpResponse()
+
+        response = ReplicaRoutingMiddleware(view)(request)
+        return seen["db"], response
+
+    def test_reads_use_primary_outside_a_replica_context(self, _):
+        self.assertEqual(self.router.db_for_read(Workload), "default")
+        with use_replicas():
+            self.assertIn(self.router.db_for_read(Workload), REPLICAS)
+            with use_primary():
+                self.assertEqual(self.router.db_for_read(Workload), "default")
+        self.assertEqual(self.router.db_for_write(Workload), "default")
+
+    def test_reads_after_a_write_use_primary(self, _):
+        with use_replicas():
+            self.router.db_for_write(Workload)
+            self.assertEqual(self.router.db_for_read(Workload), "default")
+
+    def test_safe_api_requests_and_changelists_read_from_replicas(self, _):
+        db, _response = self._read_db_during(self.factory.get("/api/v1/workloads/"))
+        self.assertIn(db, REPLICAS)
+        db, _response = self._read_db_during(self.factory.get("/admin/workloads/workload/"))
+        self.assertIn(db, REPLICAS)
+
+        db, _response = self._read_db_during(self.factory.get("/admin/workloads/workload/add/"))
+        self.assertEqual(db, "default")
+
+    def test_streamed_responses_read_where_their_request_does(self, _):
+        def rows():
+            for _ in range(2):
+                yield self.router.db_for_read(Workload)
+
+        def view(request):
+            return StreamingHttpResponse(routed_iterator(rows()))
+
+        # The body is consumed after the middleware has returned.
+        response = ReplicaRoutingMiddleware(view)(self.factory.get("/api/v1/workloads/export/"))
+        for db in response.streaming_content:
+            self.assertIn(db.decode(), REPLICAS)
+        response = ReplicaRoutingMiddleware(view)(self.factory.post("/api/v1/workloads/"))
+        self.assertEqual(set(response.streaming_content), {b"default"})
+
+    def test_writes_make_the_client_sticky(self, _):
+        db, response = self._read_db_during(self.factory.post("/api/v1/workloads/"))
+        self.assertEqual(db, "default")
+        cookie = response.cookies["db_primary"]
+        self.assertEqual(cookie["max-age"], 10)
+
+        request = self.factory.get("/api/v1/workloads/")
+        request.COOKIES["db_primary"] = cookie.value
+        db, response = self._read_db_during(request)
+        self.assertEqual(db, "default")
+        self.assertNotIn("db_primary", response.cookies)
+
+    def test_migration_logic_reads_from_primary(self, _):
+        seen = {}
+        migration = mock.Mock(state="RUNNING")
+        migration.MigrationState.NOT_STARTED = "NOT_STARTED"
+
+        def record_db(*args, **kwargs):
+            seen["db"] = self.router.db_for_read(Workload)
+            raise RuntimeError("stop")
+
+        with use_replicas(), mock.patch("apps.migration_manager.services.span", side_effect=record_db):
+            with self.assertRaises(RuntimeError):
+                run_migration_logic(migration)
+        self.assertEqual(seen["db"], "default")
+
+    def test_replicas_are_not_migrated(self, _):
+        self.assertTrue(self.router.allow_migrate("default", "workloads"))
+        self.assertFalse(self.router.allow_migrate("replica_0", "workloads"))
@@ -0,0 +1,79 @@
+"""Tests for the streaming export endpoints."""
+import csv
+import io
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.migration_manager.models import Migration, MigrationTarget
+from apps.workloads.models import Credentials, MountPoint, Workload
+
+
+def _content(response):
+    return b"".join(response.streaming_content).decode()
+
+
+class ExportEndpointTests(TestCase):
+    """Test suite for /workloads/export/ and /migrations/export/."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create five workloads with volumes and one migration."""
+        credentials = Credentials.objects.create(username="admin", password="password", domain="CORP")
+        cls.workloads = []
+        for index in range(5):
+            workload = Workload.objects.create(name=f"srv-{index}", ip_address=f"10.0.0.{index + 1}", credentials=credentials)
+            MountPoint.objects.create(workload=workload, name="C:\\", size_gb=100 + index)
+            cls.workloads.append(workload)
+        target = MigrationTarget.objects.create(
+            cloud_type=MigrationTarget.CloudType.AWS, cloud_credentials=credentials, target_vm=cls.workloads[4]
+        )
+        migration = Migration.objects.create(source=cls.workloads[0], target=target)
+        migration.selected_mount_points.set(cls.workloads[0].mount_points.all())
+        cls.user = User.objects.create_user("api", password="password")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_ndjson_export_matches_list_endpoint(self):
+        for resource in ("workloads", "migrations"):
+            response = self.client.get(f"/api/v1/{resource}/export/")
+            self.assertTrue(response.streaming)
+            self.assertEqual(response["Content-Type"], "application/x-ndjson")
+            self.assertIn(f'filename="{resource}.ndjson"', response["Content-Disposition"])
+
+            exported = [json.loads(line) for line in _content(response).splitlines()]
+            self.assertEqual(exported, self.client.get(f"/api/v1/{resource}/").json())
+
+    def test_csv_export(self):
+        response = self.client.get("/api/v1/workloads/export/?format=csv")
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+
+        rows = list(csv.DictReader(io.StringIO(_content(response))))
+        self.assertEqual(len(rows), 5)
+        oldest = rows[-1]
+        self.assertEqual(oldest["credentials_details.username"], "admin")
+        self.assertEqual(json.loads(oldest["mount_points"])[0]["name"], "C:\\")
+
+        rows = list(csv.DictReader(io.StringIO(_content(self.client.get("/api/v1/migrations/export/?format=csv")))))
+        self.assertEqual(rows[0]["target_details.target_vm_details.ip_address"], "10.0.0.5")
+
+    def test_empty_csv_export_has_header(self):
+        Migration.objects.all().delete()
+        content = _content(self.client.get("/api/v1/migrations/export/?format=csv"))
+        self.assertEqual(content.splitlines()[0].split(",")[:2], ["id", "state"])
+        self.assertEqual(len(content.splitlines()), 1)
+
+    @override_settings(API_EXPORT_CHUNK_SIZE=2)
+    def test_child_rows_are_fetched_per_chunk(self):
+        response = self.client.get("/api/v1/workloads/export/")
+        with self.assertNumQueries(4):  # One workload cursor, mount points for each of 3 chunks.
+            lines = _content(response).splitlines()
+        self.assertEqual(len(lines), 5)
+
+    def test_export_requires_authentication(self):
+        response = APIClient().get("/api/v1/workloads/export/")
+        self.assertEqual(response.status_code, 401)
@@ -0,0 +1,66 @@
+"""Tests for the named exclusive locks."""
+import threading
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from apps.common import locks
+from apps.common.locks import LockTimeout, exclusive, get_backend, lock_key
+
+
+@override_settings(LOCK_BACKEND="local", LOCK_WAIT_TIMEOUT=5)
+class LockTests(SimpleTestCase):
+    """Test suite for exclusive() and its backends."""
+
+    def test_waiters_get_the_lock_after_the_holder_releases_it(self):
+        events = []
+
+        def waiter():
+            with exclusive("vm:1"):
+                events.append("waiter")
+
+        with exclusive("vm:1"):
+            thread = threading.Thread(target=waiter)
+            thread.start()
+            time.sleep(0.1)
+            events.append("holder")
+        thread.join(5)
+        self.assertEqual(events, ["holder", "waiter"])
+        self.assertEqual(locks._local_locks, {})
+
+    def test_timeout_and_unrelated_names(self):
+        with exclusive("vm:1"):
+            with self.assertRaises(LockTimeout):
+                with exclusive("vm:1", timeout=0):
+                    pass
+            with self.assertRaises(LockTimeout):
+                with exclusive("vm:1", timeout=0.05):
+                    pass
+            with exclusive("vm:2", timeout=0):
+                pass
+
+    def test_lock_keys_are_stable_signed_64_bit_integers(self):
+        self.assertEqual(lock_key("vm:1"), lock_key("vm:1"))
+        self.assertNotEqual(lock_key("vm:1"), lock_key("vm:2"))
+        self.assertTrue(-(2**63) <= lock_key("vm:1") < 2**63)
+
+    @override_settings(LOCK_BACKEND="auto")
+    def test_auto_backend_uses_advisory_locks_only_on_postgres(self):
+        self.assertEqual(get_backend(), "local")
+
+    @override_settings(LOCK_BACKEND="redis", LOCK_REDIS_URL="redis://redis:6379/0", LOCK_REDIS_TTL=60)
+    def test_redis_backend(self):
+        client = mock.Mock()
+        with mock.patch.object(locks, "_redis_client", return_value=client):
+            client.lock.return_value.acquire.return_value = True
+            with exclusive("vm:1", timeout=2):
+                pass
+            client.lock.assert_called_with("lock:vm:1", timeout=60)
+            client.lock.return_value.acquire.assert_called_with(blocking=True, blocking_timeout=2)
+            client.lock.return_value.release.assert_called_once()
+
+            client.lock.return_value.acquire.return_value = False
+            with self.assertRaises(LockTimeout):
+                with exclusive("vm:1", timeout=2):
+                    pass
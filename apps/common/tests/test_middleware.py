@@ -0,0 +1,73 @@
+"""Tests for the shared request middleware."""
+import tempfile
+from pathlib import Path
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from apps.common.middleware import RequestProfilingMiddleware
+
+PROFILING_SETTINGS = {
+    "PROFILING_ENABLED": True,
+    "PROFILING_SLOW_REQUEST_MS": 10_000,
+    "PROFILING_QUERY_THRESHOLD": 3,
+    "PROFILING_SAMPLE_RATE": 0.0,
+}
+
+
+def _view_with_queries(count):
+    def view(request):
+        with connection.cursor() as cursor:
+            for _ in range(count):
+                cursor.execute("SELECT 1")
+        return HttpResponse("ok")
+
+    return view
+
+
+class RequestProfilingMiddlewareTests(TestCase):
+    """Test suite for RequestProfilingMiddleware."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    @override_settings(PROFILING_ENABLED=False)
+    def test_disabled_middleware_removes_itself(self):
+        """Without PROFILING_ENABLED the middleware opts out of the stack."""
+        with self.assertRaises(MiddlewareNotUsed):
+            RequestProfilingMiddleware(_view_with_queries(0))
+
+    @override_settings(**PROFILING_SETTINGS)
+    def test_server_timing_header_reports_queries(self):
+        """The Server-Timing header carries db time, query count and totals."""
+        middleware = RequestProfilingMiddleware(_view_with_queries(2))
+        response = middleware(self.factory.get("/api/v1/workloads/"))
+
+        header = response["Server-Timing"]
+        self.assertIn('desc="2 queries"', header)
+        for metric in ("db;dur=", "app;dur=", "serialize;dur=", "total;dur="):
+            self.assertIn(metric, header)
+
+    @override_settings(**PROFILING_SETTINGS)
+    def test_query_heavy_request_is_logged(self):
+        """Requests at or over the query threshold are logged as warnings."""
+        middleware = RequestProfilingMiddleware(_view_with_queries(3))
+        with self.assertLogs("apps.common.middleware", level="WARNING") as logs:
+            middleware(self.factory.get("/api/v1/migrations/"))
+
+        self.assertEqual(logs.records[0].query_count, 3)
+        self.assertEqual(logs.records[0].path, "/api/v1/migrations/")
+
+    def test_sampled_request_writes_profile_dump(self):
+        """A sampled request leaves a pstats dump in the dump directory."""
+        with tempfile.TemporaryDirectory() as dump_dir:
+            sampling = {**PROFILING_SETTINGS, "PROFILING_SAMPLE_RATE": 1.0, "PROFILING_DUMP_DIR": dump_dir}
+            with override_settings(**sampling):
+                middleware = RequestProfilingMiddleware(_view_with_queries(0))
+                with self.assertLogs("apps.common.middleware", level="INFO"):
+                    middleware(self.factory.get("/api/v1/workloads/"))
+
+            dumps = list(Path(dump_dir).glob("*-GET-api_v1_workloads-*.prof"))
+            self.assertEqual(len(dumps), 1)
@@ -0,0 +1,104 @@
+"""Tests for the transactional outbox and its relay."""
+import io
+from datetime import timedelta
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import transaction
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.common.models import OutboxMessage
+from apps.common.outbox import enqueue, prune_published, publish_pending
+from apps.common.tracing import get_trace_id, trace_context
+from apps.migration_manager.models import Migration, MigrationTarget
+from apps.migration_manager.tasks import execute_migration_task
+from apps.workloads.models import Credentials, Workload
+
+TASK_NAME = "apps.migration_manager.tasks.execute_migration_task"
+
+
+@mock.patch("apps.common.outbox.current_app.send_task")
+class OutboxTests(TestCase):
+    """Test suite for the outbox, Migration.run() and the relay_outbox command."""
+
+    @classmethod
+    def setUpTestData(cls):
+        credentials = Credentials.objects.create(username="svc", password="secret")
+        source = Workload.objects.create(name="src", ip_address="10.0.0.1", credentials=credentials)
+        vm = Workload.objects.create(name="vm", ip_address="10.1.0.1", credentials=credentials)
+        target = MigrationTarget.objects.create(cloud_type="aws", cloud_credentials=credentials, target_vm=vm)
+        cls.migration = Migration.objects.create(source=source, target=target)
+
+    def test_run_queues_the_task_without_publishing(self, send_task):
+        self.migration.run()
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.task_name, TASK_NAME)
+        self.assertEqual(message.kwargs, {"migration_id": str(self.migration.id)})
+        self.assertIsNone(message.published_at)
+        send_task.assert_not_called()
+
+    def test_rolled_back_run_queues_nothing(self, send_task):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            self.migration.run()
+            raise RuntimeError("rollback")
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    def test_pending_messages_are_published_in_order_with_their_trace(self, send_task):
+        with trace_context("a" * 32, "b" * 16):
+            first = enqueue(TASK_NAME, kwargs={"migration_id": "1"})
+        second = enqueue(TASK_NAME, args=[2])
+        traces = []
+        send_task.side_effect = lambda *args, **kwargs: traces.append(get_trace_id())
+
+        self.assertEqual(publish_pending(), (2, 0))
+        self.assertEqual(
+            send_task.call_args_list,
+            [
+                mock.call(TASK_NAME, args=[], kwargs={"migration_id": "1"}, task_id=f"outbox-{first.pk}"),
+                mock.call(TASK_NAME, args=[2], kwargs={}, task_id=f"outbox-{second.pk}"),
+            ],
+        )
+        self.assertEqual(traces, ["a" * 32, None])
+        self.assertFalse(OutboxMessage.objects.filter(published_at__isnull=True).exists())
+        self.assertEqual(publish_pending(), (0, 0))
+
+    def test_broker_errors_leave_messages_pending(self, send_task):
+        failing, waiting = enqueue(TASK_NAME), enqueue(TASK_NAME)
+        send_task.side_effect = ConnectionError("broker down")
+
+        self.assertEqual(publish_pending(), (0, 1))
+        failing.refresh_from_db()
+        self.assertEqual(failing.attempts, 1)
+        self.assertIn("broker down", failing.last_error)
+        self.assertEqual(send_task.call_count, 1)
+        with self.assertRaises(CommandError):
+            call_command("relay_outbox", "--once", stdout=io.StringIO())
+
+        send_task.side_effect = None
+        self.assertEqual(publish_pending(), (2, 0))
+        waiting.refresh_from_db()
+        self.assertIsNotNone(waiting.published_at)
+
+    def test_relay_publishes_everything_in_batches(self, send_task):
+        for index in range(5):
+            enqueue(TASK_NAME, args=[index])
+        stdout = io.StringIO()
+        call_command("relay_outbox", "--once", "--batch-size", "2", stdout=stdout)
+        self.assertEqual(send_task.call_count, 5)
+        self.assertEqual(stdout.getvalue().count("Published"), 3)
+
+    def test_prune_deletes_only_old_published_messages(self, send_task):
+        old, recent, pending = enqueue(TASK_NAME), enqueue(TASK_NAME), enqueue(TASK_NAME)
+        OutboxMessage.objects.filter(pk=old.pk).update(published_at=timezone.now() - timedelta(days=2))
+        OutboxMessage.objects.filter(pk=recent.pk).update(published_at=timezone.now())
+        self.assertEqual(prune_published(), 1)
+        self.assertEqual(set(OutboxMessage.objects.values_list("pk", flat=True)), {recent.pk, pending.pk})
+
+    def test_duplicate_delivery_is_not_retried(self, send_task):
+        Migration.objects.filter(pk=self.migration.pk).update(state=Migration.MigrationState.RUNNING)
+        with mock.patch.object(execute_migration_task, "retry") as retry:
+            result = execute_migration_task.run(migration_id=str(self.migration.id))
+        retry.assert_not_called()
+        self.assertIn("not started", result)
@@ -0,0 +1,76 @@
+"""Tests for the API renderers and parsers."""
+import io
+import uuid
+from datetime import datetime, timezone
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework import serializers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from apps.common.renderers import NDJSONRenderer, ORJSONParser, ORJSONRenderer
+from apps.workloads.models import Credentials, MountPoint, Workload
+from apps.workloads.serializers import WorkloadSerializer
+
+
+class ORJSONRendererTests(TestCase):
+    """Test suite for ORJSONRenderer and ORJSONParser."""
+
+    @classmethod
+    def setUpTestData(cls):
+        credentials = Credentials.objects.create(username="admin", password="password", domain="CORP")
+        cls.workload = Workload.objects.create(name="Server ü", ip_address="10.0.0.1", credentials=credentials)
+        MountPoint.objects.create(workload=cls.workload, name="C:\\", size_gb=100)
+
+    def test_output_matches_drf_json_renderer(self):
+        """Rendering serializer output gives the same bytes as DRF's renderer."""
+        data = WorkloadSerializer([self.workload], many=True).data
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_native_values_use_serializer_field_format(self):
+        """UUIDs and datetimes are encoded exactly as DRF's serializer fields represent them."""
+        for value in (
+            datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+            datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        ):
+            expected = serializers.DateTimeField().to_representation(value)
+            self.assertEqual(ORJSONRenderer().render({"at": value}), f'{{"at":"{expected}"}}'.encode())
+
+        value = uuid.uuid4()
+        self.assertEqual(ORJSONRenderer().render([value]), f'["{value}"]'.encode())
+
+    def test_indent_is_honoured(self):
+        rendered = ORJSONRenderer().render({"a": 1}, "application/json; indent=4")
+        self.assertEqual(rendered, b'{\n  "a": 1\n}')
+
+    def test_parser_round_trip_and_errors(self):
+        body = b'{"name": "Server \xc3\xbc", "mount_points": [{"size_gb": 10}]}'
+        self.assertEqual(ORJSONParser().parse(io.BytesIO(body)), JSONParser().parse(io.BytesIO(body)))
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"name": '))
+
+
+class NDJSONRendererTests(TestCase):
+    """Test suite for NDJSONRenderer."""
+
+    def test_lists_render_one_item_per_line(self):
+        self.assertEqual(NDJSONRenderer().render([{"a": 1}, {"a": 2}]), b'{"a":1}\n{"a":2}\n')
+        self.assertEqual(NDJSONRenderer().render({"count": 1, "results": [{"a": 1}]}), b'{"a":1}\n')
+        self.assertEqual(NDJSONRenderer().render({"detail": "Not found."}), b'{"detail":"Not found."}\n')
+
+    def test_list_endpoint_negotiates_ndjson(self):
+        credentials = Credentials.objects.create(username="admin", password="password")
+        for index in range(3):
+            Workload.objects.create(name=f"srv-{index}", ip_address=f"10.0.0.{index + 1}", credentials=credentials)
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user("api", password="password"))
+
+        response = client.get("/api/v1/workloads/", HTTP_ACCEPT="application/x-ndjson")
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = response.content.decode().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(all(line.startswith('{"id":') for line in lines))
@@ -0,0 +1,85 @@
+"""Tests for the cached OpenAPI schema view and the build_schema command."""
+import io
+import tempfile
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, override_settings
+from drf_spectacular.views import SpectacularAPIView
+from rest_framework.test import APIRequestFactory
+
+from apps.common import schema
+
+SCHEMA_URL = "/api/v1/schema/"
+
+
+class CachedSchemaTests(SimpleTestCase):
+    """Test suite for CachedSpectacularAPIView."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        overrides = override_settings(OPENAPI_SCHEMA_DIR=self.directory, OPENAPI_SCHEMA_VERSION="test-version")
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        schema.clear_schema_cache()
+        self.addCleanup(schema.clear_schema_cache)
+
+    def _uncached(self, **params):
+        request = APIRequestFactory().get(SCHEMA_URL, params)
+        response = SpectacularAPIView.as_view()(request)
+        return response.render()
+
+    def test_output_matches_spectacular(self):
+        for params in ({}, {"format": "json"}):
+            response = self.client.get(SCHEMA_URL, params)
+            expected = self._uncached(**params)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response["Content-Type"], expected["Content-Type"])
+            self.assertEqual(response.content, expected.content)
+
+    def test_schema_is_generated_once(self):
+        with mock.patch.object(schema, "generate_schema", wraps=schema.generate_schema) as generate:
+            first = self.client.get(SCHEMA_URL)
+            second = self.client.get(SCHEMA_URL, {"format": "json"})
+            third = self.client.get(SCHEMA_URL)
+        self.assertEqual(generate.call_count, 1)
+        self.assertEqual(first.content, third.content)
+        self.assertIn(b'"openapi"', second.content)
+
+    def test_etag_revalidation(self):
+        response = self.client.get(SCHEMA_URL)
+        self.assertEqual(response["ETag"], '"test-version-yaml"')
+        response = self.client.get(SCHEMA_URL, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+        with override_settings(OPENAPI_SCHEMA_VERSION="next-version"):
+            response = self.client.get(SCHEMA_URL, HTTP_IF_NONE_MATCH='"test-version-yaml"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_prebuilt_files_are_served(self):
+        call_command("build_schema", stdout=io.StringIO())
+        schema.clear_schema_cache()
+        with mock.patch.object(schema, "generate_schema", side_effect=AssertionError("generated")):
+            response = self.client.get(SCHEMA_URL, {"format": "json"})
+        self.assertEqual(response.content, schema.schema_path("json").read_bytes())
+
+        with override_settings(OPENAPI_SCHEMA_VERSION="next-version"):
+            call_command("build_schema", stdout=io.StringIO())
+        self.assertFalse(schema.schema_path("json").exists())
+
+    @override_settings(ROOT_URLCONF=None)
+    def test_build_requires_the_api_settings(self):
+        with self.assertRaises(CommandError):
+            call_command("build_schema", stdout=io.StringIO())
+
+    @override_settings(OPENAPI_SCHEMA_VERSION="")
+    def test_code_version_hashes_sources(self):
+        version = schema.code_version()
+        self.assertEqual(len(version), 20)
+        with override_settings(SPECTACULAR_SETTINGS={"TITLE": "Changed"}):
+            schema.clear_schema_cache()
+            self.assertNotEqual(schema.code_version(), version)
@@ -0,0 +1,123 @@
+"""Tests for trace-context propagation and span export."""
+import io
+import logging
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+
+from apps.common import tracing
+
+
+class _ListExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, record):
+        self.spans.append(record)
+
+
+class TracingTestMixin:
+    def setUp(self):
+        super().setUp()
+        self.exporter = _ListExporter()
+        patcher = patch.object(tracing, "get_exporter", return_value=self.exporter)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class SpanTests(TracingTestMixin, SimpleTestCase):
+    """Test suite for trace contexts and spans."""
+
+    def test_spans_are_nested_within_a_trace(self):
+        """Child spans reference their parent and share the trace id."""
+        with tracing.trace_context() as trace_id:
+            with tracing.span("outer") as outer_id:
+                with tracing.span("inner", step=1):
+                    pass
+
+        inner, outer = self.exporter.spans
+        self.assertEqual(outer["span_id"], outer_id)
+        self.assertEqual(inner["parent_id"], outer_id)
+        self.assertEqual({inner["trace_id"], outer["trace_id"]}, {trace_id})
+        self.assertEqual(inner["attributes"], {"step": 1})
+
+    def test_no_spans_outside_a_trace(self):
+        """Spans are not recorded when no trace is active."""
+        with tracing.span("orphan"):
+            pass
+        self.assertEqual(self.exporter.spans, [])
+
+    def test_span_records_errors(self):
+        """An exception inside a span is recorded and re-raised."""
+        with self.assertRaises(ValueError), tracing.trace_context():
+            with tracing.span("failing"):
+                raise ValueError("boom")
+        self.assertEqual(self.exporter.spans[0]["error"], "ValueError: boom")
+
+    def test_log_records_carry_the_trace_id(self):
+        """The logging filter stamps records with the active trace id."""
+        stream = io.StringIO()
+        handler = logging.StreamHandler(stream)
+        handler.addFilter(tracing.TraceContextFilter())
+        handler.setFormatter(logging.Formatter("%(trace_id)s %(message)s"))
+        test_logger = logging.getLogger("tests.tracing")
+        test_logger.propagate = False
+        test_logger.addHandler(handler)
+        self.addCleanup(test_logger.removeHandler, handler)
+
+        with tracing.trace_context("a" * 32):
+            test_logger.warning("inside")
+        test_logger.warning("outside")
+
+        self.assertEqual(stream.getvalue().splitlines(), [f"{'a' * 32} inside", "- outside"])
+
+    def test_celery_headers_round_trip(self):
+        """The trace survives the publish -> worker hop through message headers."""
+        headers = {}
+        with tracing.trace_context() as trace_id, tracing.span("publish") as publish_span_id:
+            tracing.inject_task_headers(headers=headers)
+        self.assertEqual(headers, {"trace_id": trace_id, "parent_span_id": publish_span_id})
+
+        task = SimpleNamespace(name="tasks.example", request=SimpleNamespace(retries=0, **headers))
+        tracing.start_task_trace(task_id="task-1", task=task)
+        self.assertEqual(tracing.get_trace_id(), trace_id)
+        tracing.end_task_trace(task_id="task-1")
+
+        self.assertIsNone(tracing.get_trace_id())
+        task_span = self.exporter.spans[-1]
+        self.assertEqual(task_span["name"], "celery.task")
+        self.assertEqual(task_span["parent_id"], publish_span_id)
+
+
+class TraceContextMiddlewareTests(TracingTestMixin, TestCase):
+    """Test suite for TraceContextMiddleware and database spans."""
+
+    def test_incoming_traceparent_is_continued(self):
+        """A valid traceparent header is adopted and echoed back."""
+        trace_id, parent_id = "0af7651916cd43dd8448eb211c80319c", "b7ad6b7169203331"
+        middleware = tracing.TraceContextMiddleware(lambda request: HttpResponse())
+        request = RequestFactory().get("/api/v1/migrations/", HTTP_TRACEPARENT=f"00-{trace_id}-{parent_id}-01")
+
+        response = middleware(request)
+
+        self.assertEqual(response["X-Trace-Id"], trace_id)
+        self.assertEqual(self.exporter.spans[0]["parent_id"], parent_id)
+        self.assertTrue(response["traceparent"].startswith(f"00-{trace_id}-"))
+
+    def test_database_queries_are_recorded_as_spans(self):
+        """Queries executed inside a trace produce db.query child spans."""
+
+        def view(request):
+            with connection.execute_wrapper(tracing.db_span_wrapper), connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            return HttpResponse()
+
+        tracing.TraceContextMiddleware(view)(RequestFactory().get("/"))
+
+        db_span, request_span = self.exporter.spans
+        self.assertEqual(db_span["name"], "db.query")
+        self.assertEqual(db_span["attributes"]["sql"], "SELECT 1")
+        self.assertEqual(db_span["parent_id"], request_span["span_id"])
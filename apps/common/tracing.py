@@ -0,0 +1,269 @@
+"""
+Lightweight trace-context propagation and span export.
+
+A trace id is created (or adopted from an incoming W3C ``traceparent`` header)
+for every HTTP request, carried to Celery workers in the task message headers
+and attached to every log record and span emitted while handling that request
+or task. Spans are written as JSON lines to stdout or to a local file, so the
+path of a migration from the API through the broker to the worker and its SQL
+can be reconstructed without an external collector.
+
+Configuration (``settings``):
+    TRACING_EXPORTER: ``"none"`` (default), ``"stdout"`` or ``"file"``.
+    TRACING_EXPORT_PATH: Target file for the ``"file"`` exporter.
+"""
+import json
+import logging
+import re
+import sys
+import threading
+import time
+import uuid
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+TRACE_ID_HEADER = "trace_id"
+PARENT_SPAN_ID_HEADER = "parent_span_id"
+RESPONSE_TRACE_ID_HEADER = "X-Trace-Id"
+
+_TRACEPARENT_RE = re.compile(r"^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+_SQL_PREVIEW_LENGTH = 300
+
+_trace_id = ContextVar("trace_id", default=None)
+_span_id = ContextVar("span_id", default=None)
+
+
+def new_trace_id():
+    """Return a new random 128-bit trace id as 32 hex characters."""
+    return uuid.uuid4().hex
+
+
+def new_span_id():
+    """Return a new random 64-bit span id as 16 hex characters."""
+    return uuid.uuid4().hex[:16]
+
+
+def get_trace_id():
+    """Return the trace id of the current context, or None outside a trace."""
+    return _trace_id.get()
+
+
+def get_span_id():
+    """Return the id of the innermost active span, or None."""
+    return _span_id.get()
+
+
+def parse_traceparent(value):
+    """
+    Parse a W3C ``traceparent`` header.
+
+    Returns:
+        tuple: ``(trace_id, parent_span_id)``, or ``(None, None)`` if the value
+        is missing or malformed.
+    """
+    match = _TRACEPARENT_RE.match((value or "").strip().lower())
+    if not match:
+        return None, None
+    return match.group(1), match.group(2)
+
+
+def format_traceparent(trace_id, span_id):
+    """Format a W3C ``traceparent`` header value (sampled flag set)."""
+    return f"00-{trace_id}-{span_id}-01"
+
+
+@contextmanager
+def trace_context(trace_id=None, parent_span_id=None):
+    """Activate a trace for the duration of the block, creating one if needed."""
+    trace_token = _trace_id.set(trace_id or new_trace_id())
+    span_token = _span_id.set(parent_span_id)
+    try:
+        yield _trace_id.get()
+    finally:
+        _span_id.reset(span_token)
+        _trace_id.reset(trace_token)
+
+
+@contextmanager
+def span(name, **attributes):
+    """
+    Record a timed span as a child of the current span.
+
+    Outside an active trace, or when no exporter is configured, the block runs
+    untouched. Exceptions are recorded on the span and re-raised.
+    """
+    trace_id = _trace_id.get()
+    exporter = get_exporter()
+    if trace_id is None or exporter is None:
+        yield None
+        return
+
+    span_id = new_span_id()
+    parent_id = _span_id.get()
+    token = _span_id.set(span_id)
+    started_at = time.time()
+    start = time.perf_counter()
+    error = None
+    try:
+        yield span_id
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        duration_ms = (time.perf_counter() - start) * 1000
+        _span_id.reset(token)
+        exporter.export(
+            {
+                "trace_id": trace_id,
+                "span_id": span_id,
+                "parent_id": parent_id,
+                "name": name,
+                "start": started_at,
+                "duration_ms": round(duration_ms, 3),
+                "error": error,
+                "attributes": attributes,
+            }
+        )
+
+
+class _StreamExporter:
+    """Writes one JSON document per span to a text stream."""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._lock = threading.Lock()
+
+    def export(self, record):
+        line = json.dumps(record, default=str)
+        with self._lock:
+            self._stream.write(line + "\n")
+            self._stream.flush()
+
+
+@lru_cache(maxsize=None)
+def get_exporter():
+    """Return the configured span exporter, or None when export is disabled."""
+    kind = getattr(settings, "TRACING_EXPORTER", "none")
+    if kind == "stdout":
+        return _StreamExporter(sys.stdout)
+    if kind == "file":
+        # Line buffering keeps spans from concurrent processes from interleaving.
+        return _StreamExporter(open(settings.TRACING_EXPORT_PATH, "a", buffering=1, encoding="utf-8"))
+    if kind != "none":
+        logger.warning(f"Unknown TRACING_EXPORTER '{kind}'; span export is disabled.")
+    return None
+
+
+def db_span_wrapper(execute, sql, params, many, context):
+    """A database execute wrapper that records each query as a span."""
+    if _trace_id.get() is None:
+        return execute(sql, params, many, context)
+    alias = context["connection"].alias
+    with span("db.query", db=alias, sql=sql[:_SQL_PREVIEW_LENGTH], many=many):
+        return execute(sql, params, many, context)
+
+
+def install_db_span_wrapper(sender, connection, **kwargs):
+    """``connection_created`` receiver attaching the span wrapper to new connections."""
+    if db_span_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, db_span_wrapper)
+
+
+class TraceContextFilter(logging.Filter):
+    """Logging filter adding ``trace_id`` and ``span_id`` to every record."""
+
+    def filter(self, record):
+        record.trace_id = _trace_id.get() or "-"
+        record.span_id = _span_id.get() or "-"
+        return True
+
+
+class TraceContextMiddleware:
+    """
+    Runs every request inside a trace and a root ``http.request`` span.
+
+    An incoming ``traceparent`` header is honoured so that traces started by a
+    client or gateway continue through the API. The trace id is echoed back in
+    the ``X-Trace-Id`` and ``traceparent`` response headers.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        # Under ASGI, stay async so async views are not pushed into a thread.
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        trace_id, parent_span_id = parse_traceparent(request.headers.get("traceparent"))
+        with trace_context(trace_id, parent_span_id) as active_trace_id:
+            with span("http.request", method=request.method, path=request.path) as span_id:
+                response = self.get_response(request)
+                if span_id is not None:
+                    response["traceparent"] = format_traceparent(active_trace_id, span_id)
+        response[RESPONSE_TRACE_ID_HEADER] = active_trace_id
+        return response
+
+    async def __acall__(self, request):
+        trace_id, parent_span_id = parse_traceparent(request.headers.get("traceparent"))
+        with trace_context(trace_id, parent_span_id) as active_trace_id:
+            with span("http.request", method=request.method, path=request.path) as span_id:
+                response = await self.get_response(request)
+                if span_id is not None:
+                    response["traceparent"] = format_traceparent(active_trace_id, span_id)
+        response[RESPONSE_TRACE_ID_HEADER] = active_trace_id
+        return response
+
+
+# --- Celery propagation ---
+
+_active_task_traces = {}
+
+
+def inject_task_headers(headers=None, **kwargs):
+    """``before_task_publish`` receiver copying the trace context into the message."""
+    trace_id = _trace_id.get()
+    if headers is None or trace_id is None:
+        return
+    headers.setdefault(TRACE_ID_HEADER, trace_id)
+    headers.setdefault(PARENT_SPAN_ID_HEADER, _span_id.get())
+
+
+def start_task_trace(task_id=None, task=None, **kwargs):
+    """``task_prerun`` receiver restoring the publisher's trace in the worker."""
+    request = task.request
+    stack = ExitStack()
+    stack.enter_context(
+        trace_context(getattr(request, TRACE_ID_HEADER, None), getattr(request, PARENT_SPAN_ID_HEADER, None))
+    )
+    stack.enter_context(span("celery.task", task=task.name, task_id=task_id, retries=request.retries))
+    _active_task_traces[task_id] = stack
+
+
+def end_task_trace(task_id=None, **kwargs):
+    """``task_postrun`` receiver closing the task's trace."""
+    stack = _active_task_traces.pop(task_id, None)
+    if stack is not None:
+        stack.close()
+
+
+def connect_signals():
+    """Connect the database and Celery receivers. Called from ``CommonConfig.ready``."""
+    from celery import signals as celery_signals
+    from django.db.backends.signals import connection_created
+
+    if get_exporter() is not None:
+        connection_created.connect(install_db_span_wrapper, dispatch_uid="tracing.db_span_wrapper")
+    celery_signals.before_task_publish.connect(inject_task_headers, dispatch_uid="tracing.inject")
+    celery_signals.task_prerun.connect(start_task_trace, dispatch_uid="tracing.start")
+    celery_signals.task_postrun.connect(end_task_trace, dispatch_uid="tracing.end")
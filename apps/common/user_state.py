@@ -0,0 +1,99 @@
+"""
+Cached authentication state of users.
+
+The state is what :mod:`apps.common.authentication` checks tokens against:
+the active flag, a hash of the password hash, the staff and superuser flags,
+and the revocation time. It is cached in the ``auth`` cache for
+``AUTH_USER_CACHE_TTL`` seconds and dropped when the user or their
+``TokenRevocation`` changes.
+
+This module imports neither DRF nor simplejwt, so processes that only need
+the invalidation receivers (such as Celery workers) do not pay for them.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_delete, post_save
+
+from .models import TokenRevocation
+
+CACHE_KEY = "auth:user-state:{}"
+# Claims copied from the user at login; a token whose claims no longer match is rejected.
+ROLE_CLAIMS = ("is_staff", "is_superuser")
+
+
+def _cache():
+    return caches[getattr(settings, "AUTH_CACHE_ALIAS", "auth")]
+
+
+def _user_id_field():
+    return getattr(settings, "SIMPLE_JWT", {}).get("USER_ID_FIELD", "id")
+
+
+def _user_state_query(user_id):
+    # Revocations must apply at once, so never read them from a lagging replica.
+    return get_user_model().objects.using(DEFAULT_DB_ALIAS).filter(**{_user_id_field(): user_id}).values(
+        "is_active", "password", *ROLE_CLAIMS, "token_revocation__revoked_before"
+    )
+
+
+def _user_state(row):
+    from rest_framework_simplejwt.utils import get_md5_hash_password
+
+    if row is None:
+        return None
+    revoked_before = row.pop("token_revocation__revoked_before")
+    row["password"] = get_md5_hash_password(row["password"])
+    row["revoked_before"] = revoked_before.timestamp() if revoked_before else None
+    return row
+
+
+def load_user_state(user_id):
+    """Read the user's authentication state from the database, or None if the user is gone."""
+    return _user_state(_user_state_query(user_id).first())
+
+
+async def aload_user_state(user_id):
+    """Async ORM version of :func:`load_user_state`."""
+    return _user_state(await _user_state_query(user_id).afirst())
+
+
+def get_user_state(user_id):
+    """Return the user's cached authentication state, loading it on a miss."""
+    key = CACHE_KEY.format(user_id)
+    state = _cache().get(key)
+    if state is None:
+        state = load_user_state(user_id) or {}
+        _cache().set(key, state, getattr(settings, "AUTH_USER_CACHE_TTL", 60))
+    return state or None
+
+
+async def aget_user_state(user_id):
+    """Async version of :func:`get_user_state`."""
+    key = CACHE_KEY.format(user_id)
+    state = await _cache().aget(key)
+    if state is None:
+        state = await aload_user_state(user_id) or {}
+        await _cache().aset(key, state, getattr(settings, "AUTH_USER_CACHE_TTL", 60))
+    return state or None
+
+
+def invalidate_user_state(user_id):
+    _cache().delete(CACHE_KEY.format(user_id))
+
+
+def _invalidate_user(sender, instance, **kwargs):
+    invalidate_user_state(getattr(instance, _user_id_field()))
+
+
+def _invalidate_revocation(sender, instance, **kwargs):
+    invalidate_user_state(getattr(instance.user, _user_id_field()))
+
+
+def connect_signals():
+    """Drop cached user state whenever a user or their revocation record changes."""
+    user_model = get_user_model()
+    for signal in (post_save, post_delete):
+        signal.connect(_invalidate_user, sender=user_model, dispatch_uid=f"auth-cache-{signal}-user")
+        signal.connect(_invalidate_revocation, sender=TokenRevocation, dispatch_uid=f"auth-cache-{signal}-revocation")
@@ -0,0 +1,11 @@
+"""
+A filesystem persistence backend for the migration domain objects.
+
+The store is a standalone library: it does not use the Django ORM or need a
+database, so it can be embedded in agents and tools that run on the servers
+being migrated. See :class:`~apps.filestore.store.FileStore`.
+"""
+from .exceptions import FileStoreError, IntegrityError, RecordNotFound, SnapshotFormatError
+from .store import FileStore
+
+__all__ = ["FileStore", "FileStoreError", "IntegrityError", "RecordNotFound", "SnapshotFormatError"]
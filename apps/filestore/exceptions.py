@@ -0,0 +1,17 @@
+"""Exceptions raised by the file store."""
+
+
+class FileStoreError(Exception):
+    """Base class for errors raised by the file store."""
+
+
+class RecordNotFound(FileStoreError):
+    """Raised when a record id does not exist in a table."""
+
+
+class IntegrityError(FileStoreError):
+    """Raised when a write would violate a uniqueness or reference constraint."""
+
+
+class SnapshotFormatError(FileStoreError):
+    """Raised when a snapshot file is truncated or was not written by the file store."""
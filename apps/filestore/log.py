@@ -0,0 +1,162 @@
+"""
+Append-only record log with checksummed framing and batched fsync.
+
+Every entry is stored as::
+
+    <uint32 payload length> <uint32 crc32(payload)> <payload: compact JSON>
+
+An entry is either durable and complete, or it is a torn tail left by a crash
+and is truncated away on the next open. Writes are appended to the end of the
+file. They are made durable in groups, after ``sync_every`` appends or
+``sync_interval`` seconds, whichever comes first, so a burst of updates
+shares one ``fsync``.
+"""
+import json
+import logging
+import os
+import struct
+import threading
+import zlib
+
+logger = logging.getLogger(__name__)
+
+HEADER = struct.Struct("<II")
+
+
+def fsync_directory(path):
+    """Persist a rename or file creation in ``path``'s directory."""
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def encode_entry(entry):
+    """Frame a JSON-serializable entry as log bytes."""
+    payload = json.dumps(entry, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+class RecordLog:
+    """
+    An append-only, crash-safe log of JSON entries.
+
+    Attributes:
+        path (str): Location of the log file.
+        entry_count (int): Number of entries currently in the log.
+    """
+
+    def __init__(self, path, sync_every=64, sync_interval=0.05):
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.entry_count = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._file = open(path, "ab")
+        self._closed = threading.Event()
+        self._flusher = None
+        if sync_interval:
+            self._flusher = threading.Thread(target=self._flush_periodically, name="filestore-fsync", daemon=True)
+            self._flusher.start()
+
+    def replay(self):
+        """
+        Yield every intact entry in the log, oldest first.
+
+        A torn or corrupt tail (from a crash mid-write) is truncated so that
+        later appends start from a clean boundary.
+        """
+        good_end = 0
+        count = 0
+        with open(self.path, "rb") as f:
+            while True:
+                header = f.read(HEADER.size)
+                if len(header) < HEADER.size:
+                    break
+                length, checksum = HEADER.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length or zlib.crc32(payload) != checksum:
+                    break
+                good_end = f.tell()
+                count += 1
+                yield json.loads(payload)
+            torn = f.seek(0, os.SEEK_END) != good_end
+
+        if torn:
+            logger.warning(f"Truncating torn tail of record log {self.path} at byte {good_end}.")
+            with self._lock:
+                self._file.flush()
+                os.truncate(self.path, good_end)
+                self._fsync()
+        self.entry_count = count
+
+    def append(self, entry):
+        """Append one entry; it becomes durable at the next group sync."""
+        data = encode_entry(entry)
+        with self._lock:
+            self._file.write(data)
+            self.entry_count += 1
+            self._pending += 1
+            if self._pending >= self.sync_every:
+                self._sync_locked()
+
+    def sync(self):
+        """Flush and fsync all appended entries now."""
+        with self._lock:
+            self._sync_locked()
+
+    def rewrite(self, entries):
+        """
+        Atomically replace the log with ``entries`` (used by compaction).
+
+        The new log is written to a temporary file, fsynced and renamed over
+        the old one, so a crash leaves either the old or the new log intact.
+        """
+        tmp_path = f"{self.path}.compact"
+        count = 0
+        with open(tmp_path, "wb") as f:
+            for entry in entries:
+                f.write(encode_entry(entry))
+                count += 1
+            f.flush()
+            os.fsync(f.fileno())
+        with self._lock:
+            self._file.close()
+            os.replace(tmp_path, self.path)
+            fsync_directory(self.path)
+            self._file = open(self.path, "ab")
+            self.entry_count = count
+            self._pending = 0
+
+    def size(self):
+        """Return the size of the log in bytes, including unflushed appends."""
+        with self._lock:
+            self._file.flush()
+            return os.path.getsize(self.path)
+
+    def close(self):
+        """Sync outstanding entries and close the file."""
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        with self._lock:
+            if not self._file.closed:
+                self._sync_locked()
+                self._file.close()
+
+    def _sync_locked(self):
+        if self._pending:
+            self._fsync()
+            self._pending = 0
+
+    def _fsync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.sync_interval):
+            with self._lock:
+                if not self._file.closed:
+                    self._sync_locked()
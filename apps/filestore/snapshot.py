@@ -0,0 +1,149 @@
+"""
+Compact binary snapshots of the file store's tables.
+
+A snapshot is one file with this layout::
+
+    header      magic, directory offset, directory length
+    per table:
+      records   compact JSON payloads, back to back
+      offsets   one fixed-width <uint64 offset, uint32 length> entry per record
+      indexes   per indexed field, <16-byte key hash, uint32 record number>
+                entries sorted by hash
+    directory   JSON: where each table's offsets and indexes start
+
+Readers ``mmap`` the file and binary-search the index regions, so opening a
+snapshot costs the same whatever its size. A record is parsed only when it is
+read, and only the pages that are touched are loaded into memory.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+from .exceptions import SnapshotFormatError
+from .tables import index_values
+
+MAGIC = b"FSSNAP01"
+HEADER = struct.Struct("<8sQQ")
+OFFSET_ENTRY = struct.Struct("<QI")
+INDEX_ENTRY = struct.Struct("<16sI")
+KEY_SIZE = 16
+
+
+def index_key(value):
+    """Hash an indexed value to a fixed-width index key."""
+    return hashlib.blake2b(str(value).encode("utf-8"), digest_size=KEY_SIZE).digest()
+
+
+def write_snapshot(path, tables, indexed_fields):
+    """
+    Write ``tables`` to a new snapshot file at ``path``.
+
+    Args:
+        path (str): Destination file. It is created or truncated.
+        tables (dict): Table name -> iterable of records.
+        indexed_fields (dict): Table name -> fields to build indexes for.
+            Tables not listed here are stored without indexes.
+    """
+    directory = {}
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, 0, 0))
+        for name, records in tables.items():
+            fields = indexed_fields.get(name, ())
+            offsets = []
+            index_entries = {field: [] for field in fields}
+            for number, record in enumerate(records):
+                payload = json.dumps(record, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+                offsets.append((f.tell(), len(payload)))
+                f.write(payload)
+                for field in fields:
+                    index_entries[field].extend((index_key(value), number) for value in index_values(record[field]))
+
+            section = {"count": len(offsets), "offsets": f.tell(), "indexes": {}}
+            f.write(b"".join(OFFSET_ENTRY.pack(*entry) for entry in offsets))
+            for field, entries in index_entries.items():
+                entries.sort()
+                section["indexes"][field] = [f.tell(), len(entries)]
+                f.write(b"".join(INDEX_ENTRY.pack(*entry) for entry in entries))
+            directory[name] = section
+
+        directory_offset = f.tell()
+        payload = json.dumps(directory).encode("utf-8")
+        f.write(payload)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, directory_offset, len(payload)))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class SnapshotSection:
+    """Lazy, read-only access to one table of a snapshot."""
+
+    def __init__(self, buffer, meta):
+        self._buffer = buffer
+        self.count = meta["count"]
+        self._offsets = meta["offsets"]
+        self._indexes = meta["indexes"]
+
+    def record(self, number):
+        """Decode and return record ``number``."""
+        offset, length = OFFSET_ENTRY.unpack_from(self._buffer, self._offsets + number * OFFSET_ENTRY.size)
+        return json.loads(self._buffer[offset:offset + length])
+
+    def records(self):
+        for number in range(self.count):
+            yield self.record(number)
+
+    def lookup(self, field, value):
+        """Yield the numbers of the records whose ``field`` may contain ``value``."""
+        start, count = self._indexes[field]
+        key = index_key(value)
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            position = start + middle * INDEX_ENTRY.size
+            if self._buffer[position:position + KEY_SIZE] < key:
+                low = middle + 1
+            else:
+                high = middle
+        while low < count:
+            entry_key, number = INDEX_ENTRY.unpack_from(self._buffer, start + low * INDEX_ENTRY.size)
+            if entry_key != key:
+                break
+            yield number
+            low += 1
+
+
+class Snapshot:
+    """
+    A memory-mapped snapshot file.
+
+    Attributes:
+        path (str): Location of the snapshot file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, directory_offset, directory_length = HEADER.unpack_from(self._buffer, 0)
+            if magic != MAGIC or directory_offset + directory_length > len(self._buffer):
+                raise SnapshotFormatError(f"{path} is not a complete file store snapshot.")
+            self._directory = json.loads(self._buffer[directory_offset:directory_offset + directory_length])
+        except (struct.error, ValueError) as e:
+            self._buffer.close()
+            raise SnapshotFormatError(f"{path} is not a readable file store snapshot: {e}")
+        except SnapshotFormatError:
+            self._buffer.close()
+            raise
+
+    def __contains__(self, name):
+        return name in self._directory
+
+    def section(self, name):
+        return SnapshotSection(self._buffer, self._directory[name])
+
+    def close(self):
+        self._buffer.close()
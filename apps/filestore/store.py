@@ -0,0 +1,465 @@
+"""
+File-backed persistence for workloads, credentials and migrations.
+
+``FileStore`` writes each change to an append-only
+:class:`~apps.filestore.log.RecordLog` before applying it in memory. Once
+enough changes have accumulated, the store is compacted: every table is
+written to a binary :mod:`snapshot <apps.filestore.snapshot>` and the log is
+emptied. On startup the snapshot is memory-mapped and only the log written
+since then is replayed. The large workload and mount point tables are served
+lazily from the snapshot through its indexes (including ``ip_address``). The
+small tables are loaded into memory.
+
+Records are plain dicts keyed like the REST API's write payloads (foreign keys
+as ``<name>_id`` strings), and every read returns a copy.
+"""
+import fcntl
+import ipaddress
+import os
+import threading
+import uuid
+from datetime import datetime, timezone
+
+from cryptography.fernet import Fernet
+from django.core.exceptions import ValidationError
+
+from .exceptions import FileStoreError, IntegrityError, RecordNotFound
+from .log import RecordLog, fsync_directory
+from .snapshot import Snapshot, write_snapshot
+from .tables import SnapshotTable, Table
+
+# Mirrors of the model choices, kept here so the store does not need a
+# configured Django project. Tests assert that they stay in sync.
+CLOUD_TYPES = ("aws", "azure", "vsphere", "vcloud")
+MIGRATION_STATES = ("not_started", "running", "paused", "error", "success", "cancelled")
+
+REQUIRED = object()
+
+PROTECT = "protect"
+CASCADE = "cascade"
+REMOVE = "remove"  # Many-to-many: drop the id from the referencing list.
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+class Repository:
+    """
+    CRUD access to one table, enforcing its field rules.
+
+    Subclasses declare their schema through class attributes and may add
+    validation in :meth:`clean`.
+
+    Attributes:
+        table (str): Name of the backing table.
+        fields (dict): Field name -> default value, or ``REQUIRED``.
+        immutable (tuple): Fields that cannot change after creation.
+        references (dict): Foreign-key field -> ``(table, on_delete)``.
+    """
+
+    table = None
+    fields = {}
+    immutable = ()
+    references = {}
+    unique = ()
+    indexed = ()
+
+    def __init__(self, store):
+        self.store = store
+
+    @property
+    def _table(self):
+        return self.store.tables[self.table]
+
+    def __len__(self):
+        return len(self._table)
+
+    def get(self, record_id):
+        """Return a copy of the record, or raise :class:`RecordNotFound`."""
+        record = self._table.get(record_id)
+        if record is None:
+            raise RecordNotFound(f"{self.table} record {record_id} does not exist.")
+        return self.store.decode(self.table, record)
+
+    def list(self):
+        """Return copies of all records in the table."""
+        with self.store.lock:
+            return [self.store.decode(self.table, record) for record in self._table]
+
+    def create(self, **data):
+        unknown = set(data) - set(self.fields)
+        if unknown:
+            raise ValidationError(f"Unknown {self.table} fields: {', '.join(sorted(unknown))}.")
+        record = {name: data.get(name, default) for name, default in self.fields.items()}
+        missing = [name for name, value in record.items() if value is REQUIRED or value is None]
+        if missing:
+            raise ValidationError(f"Missing required {self.table} fields: {', '.join(missing)}.")
+        now = _now()
+        record.update(id=str(uuid.uuid4()), created_at=now, updated_at=now)
+
+        with self.store.lock:
+            self.clean(record, existing=None)
+            self._check_references(record)
+            self.store.commit([("put", self.table, self.store.encode(self.table, record))])
+        return self.get(record["id"])
+
+    def update(self, record_id, **changes):
+        unknown = set(changes) - set(self.fields)
+        if unknown:
+            raise ValidationError(f"Unknown {self.table} fields: {', '.join(sorted(unknown))}.")
+        with self.store.lock:
+            existing = self.get(record_id)
+            for name in self.immutable:
+                if name in changes and changes[name] != existing[name]:
+                    raise ValidationError(f"The {name} of a {self.table} record cannot be changed.")
+            for name, value in changes.items():
+                if value is None and self.fields[name] is REQUIRED:
+                    raise ValidationError(f"The {self.table} field {name} cannot be None.")
+            record = {**existing, **changes, "updated_at": _now()}
+            self.clean(record, existing=existing)
+            self._check_references(record)
+            self.store.commit([("put", self.table, self.store.encode(self.table, record))])
+        return self.get(record_id)
+
+    def delete(self, record_id):
+        """Delete a record, cascading to or protecting dependent records."""
+        with self.store.lock:
+            self.get(record_id)
+            self.store.commit(self.store.plan_delete(self.table, record_id))
+
+    def clean(self, record, existing):
+        """Hook for table-specific validation; raise ``ValidationError`` to reject."""
+
+    def _check_references(self, record):
+        for field, (table, _) in self.references.items():
+            values = record[field] if isinstance(record[field], list) else [record[field]]
+            for value in values:
+                if value not in self.store.tables[table]:
+                    raise IntegrityError(f"{self.table}.{field} refers to missing {table} record {value}.")
+
+
+class CredentialsRepository(Repository):
+    table = "credentials"
+    fields = {"username": REQUIRED, "password": REQUIRED, "domain": ""}
+
+
+class WorkloadRepository(Repository):
+    table = "workloads"
+    fields = {"name": REQUIRED, "ip_address": REQUIRED, "credentials_id": REQUIRED}
+    immutable = ("ip_address",)
+    references = {"credentials_id": ("credentials", PROTECT)}
+    unique = ("ip_address",)
+    indexed = ("credentials_id",)
+
+    def get_by_ip(self, ip_address):
+        """Return the workload with the given IP address (O(1) hash lookup)."""
+        record_id = self._table.find_unique("ip_address", self._normalize_ip(ip_address))
+        if record_id is None:
+            raise RecordNotFound(f"No workload with IP address {ip_address}.")
+        return self.get(record_id)
+
+    def clean(self, record, existing):
+        record["ip_address"] = self._normalize_ip(record["ip_address"])
+        owner = self._table.find_unique("ip_address", record["ip_address"])
+        if owner is not None and owner != record["id"]:
+            raise IntegrityError(f"A workload with IP address {record['ip_address']} already exists.")
+
+    @staticmethod
+    def _normalize_ip(value):
+        try:
+            return str(ipaddress.ip_address(value))
+        except ValueError:
+            raise ValidationError(f"'{value}' is not a valid IP address.")
+
+
+class MountPointRepository(Repository):
+    table = "mount_points"
+    fields = {"workload_id": REQUIRED, "name": REQUIRED, "size_gb": REQUIRED}
+    immutable = ("workload_id",)
+    references = {"workload_id": ("workloads", CASCADE)}
+    indexed = ("workload_id",)
+
+    def for_workload(self, workload_id):
+        """Return the mount points attached to a workload."""
+        with self.store.lock:
+            return [self.get(record_id) for record_id in self._table.find("workload_id", workload_id)]
+
+    def clean(self, record, existing):
+        if not isinstance(record["size_gb"], int) or record["size_gb"] < 0:
+            raise ValidationError("size_gb must be a non-negative integer.")
+        for sibling_id in self._table.find("workload_id", record["workload_id"]):
+            if sibling_id != record["id"] and self._table.get(sibling_id)["name"] == record["name"]:
+                raise IntegrityError(f"Workload {record['workload_id']} already has a mount point {record['name']}.")
+
+
+class MigrationTargetRepository(Repository):
+    table = "migration_targets"
+    fields = {"cloud_type": REQUIRED, "cloud_credentials_id": REQUIRED, "target_vm_id": REQUIRED}
+    references = {"cloud_credentials_id": ("credentials", PROTECT), "target_vm_id": ("workloads", CASCADE)}
+    unique = ("target_vm_id",)
+    indexed = ("cloud_credentials_id",)
+
+    def clean(self, record, existing):
+        if record["cloud_type"] not in CLOUD_TYPES:
+            raise ValidationError(f"cloud_type must be one of: {', '.join(CLOUD_TYPES)}.")
+        owner = self._table.find_unique("target_vm_id", record["target_vm_id"])
+        if owner is not None and owner != record["id"]:
+            raise IntegrityError(f"Workload {record['target_vm_id']} is already a migration target VM.")
+
+
+class MigrationRepository(Repository):
+    table = "migrations"
+    fields = {"source_id": REQUIRED, "target_id": REQUIRED, "state": "not_started", "selected_mount_point_ids": []}
+    references = {
+        "source_id": ("workloads", CASCADE),
+        "target_id": ("migration_targets", CASCADE),
+        "selected_mount_point_ids": ("mount_points", REMOVE),
+    }
+    indexed = ("source_id", "target_id", "selected_mount_point_ids")
+
+    def clean(self, record, existing):
+        if record["state"] not in MIGRATION_STATES:
+            raise ValidationError(f"state must be one of: {', '.join(MIGRATION_STATES)}.")
+        record["selected_mount_point_ids"] = list(dict.fromkeys(record["selected_mount_point_ids"]))
+
+
+REPOSITORIES = (
+    CredentialsRepository,
+    WorkloadRepository,
+    MountPointRepository,
+    MigrationTargetRepository,
+    MigrationRepository,
+)
+
+
+class FileStore:
+    """
+    A durable, single-process store for the migration domain objects.
+
+    Example:
+        store = FileStore("/var/lib/migrations")
+        creds = store.credentials.create(username="admin", password="secret")
+        store.workloads.create(name="db01", ip_address="10.0.0.5", credentials_id=creds["id"])
+        store.close()
+
+    Args:
+        directory (str): Directory holding the snapshot, log and lock files.
+        encryption_key (str, optional): Fernet key used to encrypt passwords
+            at rest, e.g. ``settings.FIELD_ENCRYPTION_KEY``.
+        sync_every (int): Group-commit size: fsync after this many writes.
+        sync_interval (float): Maximum seconds a write waits for its fsync.
+        compact_ratio (float): Take a snapshot when the log holds more than
+            this fraction of the number of live records.
+        compact_min_entries (int): Never compact logs smaller than this.
+    """
+
+    LOG_FILENAME = "records.log"
+    SNAPSHOT_FILENAME = "records.snapshot"
+    LOCK_FILENAME = "store.lock"
+
+    # Tables served lazily from the snapshot; the others are loaded into memory.
+    LAZY_TABLES = ("workloads", "mount_points")
+
+    def __init__(
+        self,
+        directory,
+        encryption_key=None,
+        sync_every=64,
+        sync_interval=0.05,
+        compact_ratio=0.5,
+        compact_min_entries=10_000,
+    ):
+        self.directory = directory
+        self.compact_ratio = compact_ratio
+        self.compact_min_entries = compact_min_entries
+        self.lock = threading.RLock()
+        self._fernet = Fernet(encryption_key) if encryption_key else None
+
+        os.makedirs(directory, exist_ok=True)
+        self._lock_file = open(os.path.join(directory, self.LOCK_FILENAME), "w")
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self._lock_file.close()
+            raise FileStoreError(f"The store in {directory} is already open in another process.")
+
+        self._repositories = {repository.table: repository for repository in REPOSITORIES}
+        self._references = [
+            (repository.table, field, table, on_delete)
+            for repository in REPOSITORIES
+            for field, (table, on_delete) in repository.references.items()
+        ]
+
+        self._snapshot_path = os.path.join(directory, self.SNAPSHOT_FILENAME)
+        self._snapshot = None
+        try:
+            self.tables = self._open_snapshot()
+            self.log = RecordLog(os.path.join(directory, self.LOG_FILENAME), sync_every, sync_interval)
+            for entry in self.log.replay():
+                self._apply(entry)
+        except BaseException:
+            self._lock_file.close()
+            raise
+        self._maybe_compact()
+
+        self.credentials = CredentialsRepository(self)
+        self.workloads = WorkloadRepository(self)
+        self.mount_points = MountPointRepository(self)
+        self.migration_targets = MigrationTargetRepository(self)
+        self.migrations = MigrationRepository(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _open_snapshot(self):
+        """Map the current snapshot, if any, and return tables backed by it."""
+        snapshot = Snapshot(self._snapshot_path) if os.path.exists(self._snapshot_path) else None
+        tables = {}
+        for name, repository in self._repositories.items():
+            in_snapshot = snapshot is not None and name in snapshot
+            if in_snapshot and name in self.LAZY_TABLES:
+                tables[name] = SnapshotTable(name, snapshot.section(name), repository.unique, repository.indexed)
+                continue
+            tables[name] = table = Table(name, repository.unique, repository.indexed)
+            if in_snapshot:
+                for record in snapshot.section(name).records():
+                    table.put(record)
+        if self._snapshot is not None:
+            self._snapshot.close()
+        self._snapshot = snapshot
+        return tables
+
+    # --- Write path ---
+
+    def commit(self, operations):
+        """
+        Durably log and then apply ``operations`` as one atomic entry.
+
+        Args:
+            operations (list): ``("put", table, record)`` or
+                ``("delete", table, record_id)`` tuples.
+        """
+        if not operations:
+            return
+        entries = [
+            {"op": op, "t": table, "v": value} if op == "put" else {"op": op, "t": table, "id": value}
+            for op, table, value in operations
+        ]
+        entry = entries[0] if len(entries) == 1 else {"op": "batch", "entries": entries}
+        with self.lock:
+            self.log.append(entry)
+            self._apply(entry)
+            self._maybe_compact()
+
+    def _apply(self, entry):
+        if entry["op"] == "batch":
+            for child in entry["entries"]:
+                self._apply(child)
+        elif entry["op"] == "put":
+            self.tables[entry["t"]].put(entry["v"])
+        else:
+            self.tables[entry["t"]].delete(entry["id"])
+
+    def plan_delete(self, table, record_id):
+        """
+        Return the operations needed to delete a record and its dependents.
+
+        Raises:
+            IntegrityError: If a PROTECT reference points at the record.
+        """
+        deleted = {}
+        updated = {}
+        self._collect_delete(table, record_id, deleted, updated)
+        removed = set(deleted)
+        operations = [("put", t, record) for (t, record_id), record in updated.items() if (t, record_id) not in removed]
+        return operations + [("delete", t, record_id) for t, record_id in deleted]
+
+    def _collect_delete(self, table, record_id, deleted, updated):
+        if (table, record_id) in deleted:
+            return
+        deleted[(table, record_id)] = None
+        for source_table, field, target_table, on_delete in self._references:
+            if target_table != table:
+                continue
+            for dependent_id in self.tables[source_table].find(field, record_id):
+                key = (source_table, dependent_id)
+                if key in deleted:
+                    continue
+                if on_delete == PROTECT:
+                    raise IntegrityError(
+                        f"Cannot delete {table} record {record_id}: it is referenced by {source_table} {dependent_id}."
+                    )
+                if on_delete == CASCADE:
+                    self._collect_delete(source_table, dependent_id, deleted, updated)
+                else:
+                    dependent = updated.setdefault(key, dict(self.tables[source_table].get(dependent_id)))
+                    dependent[field] = [value for value in dependent[field] if value != record_id]
+
+    # --- Maintenance ---
+
+    def live_record_count(self):
+        return sum(len(table) for table in self.tables.values())
+
+    def _maybe_compact(self):
+        entries = self.log.entry_count
+        if entries >= self.compact_min_entries and entries > self.compact_ratio * self.live_record_count():
+            self.compact()
+
+    def compact(self):
+        """
+        Write every table to a new snapshot and empty the log.
+
+        The snapshot is renamed into place before the log is emptied. If the
+        process crashes in between, the old log is replayed over the new
+        snapshot on the next open. That is harmless: the snapshot already
+        reflects every entry in the log, and replaying them again leaves each
+        record in its final state.
+        """
+        with self.lock:
+            tmp_path = f"{self._snapshot_path}.tmp"
+            write_snapshot(
+                tmp_path,
+                {name: iter(table) for name, table in self.tables.items()},
+                {
+                    name: ("id", *repository.unique, *repository.indexed)
+                    for name, repository in self._repositories.items()
+                    if name in self.LAZY_TABLES
+                },
+            )
+            os.replace(tmp_path, self._snapshot_path)
+            fsync_directory(self._snapshot_path)
+            self.tables = self._open_snapshot()
+            self.log.rewrite(())
+
+    def sync(self):
+        """Make every write so far durable."""
+        self.log.sync()
+
+    def close(self):
+        """Sync outstanding writes, unmap the snapshot and release the store's lock."""
+        self.log.close()
+        if self._snapshot is not None:
+            self._snapshot.close()
+        fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+        self._lock_file.close()
+
+    # --- Field encoding ---
+
+    def encode(self, table, record):
+        """Prepare a record for storage (encrypts credential passwords)."""
+        if table == "credentials" and self._fernet is not None:
+            record = {**record, "password": self._fernet.encrypt(record["password"].encode()).decode()}
+        return record
+
+    def decode(self, table, record):
+        """Return a caller-owned copy of a stored record."""
+        record = dict(record)
+        if table == "credentials" and self._fernet is not None:
+            record["password"] = self._fernet.decrypt(record["password"].encode()).decode()
+        if table == "migrations":
+            record["selected_mount_point_ids"] = list(record["selected_mount_point_ids"])
+        return record
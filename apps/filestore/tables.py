@@ -0,0 +1,149 @@
+"""
+Tables used by the file store.
+
+``Table`` holds every record in memory. ``SnapshotTable`` serves the records of
+a memory-mapped snapshot lazily and keeps changes made since the snapshot in
+an in-memory ``Table`` overlay.
+"""
+
+
+def index_values(value):
+    """Return the index keys of a field value; list values index each element."""
+    return value if isinstance(value, list) else (value,)
+
+
+class Table:
+    """
+    An in-memory table with hash indexes.
+
+    Attributes:
+        name (str): Table name, as used in log entries.
+        unique (tuple): Fields with a unique hash index (value -> id).
+        indexed (tuple): Fields with a non-unique hash index (value -> ids).
+            List-valued fields index each element.
+    """
+
+    def __init__(self, name, unique=(), indexed=()):
+        self.name = name
+        self.unique = unique
+        self.indexed = indexed
+        self._records = {}
+        self._unique_indexes = {field: {} for field in unique}
+        self._indexes = {field: {} for field in indexed}
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, record_id):
+        return record_id in self._records
+
+    def __iter__(self):
+        return iter(self._records.values())
+
+    def get(self, record_id):
+        return self._records.get(record_id)
+
+    def find_unique(self, field, value):
+        """Return the id of the record whose unique ``field`` equals ``value``."""
+        return self._unique_indexes[field].get(value)
+
+    def find(self, field, value):
+        """Return the ids of the records whose indexed ``field`` contains ``value``."""
+        if field in self._unique_indexes:
+            record_id = self._unique_indexes[field].get(value)
+            return {record_id} if record_id is not None else set()
+        return set(self._indexes[field].get(value, ()))
+
+    def put(self, record):
+        self.delete(record["id"])
+        self._records[record["id"]] = record
+        for field, index in self._unique_indexes.items():
+            index[record[field]] = record["id"]
+        for field, index in self._indexes.items():
+            for value in index_values(record[field]):
+                index.setdefault(value, set()).add(record["id"])
+
+    def delete(self, record_id):
+        record = self._records.pop(record_id, None)
+        if record is None:
+            return None
+        for field, index in self._unique_indexes.items():
+            index.pop(record[field], None)
+        for field, index in self._indexes.items():
+            for value in index_values(record[field]):
+                ids = index.get(value)
+                if ids is not None:
+                    ids.discard(record_id)
+                    if not ids:
+                        del index[value]
+        return record
+
+
+class SnapshotTable:
+    """
+    A table backed by a read-only snapshot section plus an in-memory overlay.
+
+    Snapshot records are decoded only when they are read. Records written
+    since the snapshot live in the overlay, and snapshot records that were
+    updated or deleted are masked by id. Exposes the same interface as
+    :class:`Table`.
+
+    Attributes:
+        section (SnapshotSection): The table's region of the snapshot file.
+    """
+
+    def __init__(self, name, section, unique=(), indexed=()):
+        self.name = name
+        self.unique = unique
+        self.indexed = indexed
+        self.section = section
+        self._overlay = Table(name, unique, indexed)
+        self._masked = set()
+
+    def __len__(self):
+        return self.section.count - len(self._masked) + len(self._overlay)
+
+    def __contains__(self, record_id):
+        return self.get(record_id) is not None
+
+    def __iter__(self):
+        yield from self._overlay
+        for record in self.section.records():
+            if record["id"] not in self._masked:
+                yield record
+
+    def get(self, record_id):
+        record = self._overlay.get(record_id)
+        if record is None:
+            record = next(self._snapshot_matches("id", record_id), None)
+        return record
+
+    def find_unique(self, field, value):
+        record_id = self._overlay.find_unique(field, value)
+        if record_id is None:
+            record = next(self._snapshot_matches(field, value), None)
+            record_id = record["id"] if record is not None else None
+        return record_id
+
+    def find(self, field, value):
+        return self._overlay.find(field, value) | {record["id"] for record in self._snapshot_matches(field, value)}
+
+    def put(self, record):
+        self.delete(record["id"])
+        self._overlay.put(record)
+
+    def delete(self, record_id):
+        record = self._overlay.delete(record_id)
+        if record is None:
+            record = next(self._snapshot_matches("id", record_id), None)
+            if record is not None:
+                self._masked.add(record_id)
+        return record
+
+    def _snapshot_matches(self, field, value):
+        """Yield live snapshot records whose ``field`` contains ``value``."""
+        for position in self.section.lookup(field, value):
+            record = self.section.record(position)
+            # The index is keyed by a hash, so confirm the match on the record.
+            if record["id"] not in self._masked and value in index_values(record[field]):
+                yield record
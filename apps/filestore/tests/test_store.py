@@ -0,0 +1,223 @@
+"""Tests for the file-backed persistence store."""
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from cryptography.fernet import Fernet
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+
+from apps.filestore import FileStore, FileStoreError, IntegrityError, RecordNotFound, SnapshotFormatError
+from apps.filestore import store as store_module
+from apps.filestore.snapshot import SnapshotSection
+from apps.filestore.tables import SnapshotTable
+from apps.migration_manager.models import Migration, MigrationTarget
+
+
+class FileStoreTestCase(SimpleTestCase):
+    """Creates a store in a temporary directory and reopens it on demand."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="filestore-")
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.store = self._open()
+
+    def tearDown(self):
+        self.store.close()
+
+    def _open(self, **options):
+        options.setdefault("sync_interval", 0)
+        return FileStore(self.directory, **options)
+
+    def _reopen(self, **options):
+        self.store.close()
+        self.store = self._open(**options)
+        return self.store
+
+    def _workload(self, ip_address="10.0.0.1", name="srv"):
+        credentials = self.store.credentials.create(username="admin", password="secret")
+        return self.store.workloads.create(name=name, ip_address=ip_address, credentials_id=credentials["id"])
+
+
+class FileStoreTests(FileStoreTestCase):
+    """Test suite for FileStore reads, writes and recovery."""
+
+    def test_records_survive_reopen(self):
+        """Replaying the log rebuilds the tables and the IP index."""
+        workload = self._workload("10.0.0.1")
+        self.store.mount_points.create(workload_id=workload["id"], name="C:\\", size_gb=100)
+        self.store.workloads.update(workload["id"], name="renamed")
+
+        store = self._reopen()
+        self.assertEqual(store.workloads.get_by_ip("10.0.0.1")["name"], "renamed")
+        self.assertEqual([mp["name"] for mp in store.mount_points.for_workload(workload["id"])], ["C:\\"])
+
+    def test_ip_address_is_unique_normalized_and_immutable(self):
+        workload = self._workload("10.0.0.1")
+        with self.assertRaises(IntegrityError):
+            self._workload("10.0.0.1")
+        with self.assertRaises(ValidationError):
+            self.store.workloads.update(workload["id"], ip_address="10.0.0.2")
+        with self.assertRaises(ValidationError):
+            self._workload("not-an-ip")
+        ipv6 = self._workload("2001:DB8::0001")
+        self.assertEqual(self.store.workloads.get_by_ip("2001:db8:0::1")["id"], ipv6["id"])
+
+    def test_required_fields_and_choices_are_validated(self):
+        with self.assertRaises(ValidationError):
+            self.store.credentials.create(username="admin", password=None)
+        workload = self._workload()
+        with self.assertRaises(ValidationError):
+            self.store.migration_targets.create(
+                cloud_type="gcp", cloud_credentials_id=workload["credentials_id"], target_vm_id=workload["id"]
+            )
+        with self.assertRaises(IntegrityError):
+            self.store.mount_points.create(workload_id="missing", name="C:\\", size_gb=1)
+
+    def test_choices_match_models(self):
+        """The store's choice lists mirror the Django models."""
+        self.assertEqual(set(store_module.CLOUD_TYPES), set(MigrationTarget.CloudType.values))
+        self.assertEqual(set(store_module.MIGRATION_STATES), set(Migration.MigrationState.values))
+
+    def test_delete_cascades_and_protects(self):
+        source = self._workload("10.0.0.1", "source")
+        target_vm = self._workload("10.0.0.2", "target")
+        mount_point = self.store.mount_points.create(workload_id=source["id"], name="C:\\", size_gb=100)
+        target = self.store.migration_targets.create(
+            cloud_type="aws", cloud_credentials_id=target_vm["credentials_id"], target_vm_id=target_vm["id"]
+        )
+        migration = self.store.migrations.create(
+            source_id=source["id"], target_id=target["id"], selected_mount_point_ids=[mount_point["id"]]
+        )
+
+        with self.assertRaises(IntegrityError):
+            self.store.credentials.delete(target_vm["credentials_id"])
+
+        self.store.mount_points.delete(mount_point["id"])
+        self.assertEqual(self.store.migrations.get(migration["id"])["selected_mount_point_ids"], [])
+
+        self.store.workloads.delete(target_vm["id"])
+        store = self._reopen()
+        self.assertEqual(len(store.migration_targets), 0)
+        self.assertEqual(len(store.migrations), 0)
+        with self.assertRaises(RecordNotFound):
+            store.workloads.get_by_ip("10.0.0.2")
+
+    def test_torn_tail_is_discarded(self):
+        """A partially written final entry is dropped on the next open."""
+        self._workload("10.0.0.1")
+        self.store.close()
+        log_path = os.path.join(self.directory, FileStore.LOG_FILENAME)
+        with open(log_path, "ab") as f:
+            f.write(b"\x40\x00\x00\x00garbage")
+
+        self.store = self._open()
+        self.assertEqual(len(self.store.workloads), 1)
+        self._workload("10.0.0.2")
+        self.assertEqual(len(self._reopen().workloads), 2)
+
+    def test_compaction_keeps_one_entry_per_record(self):
+        store = self._reopen(compact_min_entries=10)
+        workload = self._workload()
+        for index in range(20):
+            store.credentials.update(workload["credentials_id"], domain=f"D{index}")
+
+        self.assertLess(store.log.entry_count, 10)
+        self.assertEqual(self._reopen().credentials.get(workload["credentials_id"])["domain"], "D19")
+
+    def test_passwords_are_encrypted_at_rest(self):
+        key = Fernet.generate_key()
+        store = self._reopen(encryption_key=key)
+        credentials = store.credentials.create(username="admin", password="hunter2")
+        store.sync()
+
+        with open(os.path.join(self.directory, FileStore.LOG_FILENAME), "rb") as f:
+            self.assertNotIn(b"hunter2", f.read())
+        self.assertEqual(self._reopen(encryption_key=key).credentials.get(credentials["id"])["password"], "hunter2")
+
+    def test_second_process_cannot_open_store(self):
+        with self.assertRaises(FileStoreError):
+            self._open()
+
+
+class SnapshotTests(FileStoreTestCase):
+    """Test suite for snapshot compaction and lazy snapshot reads."""
+
+    def setUp(self):
+        super().setUp()
+        self.source = self._workload("10.0.0.1", "source")
+        self.other = self._workload("10.0.0.2", "other")
+        self.mount_point = self.store.mount_points.create(workload_id=self.source["id"], name="C:\\", size_gb=100)
+        self.store.compact()
+
+    def _log_path(self):
+        return os.path.join(self.directory, FileStore.LOG_FILENAME)
+
+    def test_reopen_serves_records_from_snapshot(self):
+        store = self._reopen()
+        self.assertEqual(store.log.entry_count, 0)
+        self.assertIsInstance(store.tables["workloads"], SnapshotTable)
+        self.assertEqual(store.workloads.get_by_ip("10.0.0.2")["id"], self.other["id"])
+        self.assertEqual(len(store.workloads), 2)
+        self.assertEqual(len(store.credentials), 2)
+        with self.assertRaises(RecordNotFound):
+            store.workloads.get_by_ip("10.0.0.3")
+
+    def test_records_are_decoded_lazily(self):
+        store = self._reopen()
+        with patch.object(SnapshotSection, "record", autospec=True, side_effect=SnapshotSection.record) as record:
+            store.workloads.get_by_ip("10.0.0.1")
+        self.assertEqual(record.call_count, 2)  # Index match, then the read by id.
+
+    def test_changes_after_snapshot_survive_reopen_and_compaction(self):
+        store = self._reopen()
+        store.workloads.update(self.source["id"], name="renamed")
+        store.workloads.delete(self.other["id"])
+        store.mount_points.create(workload_id=self.source["id"], name="D:\\", size_gb=10)
+
+        for reopen in (self._reopen, lambda: (self.store.compact(), self._reopen())[1]):
+            store = reopen()
+            self.assertEqual(store.workloads.get_by_ip("10.0.0.1")["name"], "renamed")
+            with self.assertRaises(RecordNotFound):
+                store.workloads.get(self.other["id"])
+            self.assertEqual(len(store.workloads), 1)
+            self.assertEqual(
+                sorted(mp["name"] for mp in store.mount_points.for_workload(self.source["id"])), ["C:\\", "D:\\"]
+            )
+            with self.assertRaises(IntegrityError):
+                self._workload("10.0.0.1")
+
+    def test_delete_cascades_through_snapshot_indexes(self):
+        store = self._reopen()
+        store.workloads.delete(self.source["id"])
+        self.assertEqual(len(store.mount_points), 0)
+        self.assertEqual(len(self._reopen().mount_points), 0)
+
+    def test_crash_before_log_reset_replays_old_log(self):
+        """A log left over from before the latest snapshot replays cleanly over it."""
+        self.store.workloads.update(self.other["id"], name="renamed")
+        self.store.workloads.delete(self.source["id"])
+        self.store.sync()
+        with open(self._log_path(), "rb") as f:
+            stale_log = f.read()
+        self.store.compact()
+        self.store.close()
+        with open(self._log_path(), "wb") as f:
+            f.write(stale_log)
+
+        self.store = self._open()
+        self.assertEqual([w["name"] for w in self.store.workloads.list()], ["renamed"])
+        self.assertEqual(len(self.store.mount_points), 0)
+
+    def test_corrupt_snapshot_is_rejected(self):
+        self.store.close()
+        snapshot_path = os.path.join(self.directory, FileStore.SNAPSHOT_FILENAME)
+        with open(snapshot_path, "r+b") as f:
+            f.write(b"garbage!")
+        with self.assertRaises(SnapshotFormatError):
+            self._open()
+
+        # The failed open released the store's lock.
+        os.remove(snapshot_path)
+        self.store = self._open()
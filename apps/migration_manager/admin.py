@@ -5,26 +5,34 @@ This configuration customizes the admin interface for migration-related models,
 providing better visualization of the migration process, states, and relationships.
 """
 from django.contrib import admin
+from apps.common.admin import ScalableModelAdmin
 from .models import MigrationTarget, Migration
 
 
 @admin.register(MigrationTarget)
-class MigrationTargetAdmin(admin.ModelAdmin):
+class MigrationTargetAdmin(ScalableModelAdmin):
     """Admin configuration for the MigrationTarget model."""
     list_display = ('id', 'cloud_type', 'target_vm', 'updated_at')
     list_filter = ('cloud_type',)
-    search_fields = ('target_vm__name', 'target_vm__ip_address')
+    search_fields = ('target_vm__name',)
+    ip_search_fields = ('target_vm__ip_address',)
     list_select_related = ('target_vm', 'cloud_credentials')
+    autocomplete_fields = ('cloud_credentials', 'target_vm')
+    # MigrationTarget.__str__ reads the target VM's name.
+    autocomplete_select_related = ('target_vm',)
+    autocomplete_only = ('cloud_type', 'target_vm__name')
     readonly_fields = ('created_at', 'updated_at', 'id')
 
 
 @admin.register(Migration)
-class MigrationAdmin(admin.ModelAdmin):
+class MigrationAdmin(ScalableModelAdmin):
     """Admin configuration for the Migration model."""
     list_display = ('id', 'source', 'target', 'state', 'updated_at')
     list_filter = ('state', 'target__cloud_type')
-    search_fields = ('source__name', 'source__ip_address')
-    list_select_related = ('source', 'target')
+    search_fields = ('source__name',)
+    ip_search_fields = ('source__ip_address',)
+    # The target's __str__ reads its VM's name.
+    list_select_related = ('source', 'target__target_vm')
     readonly_fields = ('created_at', 'updated_at', 'id')
     
     # Autocomplete fields are a user-friendly way to select from a large
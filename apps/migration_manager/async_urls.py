@@ -0,0 +1,13 @@
+"""
+URL configuration for the async migration read endpoints.
+"""
+from django.urls import path
+
+from .async_views import migration_detail, migration_status
+
+app_name = "migration_manager_async"
+
+urlpatterns = [
+    path("migrations/<uuid:pk>/", migration_detail, name="migration-detail"),
+    path("migrations/<uuid:pk>/status/", migration_status, name="migration-status"),
+]
@@ -0,0 +1,32 @@
+"""
+Async read views for migrations (see :mod:`apps.common.async_views`).
+"""
+from asgiref.sync import sync_to_async
+from django.http import Http404
+
+from apps.common.async_views import NATIVE_VALUES, async_read_view
+from . import progress
+from .models import Migration
+from .readers import MigrationReader
+
+
+@async_read_view
+async def migration_detail(request, pk):
+    """The migration as ``GET /api/v1/migrations/<id>/`` returns it."""
+    migrations = await MigrationReader(NATIVE_VALUES).aread(Migration.objects.filter(pk=pk))
+    if not migrations:
+        raise Http404
+    return migrations[0]
+
+
+@async_read_view
+async def migration_status(request, pk):
+    """The migration's state and live progress, for clients polling a running migration."""
+    row = await Migration.objects.filter(pk=pk).values("id", "state", "progress", "heartbeat_at", "updated_at").afirst()
+    if row is None:
+        raise Http404
+    await sync_to_async(progress.overlay)([row])
+    reader = MigrationReader(NATIVE_VALUES)
+    row["heartbeat_at"] = reader.datetime(row["heartbeat_at"])
+    row["updated_at"] = reader.datetime(row["updated_at"])
+    return row
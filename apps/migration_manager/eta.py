@@ -0,0 +1,65 @@
+"""
+Run-time estimates for migrations, calibrated on past runs.
+
+The throughput model (:mod:`.simulation`) predicts how long a run takes
+from its volumes. Actual runs also wait for target VM locks, the database
+and the workers, so each cloud type gets a calibration factor: the median
+of actual over predicted duration of its last ``ETA_HISTORY_SIZE``
+successful runs. The actual duration is the time a run spent running
+(``active_seconds``), so time it sat paused does not count. Below
+``ETA_MIN_SAMPLES`` runs the factor is 1. Factors are cached for
+``ETA_CACHE_SECONDS``.
+"""
+import statistics
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Migration
+from .simulation import simulated_seconds
+
+CACHE_KEY = "migration-eta:calibration:{}"
+
+
+def _durations(cloud_type):
+    rows = (
+        Migration.objects.filter(
+            state=Migration.MigrationState.SUCCESS,
+            target__cloud_type=cloud_type,
+            started_at__isnull=False,
+            finished_at__isnull=False,
+        )
+        .order_by("-created_at")
+        .values_list("started_at", "finished_at", "active_seconds", "source_snapshot")[:settings.ETA_HISTORY_SIZE]
+    )
+    for started_at, finished_at, active_seconds, snapshot in rows:
+        if not snapshot:
+            continue
+        if active_seconds is None:
+            # Saved before active_seconds was recorded; the wall-clock time is all there is.
+            active_seconds = (finished_at - started_at).total_seconds()
+        yield active_seconds, [mp["size_gb"] for mp in snapshot["mount_points"]]
+
+
+def fit_calibration(cloud_type):
+    """Return the ratio of actual to predicted run time of recent runs to ``cloud_type``."""
+    ratios = []
+    for actual, sizes_gb in _durations(cloud_type):
+        predicted = simulated_seconds(cloud_type, sizes_gb)
+        if predicted > 0:
+            ratios.append(actual / predicted)
+    if len(ratios) < settings.ETA_MIN_SAMPLES:
+        return 1.0
+    return statistics.median(ratios)
+
+
+def calibration(cloud_type):
+    """Return the cached calibration factor of ``cloud_type``."""
+    return cache.get_or_set(
+        CACHE_KEY.format(cloud_type), lambda: fit_calibration(cloud_type), settings.ETA_CACHE_SECONDS
+    )
+
+
+def estimate_seconds(cloud_type, sizes_gb):
+    """Return the expected run time, in seconds, of moving volumes of ``sizes_gb`` to ``cloud_type``."""
+    return round(simulated_seconds(cloud_type, sizes_gb) * calibration(cloud_type), 1)
@@ -0,0 +1,128 @@
+"""
+Management command that checks the query plans of the main access patterns.
+
+Each pattern is a queryset the API, the readers or the admin run. Its plan
+is taken with ``EXPLAIN`` and the command fails when it reads a large
+table sequentially. Planners prefer sequential scans on small tables, so
+run it against production-sized data, for example a scratch database
+filled with ``--fleet``:
+
+    DATABASE_URL=postgres://.../scratch python manage.py migrate
+    DATABASE_URL=postgres://.../scratch python manage.py check_query_plans --fleet 200000
+
+Supported on PostgreSQL and SQLite.
+"""
+import json
+import re
+import uuid
+
+from django.apps import apps as django_apps
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.common.admin import estimate_count
+from apps.migration_manager.models import ACTIVE_STATES, Migration, MigrationTarget
+from apps.workloads.models import MountPoint, Workload
+
+# Rows of a page in the checked list queries.
+PAGE_SIZE = 100
+
+_SQLITE_FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?\"?(\w+)\"?$")
+
+
+def access_patterns():
+    """
+    Return ``{name: queryset}`` for the access patterns whose plans are checked.
+
+    Lookups by key use ids from the database, or random ones when it is empty.
+    """
+    workload_ids = list(Workload.objects.order_by().values_list("pk", flat=True)[:10]) or [uuid.uuid4()]
+    migration_ids = list(Migration.objects.order_by().values_list("pk", flat=True)[:10]) or [uuid.uuid4()]
+    workload = Workload.objects.order_by().values("pk", "ip_address").first()
+    if workload is None:
+        workload = {"pk": uuid.uuid4(), "ip_address": "192.0.2.1"}
+    selected = Migration.selected_mount_points.through.objects
+    return {
+        "workloads.list": Workload.objects.select_related("credentials")[:PAGE_SIZE],
+        "workloads.by_ip": Workload.objects.filter(ip_address=workload["ip_address"]),
+        "workloads.mount_points": MountPoint.objects.filter(workload_id__in=workload_ids),
+        "mount_points.by_workload_recent": MountPoint.objects.filter(workload_id=workload["pk"])[:PAGE_SIZE],
+        "mount_points.list": MountPoint.objects.select_related("workload")[:PAGE_SIZE],
+        "migration_targets.list": MigrationTarget.objects.select_related("target_vm")[:PAGE_SIZE],
+        "migrations.list": Migration.objects.select_related("source", "target")[:PAGE_SIZE],
+        "migrations.by_state_recent": Migration.objects.filter(state=Migration.MigrationState.ERROR)[:PAGE_SIZE],
+        "migrations.active": Migration.objects.filter(state__in=ACTIVE_STATES)[:PAGE_SIZE],
+        "migrations.by_source": Migration.objects.filter(source_id=workload["pk"])[:PAGE_SIZE],
+        "migrations.selected_mount_points": selected.filter(migration_id__in=migration_ids),
+    }
+
+
+def _postgresql_scans(plan):
+    if plan.get("Node Type") == "Seq Scan":
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", ()):
+        yield from _postgresql_scans(child)
+
+
+def sequential_scans(queryset):
+    """Return the tables the plan of ``queryset`` reads in full."""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return set(_postgresql_scans(plan[0]["Plan"]))
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return {match.group(1) for *_, detail in cursor.fetchall() if (match := _SQLITE_FULL_SCAN.match(detail))}
+
+
+class Command(BaseCommand):
+    help = "Fail when an access pattern's query plan scans a large table sequentially."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fleet", type=int, default=0, help="First generate a synthetic fleet of this many workloads."
+        )
+        parser.add_argument(
+            "--min-rows",
+            type=int,
+            default=10000,
+            help="Sequential scans of tables with fewer rows are accepted (default 10000).",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ("postgresql", "sqlite"):
+            raise CommandError(f"Query plans cannot be checked on {connection.vendor}.")
+        if options["fleet"]:
+            call_command("generate_fleet", workloads=options["fleet"], stdout=self.stdout)
+        with connection.cursor() as cursor:
+            # Planners choose indexes from the table statistics.
+            cursor.execute("ANALYZE")
+
+        sizes = {}
+        failures = 0
+        for name, queryset in access_patterns().items():
+            large = []
+            for table in sorted(sequential_scans(queryset)):
+                if table not in sizes:
+                    sizes[table] = self._table_size(table)
+                if sizes[table] >= options["min_rows"]:
+                    large.append(f"{table} ({sizes[table]:,} rows)")
+            if large:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f"{name:<36} sequential scan of {', '.join(large)}"))
+            else:
+                self.stdout.write(f"{name:<36} ok")
+
+        if failures:
+            raise CommandError(f"{failures} access pattern(s) scan large tables sequentially.")
+        self.stdout.write(self.style.SUCCESS("Every access pattern uses an index."))
+
+    def _table_size(self, table):
+        model = next(model for model in django_apps.get_models(include_auto_created=True) if model._meta.db_table == table)
+        queryset = model._default_manager.order_by()
+        estimate = estimate_count(queryset)
+        return queryset.count() if estimate is None else estimate
@@ -0,0 +1,57 @@
+"""
+Management command that writes live migration progress to the database.
+
+Runs until interrupted: every ``PROGRESS_FLUSH_INTERVAL`` seconds it copies
+the progress and heartbeat of up to ``PROGRESS_FLUSH_BATCH_SIZE`` migrations
+that reported since the last flush from the progress store to their rows
+(see :mod:`apps.migration_manager.progress`). Run one flusher per store.
+
+Example:
+    python manage.py flush_progress
+    python manage.py flush_progress --once
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from apps.common.db_routers import use_primary
+from apps.migration_manager.progress import flush
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Write the live progress of running migrations to the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=None, help="Rows per flush (default PROGRESS_FLUSH_BATCH_SIZE)."
+        )
+        parser.add_argument(
+            "--interval", type=float, default=None, help="Seconds between flushes (default PROGRESS_FLUSH_INTERVAL)."
+        )
+        parser.add_argument("--once", action="store_true", help="Flush once, then exit.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"] or settings.PROGRESS_FLUSH_BATCH_SIZE
+        interval = settings.PROGRESS_FLUSH_INTERVAL if options["interval"] is None else options["interval"]
+        with use_primary():
+            while True:
+                started = time.monotonic()
+                try:
+                    written = flush(batch_size)
+                except Exception as exc:
+                    # The batch stays dirty; the next flush retries it.
+                    if options["once"]:
+                        raise CommandError(f"Flushing progress failed: {exc}") from exc
+                    logger.exception("Flushing progress failed.")
+                    close_old_connections()
+                    written = 0
+                if written:
+                    self.stdout.write(f"Flushed the progress of {written} migration(s).")
+                if options["once"]:
+                    break
+                time.sleep(max(0, interval - (time.monotonic() - started)))
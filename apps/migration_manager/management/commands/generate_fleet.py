@@ -0,0 +1,263 @@
+"""
+Management command that generates a synthetic, production-scale fleet.
+
+The generated rows depend only on ``--seed`` and ``--workloads`` (timestamps
+excepted), so two runs with the same arguments produce the same inventory.
+Rows are produced and written in chunks, so memory use is bounded by
+``--chunk-size`` whatever the size of the fleet. On PostgreSQL the rows are
+streamed with ``COPY ... FROM STDIN``; other databases use ``bulk_create``.
+
+Example:
+    python manage.py generate_fleet --workloads 1000000 --seed 42
+"""
+import csv
+import io
+import ipaddress
+import math
+import random
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from apps.migration_manager.models import Migration, MigrationTarget
+from apps.workloads.models import Credentials, MountPoint, Workload
+
+# Number of extra (non-system) volumes per server and their weights.
+EXTRA_VOLUME_WEIGHTS = {0: 25, 1: 35, 2: 20, 3: 10, 4: 6, 5: 4}
+EXTRA_VOLUME_NAMES = ("D:\\", "E:\\", "F:\\", "G:\\", "H:\\", "I:\\")
+
+STATE_WEIGHTS = {
+    Migration.MigrationState.NOT_STARTED: 55,
+    Migration.MigrationState.RUNNING: 5,
+    Migration.MigrationState.SUCCESS: 35,
+    Migration.MigrationState.ERROR: 5,
+}
+CLOUD_TYPE_WEIGHTS = {
+    MigrationTarget.CloudType.AWS: 45,
+    MigrationTarget.CloudType.AZURE: 30,
+    MigrationTarget.CloudType.VSPHERE: 20,
+    MigrationTarget.CloudType.VCLOUD: 5,
+}
+
+# Data volume sizes follow a log-normal distribution around ~200 GB.
+DATA_VOLUME_MEDIAN_GB = 200
+DATA_VOLUME_SIGMA = 1.2
+MAX_VOLUME_GB = 64 * 1024
+
+
+class _OrmWriter:
+    """Writes rows with ``bulk_create``; works on every database backend."""
+
+    def __init__(self, batch_size):
+        self.batch_size = batch_size
+
+    def write(self, model, rows):
+        model.objects.bulk_create([model(**row) for row in rows], batch_size=self.batch_size)
+
+
+class _CopyWriter:
+    """Streams rows into PostgreSQL with ``COPY ... FROM STDIN``."""
+
+    NULL = "\\N"
+
+    def write(self, model, rows):
+        if not rows:
+            return
+        fields = [field for field in model._meta.concrete_fields if not isinstance(field, models.AutoField)]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            # Rows only carry the columns the generator sets; the rest take their defaults.
+            writer.writerow([self._prepare(field, row.get(field.attname, field.get_default())) for field in fields])
+        buffer.seek(0)
+
+        columns = ", ".join(connection.ops.quote_name(field.column) for field in fields)
+        table = connection.ops.quote_name(model._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '{self.NULL}')", buffer)
+
+    def _prepare(self, field, value):
+        # get_db_prep_save applies field conversions such as password encryption.
+        value = field.get_db_prep_save(value, connection)
+        return self.NULL if value is None else value
+
+
+class FleetGenerator:
+    """
+    Produces deterministic fleet rows, one chunk of source workloads at a time.
+
+    Each source workload gets a ``C:\\`` volume plus a weighted number of data
+    volumes. A share of the sources get a migration to their own target VM;
+    successful migrations leave copies of the selected volumes on the target,
+    as ``run_migration_logic`` would.
+    """
+
+    def __init__(self, workloads, seed, migration_ratio, credentials_pool, network):
+        self.workloads = workloads
+        self.migration_ratio = migration_ratio
+        self.rng = random.Random(seed)
+        self.network = ipaddress.ip_network(network)
+        self.credentials_ids = [self._uuid() for _ in range(credentials_pool)]
+        self._next_target_ip = workloads + 1
+
+        if self.network.num_addresses - 2 < workloads * (1 + migration_ratio):
+            raise CommandError(f"Network {network} is too small for {workloads} workloads and their target VMs.")
+
+    def _uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def _weighted(self, weights):
+        return self.rng.choices(tuple(weights), tuple(weights.values()))[0]
+
+    def _data_volume_size(self):
+        size = self.rng.lognormvariate(math.log(DATA_VOLUME_MEDIAN_GB), DATA_VOLUME_SIGMA)
+        return max(1, min(MAX_VOLUME_GB, int(size)))
+
+    def credentials_rows(self, now):
+        return [
+            {
+                "id": credentials_id,
+                "username": f"svc_fleet_{index:05d}",
+                "password": f"fleet-password-{index}",
+                "domain": "FLEET" if index % 3 else "",
+                "created_at": now,
+                "updated_at": now,
+            }
+            for index, credentials_id in enumerate(self.credentials_ids)
+        ]
+
+    def chunk(self, start, stop, now):
+        """Return ``{model: rows}`` for source workloads ``start`` to ``stop``."""
+        rows = {Workload: [], MountPoint: [], MigrationTarget: [], Migration: [], Migration.selected_mount_points.through: []}
+        stamp = {"created_at": now, "updated_at": now}
+
+        for index in range(start, stop):
+            workload_id = self._uuid()
+            rows[Workload].append(
+                {
+                    "id": workload_id,
+                    "name": f"srv-{index:07d}",
+                    "ip_address": str(self.network[index + 1]),
+                    "credentials_id": self.rng.choice(self.credentials_ids),
+                    **stamp,
+                }
+            )
+            volumes = [("C:\\", self.rng.randint(60, 250))]
+            extra_count = self._weighted(EXTRA_VOLUME_WEIGHTS)
+            volumes += [(name, self._data_volume_size()) for name in EXTRA_VOLUME_NAMES[:extra_count]]
+            mount_points = [
+                {"id": self._uuid(), "workload_id": workload_id, "name": name, "size_gb": size_gb, **stamp}
+                for name, size_gb in volumes
+            ]
+            rows[MountPoint].extend(mount_points)
+
+            if self.rng.random() < self.migration_ratio:
+                self._add_migration(rows, workload_id, mount_points, stamp)
+        return rows
+
+    def _add_migration(self, rows, source_id, mount_points, stamp):
+        target_vm_id = self._uuid()
+        target_id = self._uuid()
+        migration_id = self._uuid()
+        state = self._weighted(STATE_WEIGHTS)
+        selected = [mp for mp in mount_points if mp["name"] == "C:\\" or self.rng.random() < 0.5]
+
+        rows[Workload].append(
+            {
+                "id": target_vm_id,
+                "name": f"vm-{self._next_target_ip:07d}",
+                "ip_address": str(self.network[self._next_target_ip]),
+                "credentials_id": self.rng.choice(self.credentials_ids),
+                **stamp,
+            }
+        )
+        self._next_target_ip += 1
+        rows[MigrationTarget].append(
+            {
+                "id": target_id,
+                "cloud_type": self._weighted(CLOUD_TYPE_WEIGHTS),
+                "cloud_credentials_id": self.rng.choice(self.credentials_ids),
+                "target_vm_id": target_vm_id,
+                **stamp,
+            }
+        )
+        rows[Migration].append(
+            {"id": migration_id, "source_id": source_id, "target_id": target_id, "state": state, **stamp}
+        )
+        rows[Migration.selected_mount_points.through].extend(
+            {"migration_id": migration_id, "mountpoint_id": mp["id"]} for mp in selected
+        )
+        if state == Migration.MigrationState.SUCCESS:
+            rows[MountPoint].extend(
+                {"id": self._uuid(), "workload_id": target_vm_id, "name": mp["name"], "size_gb": mp["size_gb"], **stamp}
+                for mp in selected
+            )
+
+
+class Command(BaseCommand):
+    help = "Generate a deterministic synthetic fleet of workloads, mount points, targets and migrations."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workloads", type=int, default=1000, help="Number of source workloads.")
+        parser.add_argument("--seed", type=int, default=0, help="Seed for the random generator.")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Source workloads generated per transaction.")
+        parser.add_argument(
+            "--migration-ratio", type=float, default=0.6, help="Share of source workloads that get a migration."
+        )
+        parser.add_argument(
+            "--credentials-pool", type=int, default=None, help="Distinct credential sets (default: workloads / 100)."
+        )
+        parser.add_argument("--network", default="10.0.0.0/8", help="Network the workload IPs are allocated from.")
+        parser.add_argument(
+            "--method",
+            choices=("auto", "orm", "copy"),
+            default="auto",
+            help="Loader: COPY on PostgreSQL, bulk_create elsewhere (default: auto).",
+        )
+
+    def handle(self, *args, **options):
+        workloads = options["workloads"]
+        chunk_size = options["chunk_size"]
+        if workloads < 1 or chunk_size < 1:
+            raise CommandError("--workloads and --chunk-size must be positive.")
+        if not 0 <= options["migration_ratio"] <= 1:
+            raise CommandError("--migration-ratio must be between 0 and 1.")
+
+        method = options["method"]
+        if method == "auto":
+            method = "copy" if connection.vendor == "postgresql" else "orm"
+        if method == "copy" and connection.vendor != "postgresql":
+            raise CommandError("--method copy requires PostgreSQL.")
+        writer = _CopyWriter() if method == "copy" else _OrmWriter(batch_size=chunk_size)
+
+        generator = FleetGenerator(
+            workloads=workloads,
+            seed=options["seed"],
+            migration_ratio=options["migration_ratio"],
+            credentials_pool=options["credentials_pool"] or max(1, workloads // 100),
+            network=options["network"],
+        )
+
+        started = time.perf_counter()
+        with transaction.atomic():
+            writer.write(Credentials, generator.credentials_rows(timezone.now()))
+
+        for start in range(0, workloads, chunk_size):
+            stop = min(start + chunk_size, workloads)
+            with transaction.atomic():
+                if connection.vendor == "postgresql":
+                    # Losing the last chunk on a crash is fine for synthetic data.
+                    with connection.cursor() as cursor:
+                        cursor.execute("SET LOCAL synchronous_commit = off")
+                for model, rows in generator.chunk(start, stop, timezone.now()).items():
+                    writer.write(model, rows)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"{stop}/{workloads} source workloads ({stop / elapsed:,.0f}/s)")
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(f"Generated {workloads} source workloads with '{method}' in {elapsed:.1f}s.")
+        )
@@ -0,0 +1,73 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:38
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("workloads", "0003_access_pattern_indexes"),
+        ("migration_manager", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="migration",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="migration_recent_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="migration",
+            index=models.Index(
+                fields=["state", "-created_at"], name="migration_state_recent_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="migration",
+            index=models.Index(
+                fields=["source", "-created_at"], name="migration_source_recent_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="migration",
+            index=models.Index(
+                condition=models.Q(("state__in", ("not_started", "running"))),
+                fields=["-created_at"],
+                name="migration_active_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="migrationtarget",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="migrationtarget_recent_idx"
+            ),
+        ),
+        # The indexes above cover the single-column indexes dropped here.
+        migrations.AlterField(
+            model_name="migration",
+            name="source",
+            field=models.ForeignKey(
+                db_index=False,
+                help_text="The source workload to be migrated.",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="source_migrations",
+                to="workloads.workload",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="migration",
+            name="state",
+            field=models.CharField(
+                choices=[
+                    ("not_started", "Not Started"),
+                    ("running", "Running"),
+                    ("error", "Error"),
+                    ("success", "Success"),
+                ],
+                default="not_started",
+                help_text="The current state of the migration process.",
+                max_length=20,
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("migration_manager", "0002_access_pattern_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="migration",
+            name="sync_report",
+            field=models.JSONField(
+                blank=True,
+                editable=False,
+                help_text="Mount points created, updated and deleted on the target VM by the run.",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("migration_manager", "0003_migration_sync_report"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="migration",
+            name="source_snapshot",
+            field=models.JSONField(
+                blank=True,
+                editable=False,
+                help_text="The source workload and selected mount points, frozen when the migration started.",
+                null=True,
+            ),
+        ),
+    ]
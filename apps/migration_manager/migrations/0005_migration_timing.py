@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("migration_manager", "0004_migration_source_snapshot"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="migration",
+            name="estimated_seconds",
+            field=models.FloatField(
+                blank=True,
+                editable=False,
+                help_text="Expected run time in seconds, estimated when the migration started.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="migration",
+            name="finished_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text="When the migration succeeded or failed.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="migration",
+            name="started_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text="When the migration entered the running state.",
+                null=True,
+            ),
+        ),
+    ]
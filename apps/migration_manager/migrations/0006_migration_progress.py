@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("migration_manager", "0005_migration_timing"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="migration",
+            name="heartbeat_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text="Last progress report of the worker running the migration, as last flushed.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="migration",
+            name="progress",
+            field=models.JSONField(
+                blank=True,
+                editable=False,
+                help_text="Phase and steps done of the run, as last flushed from the progress store.",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("migration_manager", "0006_migration_progress"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="migration",
+            name="migration_active_idx",
+        ),
+        migrations.AddField(
+            model_name="migration",
+            name="stop_request",
+            field=models.CharField(
+                blank=True,
+                choices=[("cancel", "Cancel"), ("pause", "Pause")],
+                default="",
+                editable=False,
+                help_text="Cancel or pause requested of the running migration, checked by its worker at every step.",
+                max_length=10,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="migration",
+            name="state",
+            field=models.CharField(
+                choices=[
+                    ("not_started", "Not Started"),
+                    ("running", "Running"),
+                    ("paused", "Paused"),
+                    ("error", "Error"),
+                    ("success", "Success"),
+                    ("cancelled", "Cancelled"),
+                ],
+                default="not_started",
+                help_text="The current state of the migration process.",
+                max_length=20,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="migration",
+            index=models.Index(
+                condition=models.Q(("state__in", ("not_started", "running", "paused"))),
+                fields=["-created_at"],
+                name="migration_active_idx",
+            ),
+        ),
+    ]
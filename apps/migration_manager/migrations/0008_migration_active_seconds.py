@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-19 06:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("migration_manager", "0007_migration_cancel_pause"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="migration",
+            name="active_seconds",
+            field=models.FloatField(
+                blank=True,
+                editable=False,
+                help_text="Seconds the migration has spent running, leaving out the time it was paused.",
+                null=True,
+            ),
+        ),
+    ]
@@ -1,9 +1,12 @@
 """Data models for managing the migration process."""
 
-from django.db import models
+from django.db import models, transaction
 from apps.common.models import TimestampedModel
+from apps.common.tracing import span
 from apps.workloads.models import Credentials, Workload, MountPoint
 
+# Migration states that are not final (see Migration.MigrationState).
+ACTIVE_STATES = ("not_started", "running", "paused")
 
 
 class MigrationTarget(TimestampedModel):
@@ -45,6 +48,9 @@ class MigrationTarget(TimestampedModel):
     class Meta(TimestampedModel.Meta):
         verbose_name = "Migration Target"
         verbose_name_plural = "Migration Targets"
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="migrationtarget_recent_idx"),
+        ]
 
 
 class Migration(TimestampedModel):
@@ -56,13 +62,22 @@ class Migration(TimestampedModel):
         """Enumeration for the states of a migration process."""
         NOT_STARTED = "not_started", "Not Started"
         RUNNING = "running", "Running"
+        PAUSED = "paused", "Paused"
         ERROR = "error", "Error"
         SUCCESS = "success", "Success"
+        CANCELLED = "cancelled", "Cancelled"
+
+    class StopRequest(models.TextChoices):
+        """What a running migration has been asked to do at its next step."""
+        CANCEL = "cancel", "Cancel"
+        PAUSE = "pause", "Pause"
 
     source = models.ForeignKey(
         Workload,
         on_delete=models.CASCADE,
         related_name="source_migrations",
+        # Covered by the (source, created_at) index.
+        db_index=False,
         help_text="The source workload to be migrated."
     )
     target = models.ForeignKey(
@@ -75,23 +90,83 @@ class Migration(TimestampedModel):
         max_length=20,
         choices=MigrationState.choices,
         default=MigrationState.NOT_STARTED,
-        db_index=True,
         help_text="The current state of the migration process."
     )
+    stop_request = models.CharField(
+        max_length=10,
+        choices=StopRequest.choices,
+        blank=True,
+        default="",
+        editable=False,
+        help_text="Cancel or pause requested of the running migration, checked by its worker at every step."
+    )
     selected_mount_points = models.ManyToManyField(
         MountPoint,
         related_name="migrations",
         help_text="The specific mount points selected for this migration."
     )
+    source_snapshot = models.JSONField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="The source workload and selected mount points, frozen when the migration started."
+    )
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="When the migration entered the running state."
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="When the migration succeeded or failed."
+    )
+    estimated_seconds = models.FloatField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Expected run time in seconds, estimated when the migration started."
+    )
+    active_seconds = models.FloatField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Seconds the migration has spent running, leaving out the time it was paused."
+    )
+    progress = models.JSONField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Phase and steps done of the run, as last flushed from the progress store."
+    )
+    heartbeat_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Last progress report of the worker running the migration, as last flushed."
+    )
+    sync_report = models.JSONField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Mount points created, updated and deleted on the target VM by the run."
+    )
     
     def run(self):
-        """Dispatches a Celery task to run the migration.
+        """Queues the Celery task that runs the migration.
+        The task goes through the transactional outbox (apps.common.outbox):
+        it is published by the relay once this transaction commits.
         The import is done locally within the method to prevent circular
         dependencies at application startup.
         """
+        from apps.common.outbox import enqueue
         from .tasks import execute_migration_task
-        
-        execute_migration_task.delay(migration_id=str(self.id))
+
+        # The trace context is stored with the message and travels on to the worker.
+        with span("migration.dispatch", migration_id=str(self.id)), transaction.atomic():
+            enqueue(execute_migration_task, kwargs={"migration_id": str(self.id)})
 
     def __str__(self):
         """Return a string representation of the migration."""
@@ -100,3 +175,16 @@ class Migration(TimestampedModel):
     class Meta(TimestampedModel.Meta):
         verbose_name = "Migration"
         verbose_name_plural = "Migrations"
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="migration_recent_idx"),
+            # Migrations in a state, newest first; also serves filters on state alone.
+            models.Index(fields=["state", "-created_at"], name="migration_state_recent_idx"),
+            # A workload's migrations, newest first.
+            models.Index(fields=["source", "-created_at"], name="migration_source_recent_idx"),
+            # Migrations that are not finished yet: a small part of the table.
+            models.Index(
+                fields=["-created_at"],
+                name="migration_active_idx",
+                condition=models.Q(state__in=ACTIVE_STATES),
+            ),
+        ]
@@ -0,0 +1,292 @@
+"""
+Live progress and heartbeats of running migrations.
+
+Workers report progress at every step of a run. Saving each report to the
+``Migration`` row would make every step of thousands of concurrent
+migrations a row update on the primary. Reports go to a Redis hash per
+migration instead, which also marks the migration dirty, and the API reads
+live progress from there (:func:`read`). The ``flush_progress`` command
+copies the progress of dirty migrations to ``Migration.progress`` and
+``Migration.heartbeat_at`` with :func:`flush`: at most
+``PROGRESS_FLUSH_BATCH_SIZE`` rows in one UPDATE every
+``PROGRESS_FLUSH_INTERVAL`` seconds, however many migrations run. A run
+saves its final progress with its final state.
+
+Cancel and pause requests are flagged in the store as well
+(:func:`request_stop`). Writing a report returns the flag, so with Redis a
+run checks for a stop request at every step without querying the database.
+A store kept in one process cannot see requests made in another, so with it
+(or when Redis is unavailable) a report cannot tell, and the run reads the
+saved request instead.
+
+Configuration (``settings``):
+    PROGRESS_REDIS_URL: Redis holding the progress hashes (by default the
+        broker). When empty, progress is kept in the process that reports
+        it (tests).
+    PROGRESS_TTL: Seconds a hash outlives its last report.
+    PROGRESS_FLUSH_INTERVAL: Seconds between flushes.
+    PROGRESS_FLUSH_BATCH_SIZE: Most rows written per flush.
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import models
+from django.db.models.functions import Cast
+
+from .models import Migration
+
+logger = logging.getLogger(__name__)
+
+KEY = "migration-progress:{}"
+DIRTY_KEY = "migration-progress:dirty"
+STOP_KEY = "migration-progress:{}:stop"
+
+
+class RedisProgressStore:
+    """Progress hashes in Redis, shared by every process."""
+
+    shared = True
+
+    def __init__(self, url):
+        import redis
+
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+
+    def write(self, migration_id, fields):
+        pipeline = self.client.pipeline(transaction=False)
+        pipeline.hset(KEY.format(migration_id), mapping=fields)
+        pipeline.expire(KEY.format(migration_id), settings.PROGRESS_TTL)
+        pipeline.sadd(DIRTY_KEY, str(migration_id))
+        pipeline.get(STOP_KEY.format(migration_id))
+        return pipeline.execute()[-1] or ""
+
+    def read(self, migration_ids):
+        pipeline = self.client.pipeline(transaction=False)
+        for migration_id in migration_ids:
+            pipeline.hgetall(KEY.format(migration_id))
+        return {migration_id: fields for migration_id, fields in zip(migration_ids, pipeline.execute()) if fields}
+
+    def set_stop(self, migration_id, request):
+        if request:
+            self.client.set(STOP_KEY.format(migration_id), request, ex=settings.PROGRESS_TTL)
+        else:
+            self.client.delete(STOP_KEY.format(migration_id))
+
+    def take_dirty(self, count):
+        return self.client.spop(DIRTY_KEY, count) or []
+
+    def mark_dirty(self, migration_ids):
+        if migration_ids:
+            self.client.sadd(DIRTY_KEY, *migration_ids)
+
+    def clear(self, migration_id):
+        pipeline = self.client.pipeline(transaction=False)
+        pipeline.delete(KEY.format(migration_id), STOP_KEY.format(migration_id))
+        pipeline.srem(DIRTY_KEY, str(migration_id))
+        pipeline.execute()
+
+
+class LocalProgressStore:
+    """Progress hashes in this process only."""
+
+    shared = False
+
+    def __init__(self):
+        self._guard = threading.Lock()
+        self._hashes = {}
+        self._dirty = set()
+        self._stops = {}
+
+    def write(self, migration_id, fields):
+        with self._guard:
+            self._hashes.setdefault(str(migration_id), {}).update(fields)
+            self._dirty.add(str(migration_id))
+            return self._stops.get(str(migration_id), "")
+
+    def read(self, migration_ids):
+        with self._guard:
+            return {
+                migration_id: dict(self._hashes[str(migration_id)])
+                for migration_id in migration_ids
+                if str(migration_id) in self._hashes
+            }
+
+    def set_stop(self, migration_id, request):
+        with self._guard:
+            if request:
+                self._stops[str(migration_id)] = request
+            else:
+                self._stops.pop(str(migration_id), None)
+
+    def take_dirty(self, count):
+        with self._guard:
+            taken = [self._dirty.pop() for _ in range(min(count, len(self._dirty)))]
+        return taken
+
+    def mark_dirty(self, migration_ids):
+        with self._guard:
+            self._dirty.update(migration_ids)
+
+    def clear(self, migration_id):
+        with self._guard:
+            self._hashes.pop(str(migration_id), None)
+            self._dirty.discard(str(migration_id))
+            self._stops.pop(str(migration_id), None)
+
+
+@lru_cache(maxsize=None)
+def _store(url):
+    return RedisProgressStore(url) if url else LocalProgressStore()
+
+
+def get_store():
+    """Return the progress store for ``PROGRESS_REDIS_URL``."""
+    return _store(settings.PROGRESS_REDIS_URL)
+
+
+def _decode(fields):
+    step, steps = int(fields["step"]), int(fields["steps"])
+    progress = {
+        "phase": fields["phase"],
+        "step": step,
+        "steps": steps,
+        "percent": round(100 * step / steps, 1) if steps else 0.0,
+    }
+    return progress, datetime.fromtimestamp(float(fields["heartbeat_at"]), dt_timezone.utc)
+
+
+def report(migration_id, phase, step, steps):
+    """
+    Record that the migration is in ``phase`` with ``step`` of ``steps`` done.
+
+    Each report is also a heartbeat. Progress is best effort: an unavailable
+    store is logged and never fails the migration.
+
+    Returns:
+        str: The pending ``Migration.StopRequest``, "" if there is none, or
+        None if the store cannot tell: it is unavailable, or it only holds
+        the requests made in this process.
+    """
+    fields = {"phase": phase, "step": step, "steps": steps, "heartbeat_at": time.time()}
+    store = get_store()
+    try:
+        request = store.write(migration_id, fields)
+    except Exception as exc:
+        logger.warning(f"Progress of migration {migration_id} was not recorded: {exc}")
+        return None
+    return request if request or store.shared else None
+
+
+def request_stop(migration_id, request):
+    """
+    Flag ``request``, a ``Migration.StopRequest``, for the run of the migration to see.
+
+    An empty ``request`` withdraws the flag. The caller has already saved the
+    request to the migration's ``stop_request``.
+    """
+    try:
+        get_store().set_stop(migration_id, request)
+    except Exception as exc:
+        logger.warning(f"Stop request of migration {migration_id} was not flagged: {exc}")
+
+
+def read(migration_ids):
+    """Return ``{migration id: (progress, heartbeat_at)}`` for migrations with live progress."""
+    return {migration_id: _decode(fields) for migration_id, fields in get_store().read(migration_ids).items()}
+
+
+def overlay(rows):
+    """
+    Replace the saved progress of the running migrations in ``rows`` with the live one.
+
+    Each row is a dict with the migration's ``id``, ``state``, ``progress``
+    and ``heartbeat_at``.
+    """
+    running = [row["id"] for row in rows if row["state"] == Migration.MigrationState.RUNNING]
+    live = read(running) if running else {}
+    for row in rows:
+        if row["id"] in live:
+            row["progress"], row["heartbeat_at"] = live[row["id"]]
+    return rows
+
+
+class Reporter:
+    """Reports the progress of one run of a migration with ``steps`` steps."""
+
+    def __init__(self, migration_id, steps):
+        self.migration_id = migration_id
+        self.steps = steps
+        self.step = 0
+
+    def update(self, phase, step):
+        """
+        Report that the run is in ``phase`` with ``step`` steps done.
+
+        Returns:
+            str: The pending stop request, "" if there is none, or None if
+            the store cannot tell (see :func:`report`).
+        """
+        self.step = step
+        return report(self.migration_id, phase, step, self.steps)
+
+    def finish(self, phase):
+        """
+        Drop the live progress of a run that has ended in ``phase``.
+
+        Returns:
+            tuple: The final ``(progress, heartbeat_at)``, for the run to save
+            with its final state.
+        """
+        step = self.steps if phase == "done" else self.step
+        try:
+            get_store().clear(self.migration_id)
+        except Exception as exc:
+            logger.warning(f"Progress of migration {self.migration_id} was not cleared: {exc}")
+        return _decode({"phase": phase, "step": step, "steps": self.steps, "heartbeat_at": time.time()})
+
+
+def flush(batch_size=None):
+    """
+    Write the live progress of up to ``batch_size`` dirty migrations to their rows.
+
+    Only running migrations are written, so a flush never overwrites the
+    final progress a run has saved. Migrations whose rows could not be
+    written stay dirty.
+
+    Returns:
+        int: The number of rows written.
+    """
+    batch_size = batch_size or settings.PROGRESS_FLUSH_BATCH_SIZE
+    store = get_store()
+    migration_ids = store.take_dirty(batch_size)
+    if not migration_ids:
+        return 0
+    try:
+        live = read(migration_ids)
+        if not live:
+            return 0
+        progress_cases = [
+            models.When(pk=migration_id, then=models.Value(row_progress, output_field=models.JSONField()))
+            for migration_id, (row_progress, _) in live.items()
+        ]
+        heartbeat_cases = [
+            models.When(pk=migration_id, then=models.Value(heartbeat_at))
+            for migration_id, (_, heartbeat_at) in live.items()
+        ]
+        # One UPDATE; the state condition is part of it, so a run that has just
+        # ended keeps its final progress. updated_at is left alone: progress is
+        # not an edit of the migration. As in bulk_update(), the CASEs are cast:
+        # PostgreSQL types their literals as text otherwise.
+        return Migration.objects.filter(pk__in=list(live), state=Migration.MigrationState.RUNNING).update(
+            progress=Cast(models.Case(*progress_cases, output_field=models.JSONField()), models.JSONField()),
+            heartbeat_at=Cast(
+                models.Case(*heartbeat_cases, output_field=models.DateTimeField()), models.DateTimeField()
+            ),
+        )
+    except Exception:
+        store.mark_dirty(migration_ids)
+        raise
@@ -0,0 +1,144 @@
+"""
+Values-based readers mirroring the migration_manager serializers.
+
+See :mod:`apps.common.readers`. Any change to ``MigrationTargetSerializer`` or
+``MigrationSerializer`` fields must be mirrored here; ``tests/test_readers.py``
+fails otherwise.
+"""
+from apps.common.readers import ValuesReader, batched, prefixed_ordering
+from apps.workloads.models import MountPoint
+from apps.workloads.readers import WorkloadReader
+
+from .models import Migration, MigrationTarget
+
+
+class MigrationTargetReader(ValuesReader):
+    """Builds ``MigrationTargetSerializer`` output for reads."""
+
+    columns = ("id", "cloud_type", "target_vm_id", "created_at", "updated_at")
+
+    def load_related(self, rows):
+        reader = WorkloadReader(self.native_values)
+        return {"workloads": reader.read_by_id({row["target_vm_id"] for row in rows})}
+
+    async def aload_related(self, rows):
+        reader = WorkloadReader(self.native_values)
+        return {"workloads": await reader.aread_by_id({row["target_vm_id"] for row in rows})}
+
+    def build(self, rows, related):
+        workloads = related["workloads"]
+        return [
+            {
+                "id": row["id"],
+                "cloud_type": row["cloud_type"],
+                "target_vm_details": workloads[row["target_vm_id"]],
+                "created_at": self.datetime(row["created_at"]),
+                "updated_at": self.datetime(row["updated_at"]),
+            }
+            for row in rows
+        ]
+
+    def read_by_id(self, ids):
+        """Return ``{target_id: representation}`` for the given ids."""
+        result = {}
+        for batch in batched(list(ids)):
+            for target in self.read(MigrationTarget.objects.filter(id__in=batch)):
+                result[target["id"]] = target
+        return result
+
+    async def aread_by_id(self, ids):
+        """Async ORM version of :meth:`read_by_id`."""
+        result = {}
+        for batch in batched(list(ids)):
+            for target in await self.aread(MigrationTarget.objects.filter(id__in=batch)):
+                result[target["id"]] = target
+        return result
+
+
+class MigrationReader(ValuesReader):
+    """Builds ``MigrationSerializer`` output for reads."""
+
+    columns = (
+        "id",
+        "source_id",
+        "target_id",
+        "state",
+        "stop_request",
+        "source_snapshot",
+        "started_at",
+        "finished_at",
+        "estimated_seconds",
+        "progress",
+        "heartbeat_at",
+        "sync_report",
+        "created_at",
+        "updated_at",
+    )
+
+    def load_related(self, rows):
+        return {
+            "sources": WorkloadReader(self.native_values).read_by_id({row["source_id"] for row in rows}),
+            "targets": MigrationTargetReader(self.native_values).read_by_id({row["target_id"] for row in rows}),
+            "selected": self.selected_mount_points([row["id"] for row in rows]),
+        }
+
+    async def aload_related(self, rows):
+        return {
+            "sources": await WorkloadReader(self.native_values).aread_by_id({row["source_id"] for row in rows}),
+            "targets": await MigrationTargetReader(self.native_values).aread_by_id({row["target_id"] for row in rows}),
+            "selected": await self.aselected_mount_points([row["id"] for row in rows]),
+        }
+
+    def build(self, rows, related):
+        sources, targets, selected = related["sources"], related["targets"], related["selected"]
+        return [
+            {
+                "id": row["id"],
+                "source": row["source_id"],
+                "target": row["target_id"],
+                "state": row["state"],
+                "stop_request": row["stop_request"],
+                "selected_mount_points": selected.get(row["id"], []),
+                "source_details": sources[row["source_id"]],
+                "target_details": targets[row["target_id"]],
+                "source_snapshot": row["source_snapshot"],
+                "started_at": self.datetime(row["started_at"]),
+                "finished_at": self.datetime(row["finished_at"]),
+                "estimated_seconds": row["estimated_seconds"],
+                "progress": row["progress"],
+                "heartbeat_at": self.datetime(row["heartbeat_at"]),
+                "sync_report": row["sync_report"],
+                "created_at": self.datetime(row["created_at"]),
+                "updated_at": self.datetime(row["updated_at"]),
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def selected_mount_points(migration_ids):
+        """Return ``{migration_id: [mount point id]}`` in mount point order."""
+        grouped = {}
+        for batch in batched(migration_ids):
+            _group_selected(grouped, _selected_rows(batch))
+        return grouped
+
+    @staticmethod
+    async def aselected_mount_points(migration_ids):
+        """Async ORM version of :meth:`selected_mount_points`."""
+        grouped = {}
+        for batch in batched(migration_ids):
+            _group_selected(grouped, [row async for row in _selected_rows(batch)])
+        return grouped
+
+
+def _selected_rows(migration_ids):
+    through = Migration.selected_mount_points.through
+    ordering = prefixed_ordering(MountPoint, "mountpoint")
+    return through.objects.filter(migration_id__in=migration_ids).order_by(*ordering).values_list(
+        "migration_id", "mountpoint_id"
+    )
+
+
+def _group_selected(grouped, rows):
+    for migration_id, mount_point_id in rows:
+        grouped.setdefault(migration_id, []).append(mount_point_id)
@@ -1,6 +1,7 @@
 """
 Serializers for the migration_manager application.
 """
+from django.conf import settings
 from rest_framework import serializers
 from apps.workloads.serializers import WorkloadSerializer
 from .models import MigrationTarget, Migration
@@ -40,11 +41,98 @@ class MigrationSerializer(serializers.ModelSerializer):
             'source',
             'target',
             'state',
+            'stop_request',
             'selected_mount_points',
             'source_details',
             'target_details',
+            'source_snapshot',
+            'started_at',
+            'finished_at',
+            'estimated_seconds',
+            'progress',
+            'heartbeat_at',
+            'sync_report',
             'created_at',
             'updated_at',
         )
         # The 'state' field should be managed by the system, not by the client.
-        read_only_fields = ('state',)
+        read_only_fields = (
+            'state',
+            'stop_request',
+            'source_snapshot',
+            'started_at',
+            'finished_at',
+            'estimated_seconds',
+            'progress',
+            'heartbeat_at',
+            'sync_report',
+        )
+
+
+class MigrationPlanRequestSerializer(serializers.Serializer):
+    """Request body of the batch plan endpoint: the migrations to plan."""
+    ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        allow_empty=False,
+        max_length=settings.MIGRATION_PLAN_MAX_IDS,
+    )
+
+
+class ProgressSerializer(serializers.Serializer):
+    """A migration's phase and the steps of its run that are done."""
+    phase = serializers.CharField()
+    step = serializers.IntegerField()
+    steps = serializers.IntegerField()
+    percent = serializers.FloatField()
+
+
+class MigrationProgressSerializer(serializers.Serializer):
+    """Response of the live progress endpoint."""
+    id = serializers.UUIDField()
+    state = serializers.ChoiceField(choices=Migration.MigrationState.choices)
+    progress = ProgressSerializer(allow_null=True)
+    heartbeat_at = serializers.DateTimeField(allow_null=True)
+
+
+class PlanPreflightSerializer(serializers.Serializer):
+    """Whether a planned migration would pass its pre-flight checks, and why not."""
+    passed = serializers.BooleanField()
+    errors = serializers.ListField(child=serializers.CharField())
+
+
+class PlanMountPointsSerializer(serializers.Serializer):
+    """The target VM mount points a planned migration would change."""
+    created = serializers.ListField(child=serializers.CharField())
+    updated = serializers.ListField(child=serializers.CharField())
+    deleted = serializers.ListField(child=serializers.CharField())
+    unchanged = serializers.IntegerField()
+
+
+class MigrationPlanSerializer(serializers.Serializer):
+    """Response of the plan endpoint: what running a migration would do."""
+    id = serializers.UUIDField()
+    state = serializers.ChoiceField(choices=Migration.MigrationState.choices)
+    target_vm = serializers.UUIDField()
+    preflight = PlanPreflightSerializer()
+    mount_points = PlanMountPointsSerializer()
+    transfer_gb = serializers.IntegerField()
+    estimated_seconds = serializers.FloatField()
+
+
+class PlanTotalsSerializer(serializers.Serializer):
+    """Capacity totals of a batch plan."""
+    migrations = serializers.IntegerField()
+    preflight_passed = serializers.IntegerField()
+    preflight_failed = serializers.IntegerField()
+    transfer_gb = serializers.IntegerField()
+    estimated_seconds = serializers.FloatField()
+    mount_points_created = serializers.IntegerField()
+    mount_points_updated = serializers.IntegerField()
+    mount_points_deleted = serializers.IntegerField()
+
+
+class MigrationPlanBatchSerializer(serializers.Serializer):
+    """Response of the batch plan endpoint."""
+    results = MigrationPlanSerializer(many=True)
+    not_found = serializers.ListField(child=serializers.UUIDField())
+    totals = PlanTotalsSerializer()
@@ -1,11 +1,18 @@
 """Service layer containing the core business logic for migrations."""
-import time
 from typing import TYPE_CHECKING
-from django.db import transaction
+from django.db import models, transaction
+from django.utils import timezone
 from django.core.exceptions import ValidationError
 
+from apps.common.db_routers import use_primary
+from apps.common.locks import LockTimeout, exclusive
+from apps.common.tracing import span
 from apps.workloads.models import MountPoint
 
+from . import progress
+from .eta import estimate_seconds
+from .simulation import simulate_transfer
+
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,48 +20,419 @@ logger = logging.getLogger(__name__)
 if TYPE_CHECKING:
     from .models import Migration
 
-SIMULATION_SLEEP_SECONDS = 10
 REQUIRED_SYSTEM_MOUNT_POINT = "c:\\"
 
+
+def target_vm_lock(target_vm_id):
+    """
+    Lock serialising the migrations that write to the target VM ``target_vm_id``.
+
+    Migrations to other VMs are not affected and run in parallel.
+    """
+    return exclusive(f"migration_target_vm:{target_vm_id}")
+
+
+def capture_source_snapshot(migration: "Migration"):
+    """
+    Return the snapshot a migration runs from once it is ``RUNNING``.
+
+    It holds the source workload, the target VM and the selected mount
+    points as they are now, in two queries. Stored as the migration's
+    ``source_snapshot``, it is never changed afterwards.
+    """
+    row = (
+        type(migration).objects.filter(pk=migration.pk)
+        .values("source_id", "source__name", "source__ip_address", "target__cloud_type", "target__target_vm_id")
+        .get()
+    )
+    mount_points = migration.selected_mount_points.order_by("name").values("id", "name", "size_gb")
+    return {
+        "captured_at": timezone.now().isoformat(),
+        "source": {"id": str(row["source_id"]), "name": row["source__name"], "ip_address": row["source__ip_address"]},
+        "cloud_type": row["target__cloud_type"],
+        "target_vm": str(row["target__target_vm_id"]),
+        "mount_points": [
+            {"id": str(mp["id"]), "name": mp["name"], "size_gb": mp["size_gb"]} for mp in mount_points
+        ],
+    }
+
+
+def sync_mount_points(target_vm_id, selected):
+    """
+    Make the target VM's mount points match ``selected``, keyed on name.
+
+    ``selected`` holds ``{"name", "size_gb"}`` dicts, as in a source snapshot.
+
+    Missing mount points are created, ones whose ``size_gb`` differs are
+    updated and ones that are not selected are deleted; the others keep their
+    rows. Syncing the same selection again changes nothing.
+
+    Returns:
+        dict: The names ``created``, ``updated`` and ``deleted``, and the number
+        of ``unchanged`` mount points (the migration's ``sync_report``).
+    """
+    desired = {mp["name"]: mp["size_gb"] for mp in selected}
+    current = {
+        mp.name: mp
+        for mp in MountPoint.objects.select_for_update().filter(workload_id=target_vm_id).only("name", "size_gb")
+    }
+    report = diff_mount_points(desired, {name: mp.size_gb for name, mp in current.items()})
+    now = timezone.now()
+
+    updated = []
+    for name in report["updated"]:
+        mp = current[name]
+        mp.size_gb = desired[name]
+        # bulk_update() does not apply auto_now.
+        mp.updated_at = now
+        updated.append(mp)
+    created = [MountPoint(workload_id=target_vm_id, name=name, size_gb=desired[name]) for name in report["created"]]
+
+    if report["deleted"]:
+        MountPoint.objects.filter(workload_id=target_vm_id, name__in=report["deleted"]).delete()
+    MountPoint.objects.bulk_update(updated, ["size_gb", "updated_at"])
+    MountPoint.objects.bulk_create(created)
+    return report
+
+
+def diff_mount_points(desired, current):
+    """
+    Compare two ``{name: size_gb}`` maps of mount points.
+
+    Returns:
+        dict: The names to be ``created``, ``updated`` and ``deleted`` to turn
+        ``current`` into ``desired``, and the number of ``unchanged`` ones.
+    """
+    return {
+        "created": sorted(name for name in desired if name not in current),
+        "updated": sorted(name for name in desired if name in current and current[name] != desired[name]),
+        "deleted": sorted(name for name in current if name not in desired),
+        "unchanged": sum(1 for name in desired if name in current and current[name] == desired[name]),
+    }
+
+
+def preflight_errors(state, mount_point_names):
+    """Return why a migration in ``state`` selecting ``mount_point_names`` cannot start."""
+    from .models import Migration
+
+    if state != Migration.MigrationState.NOT_STARTED:
+        return ["Migration has already been started or completed."]
+    if REQUIRED_SYSTEM_MOUNT_POINT not in {name.lower().strip() for name in mount_point_names}:
+        return ["Cannot start migration: The system mount point 'C:\\' is not selected."]
+    return []
+
+
+# Columns of the rows plan_migrations() reads; every part of its union query
+# annotates them in this order.
+_PLAN_COLUMNS = (
+    "plan_migration", "plan_kind", "plan_state", "plan_cloud_type", "plan_target_vm", "plan_name", "plan_size_gb"
+)
+
+
+def _plan_rows(queryset, **columns):
+    return queryset.order_by().annotate(**{name: columns[name] for name in _PLAN_COLUMNS}).values_list(*_PLAN_COLUMNS)
+
+
+def plan_migrations(migration_ids):
+    """
+    Predict what running each of the migrations ``migration_ids`` would do.
+
+    The migrations, their selected mount points and their target VMs' mount
+    points are read in one ``UNION ALL`` query. Nothing is written or queued.
+
+    Returns:
+        dict: ``{migration id: plan}``; unknown ids are left out. A plan holds
+        the migration's ``state`` and ``target_vm``, its ``preflight``
+        result, the ``mount_points`` the target VM would gain, change and
+        lose (as in ``sync_report``), the ``transfer_gb`` selected and the
+        ``estimated_seconds`` a run would take (see :mod:`.eta`).
+    """
+    from .models import Migration
+
+    null_text = models.Value(None, output_field=models.CharField())
+    null_uuid = models.Value(None, output_field=models.UUIDField())
+    null_int = models.Value(None, output_field=models.IntegerField())
+    migrations = _plan_rows(
+        Migration.objects.filter(pk__in=migration_ids),
+        plan_migration=models.F("id"),
+        plan_kind=models.Value("migration"),
+        plan_state=models.F("state"),
+        plan_cloud_type=models.F("target__cloud_type"),
+        plan_target_vm=models.F("target__target_vm_id"),
+        plan_name=null_text,
+        plan_size_gb=null_int,
+    )
+    selected = _plan_rows(
+        Migration.selected_mount_points.through.objects.filter(migration_id__in=migration_ids),
+        plan_migration=models.F("migration_id"),
+        plan_kind=models.Value("selected"),
+        plan_state=null_text,
+        plan_cloud_type=null_text,
+        plan_target_vm=null_uuid,
+        plan_name=models.F("mountpoint__name"),
+        plan_size_gb=models.F("mountpoint__size_gb"),
+    )
+    on_target = _plan_rows(
+        MountPoint.objects.filter(workload__migration_target_vm__target_migrations__in=migration_ids),
+        plan_migration=models.F("workload__migration_target_vm__target_migrations"),
+        plan_kind=models.Value("target"),
+        plan_state=null_text,
+        plan_cloud_type=null_text,
+        plan_target_vm=null_uuid,
+        plan_name=models.F("name"),
+        plan_size_gb=models.F("size_gb"),
+    )
+
+    found = {}
+    rows = migrations.union(selected, on_target, all=True)
+    for migration_id, kind, state, cloud_type, target_vm, name, size_gb in rows:
+        entry = found.setdefault(migration_id, {"selected": {}, "target": {}})
+        if kind == "migration":
+            entry.update(state=state, cloud_type=cloud_type, target_vm=target_vm)
+        else:
+            entry[kind][name] = size_gb
+
+    plans = {}
+    for migration_id, entry in found.items():
+        errors = preflight_errors(entry["state"], entry["selected"])
+        plans[migration_id] = {
+            "id": str(migration_id),
+            "state": entry["state"],
+            "target_vm": str(entry["target_vm"]),
+            "preflight": {"passed": not errors, "errors": errors},
+            "mount_points": diff_mount_points(entry["selected"], entry["target"]),
+            "transfer_gb": sum(entry["selected"].values()),
+            "estimated_seconds": estimate_seconds(entry["cloud_type"], entry["selected"].values()),
+        }
+    return plans
+
+
+class MigrationStopped(Exception):
+    """A run stopped at a checkpoint because a cancel or pause was requested."""
+
+    def __init__(self, request):
+        super().__init__(f"Stop requested: {request}")
+        self.request = request
+
+
+def request_cancel(migration_id):
+    """
+    Cancel a migration that has not finished.
+
+    A migration that is not running is cancelled at once. A running one is
+    flagged; its worker stops and cancels it at the next step.
+
+    Returns:
+        bool: True if the migration was cancelled at once.
+
+    Raises:
+        ValidationError: The migration has already finished.
+    """
+    from .models import Migration
+
+    now = timezone.now()
+    migrations = Migration.objects.filter(pk=migration_id)
+    idle = (Migration.MigrationState.NOT_STARTED, Migration.MigrationState.PAUSED)
+    if migrations.filter(state__in=idle).update(
+        state=Migration.MigrationState.CANCELLED, stop_request="", finished_at=now, updated_at=now
+    ):
+        return True
+    if migrations.filter(state=Migration.MigrationState.RUNNING).update(
+        stop_request=Migration.StopRequest.CANCEL, updated_at=now
+    ):
+        progress.request_stop(migration_id, Migration.StopRequest.CANCEL)
+        return False
+    raise ValidationError("Only migrations that have not finished can be cancelled.")
+
+
+def request_pause(migration_id):
+    """
+    Flag a running migration to pause; its worker stops at the next step.
+
+    Raises:
+        ValidationError: The migration is not running, or is being cancelled.
+    """
+    from .models import Migration
+
+    if not Migration.objects.filter(
+        pk=migration_id, state=Migration.MigrationState.RUNNING, stop_request__in=("", Migration.StopRequest.PAUSE)
+    ).update(stop_request=Migration.StopRequest.PAUSE, updated_at=timezone.now()):
+        raise ValidationError("Only running migrations can be paused.")
+    progress.request_stop(migration_id, Migration.StopRequest.PAUSE)
+
+
+def request_resume(migration):
+    """
+    Resume a paused migration, or withdraw the pause request of a running one.
+
+    A paused migration is queued again and continues after the last step it
+    completed.
+
+    Raises:
+        ValidationError: The migration is neither paused nor being paused.
+    """
+    from .models import Migration
+
+    if migration.state == Migration.MigrationState.PAUSED:
+        migration.run()
+    elif not Migration.objects.filter(
+        pk=migration.pk, state=Migration.MigrationState.RUNNING, stop_request=Migration.StopRequest.PAUSE
+    ).update(stop_request="", updated_at=timezone.now()):
+        raise ValidationError("Only paused migrations can be resumed.")
+    else:
+        progress.request_stop(migration.pk, "")
+
+
+def _preflight(migration):
+    """
+    Return the ``(snapshot, start, resuming)`` a run of ``migration`` works from.
+
+    A paused migration resumes from its snapshot after the last step it
+    completed; any other run captures a snapshot and checks it first.
+    """
+    MigrationState = migration.MigrationState
+    with span("migration.preflight", migration_id=str(migration.id)):
+        if migration.state == MigrationState.PAUSED and migration.source_snapshot is not None:
+            return migration.source_snapshot, (migration.progress or {}).get("step", 0), True
+
+        if migration.state != MigrationState.NOT_STARTED:
+            raise ValidationError("Migration has already been started or completed.")
+
+        snapshot = capture_source_snapshot(migration)
+        errors = preflight_errors(migration.state, [mp["name"] for mp in snapshot["mount_points"]])
+        if errors:
+            raise ValidationError(errors)
+        return snapshot, 0, False
+
+
+def _checkpoint(migration, reporter, phase, done, boundary=False):
+    """
+    Report the progress of a run and stop it if a cancel or pause was requested.
+
+    The request normally comes back with the report. The saved
+    ``stop_request`` is read when the progress store cannot tell, and at the
+    phase boundaries (``boundary``) in case flagging it in the store failed.
+
+    Raises:
+        MigrationStopped: A stop was requested.
+    """
+    request = reporter.update(phase, done)
+    if not request and (boundary or request is None):
+        request = type(migration).objects.filter(pk=migration.pk).values_list("stop_request", flat=True).get()
+    if request:
+        raise MigrationStopped(request)
+
+
+def _copy(migration, reporter, snapshot):
+    """
+    Sync the target VM's mount points to the snapshot; return the sync report.
+
+    Another migration to the same VM syncs its mount points too, so the copy
+    waits in line for the VM's lock for as long as that takes. Every
+    ``LOCK_WAIT_TIMEOUT`` seconds of waiting it reports a heartbeat and checks
+    for stop requests, so a waiting migration can still be cancelled or paused.
+    """
+    target_vm_id = snapshot["target_vm"]
+    while True:
+        try:
+            with span("migration.copy"), target_vm_lock(target_vm_id), transaction.atomic():
+                return sync_mount_points(target_vm_id, snapshot["mount_points"])
+        except LockTimeout:
+            logger.info(f"Migration {migration.id} is waiting for target VM {target_vm_id}.")
+            _checkpoint(migration, reporter, "waiting", reporter.steps - 1, boundary=True)
+
+
+def _save_outcome(migration, reporter, run_started_at):
+    """
+    Save the final state of a run with its final progress; a paused run is not finished.
+
+    The time since ``run_started_at``, when this run entered ``RUNNING``, is
+    added to the migration's ``active_seconds``.
+    """
+    MigrationState = migration.MigrationState
+    now = timezone.now()
+    if migration.state != MigrationState.PAUSED:
+        migration.finished_at = now
+    migration.active_seconds = (migration.active_seconds or 0) + (now - run_started_at).total_seconds()
+    phase = {
+        MigrationState.SUCCESS: "done",
+        MigrationState.PAUSED: "paused",
+        MigrationState.CANCELLED: "cancelled",
+    }.get(migration.state, "failed")
+    migration.progress, migration.heartbeat_at = reporter.finish(phase)
+    migration.stop_request = ""
+    migration.save(update_fields=[
+        'state', 'sync_report', 'finished_at', 'active_seconds', 'progress', 'heartbeat_at', 'stop_request'
+    ])
+
+
+@use_primary()
 def run_migration_logic(migration: "Migration"):
     """
     Contains the actual business logic for executing a migration.
     This function is decoupled from Celery and can be tested or reused easily.
+    It always reads from the primary database, never from a replica.
+
+    At each step the run reports its progress and checks for a cancel or
+    pause request (see :func:`_checkpoint`); if there is one it stops there:
+    the migration becomes ``CANCELLED`` or ``PAUSED``. A paused migration
+    runs again from its snapshot, after the last step it completed.
     """
-    # Pre-flight checks
-    if migration.state != migration.MigrationState.NOT_STARTED:
-        raise ValidationError("Migration has already been started or completed.")
+    MigrationState = migration.MigrationState
+    snapshot, start, resuming = _preflight(migration)
 
-    selected_mount_point_names = {mp.name.lower().strip() for mp in migration.selected_mount_points.all()}
-    if REQUIRED_SYSTEM_MOUNT_POINT not in selected_mount_point_names:
-        raise ValidationError("Cannot start migration: The system mount point 'C:\\' is not selected.")
+    # Transition to 'RUNNING' state. From here on the run works from the
+    # snapshot; edits to the source or the selection no longer affect it.
+    now = timezone.now()
+    changes = {"state": MigrationState.RUNNING, "stop_request": "", "updated_at": now}
+    if not resuming:
+        changes.update(
+            source_snapshot=snapshot,
+            started_at=now,
+            estimated_seconds=estimate_seconds(
+                snapshot["cloud_type"], [mp["size_gb"] for mp in snapshot["mount_points"]]
+            ),
+        )
+    # Conditional: the migration may have been cancelled, or started by another
+    # delivery of the task, since it was read.
+    if not type(migration).objects.filter(pk=migration.pk, state=migration.state).update(**changes):
+        raise ValidationError("Migration has already been started or completed.")
+    # A flag that a request left after the previous run ended is withdrawn with
+    # the saved one; only now, so a duplicate delivery never withdraws the
+    # request of a run in progress.
+    progress.request_stop(migration.pk, "")
+    for field, value in changes.items():
+        setattr(migration, field, value)
 
-    # Transition to 'RUNNING' state.
-    migration.state = migration.MigrationState.RUNNING
-    migration.save(update_fields=['state'])
+    # Steps: the transfer setup, one per mount point and the copy.
+    reporter = progress.Reporter(migration.id, steps=len(snapshot["mount_points"]) + 2)
 
     try:
         logger.info(f"Starting migration simulation for {migration.id}...")
-        time.sleep(SIMULATION_SLEEP_SECONDS)
+        _checkpoint(migration, reporter, "transfer", start, boundary=True)
+        simulate_transfer(
+            snapshot["cloud_type"],
+            snapshot["mount_points"],
+            on_step=lambda done: _checkpoint(migration, reporter, "transfer", done),
+            start=start,
+        )
         logger.info("Simulation finished. Copying mount points...")
+        _checkpoint(migration, reporter, "copy", reporter.steps - 1, boundary=True)
 
-        with transaction.atomic():
-            target_vm = migration.target.target_vm
-            target_vm.mount_points.all().delete()
-            
-            new_mount_points = [
-                MountPoint(workload=target_vm, name=mp.name, size_gb=mp.size_gb)
-                for mp in migration.selected_mount_points.all()
-            ]
-            MountPoint.objects.bulk_create(new_mount_points)
-
-        migration.state = migration.MigrationState.SUCCESS
+        migration.sync_report = _copy(migration, reporter, snapshot)
+
+        migration.state = MigrationState.SUCCESS
         logger.info(f"Migration {migration.id} completed successfully.")
 
+    except MigrationStopped as stop:
+        paused = stop.request == migration.StopRequest.PAUSE
+        migration.state = MigrationState.PAUSED if paused else MigrationState.CANCELLED
+        logger.info(f"Migration {migration.id} was {migration.get_state_display().lower()} on request.")
+
     except Exception as e:
-        migration.state = migration.MigrationState.ERROR
+        migration.state = MigrationState.ERROR
         logger.info(f"An error occurred during migration {migration.id}: {e}")
         raise
-    
+
     finally:
-        migration.save(update_fields=['state'])
+        _save_outcome(migration, reporter, run_started_at=now)
@@ -0,0 +1,66 @@
+"""
+Throughput model of the simulated data transfer.
+
+A migration to a target of a cloud type takes the profile's setup latency,
+plus for each selected mount point a fixed overhead and its ``size_gb``
+divided by the bandwidth. Profiles come from ``SIMULATION_PROFILES``;
+``SIMULATION_TIME_SCALE`` multiplies the result, so a run can take a
+fraction of the modelled time (0 skips the wait, as in the benchmarks).
+
+Configuration (``settings``):
+    SIMULATION_PROFILES: ``{cloud_type: {"bandwidth_gb_per_s",
+        "setup_seconds", "volume_overhead_seconds"}}``.
+    SIMULATION_TIME_SCALE: Real seconds per modelled second.
+"""
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from apps.common.tracing import span
+
+
+def profile(cloud_type):
+    """Return the throughput profile of ``cloud_type``."""
+    try:
+        return settings.SIMULATION_PROFILES[cloud_type]
+    except KeyError:
+        raise ImproperlyConfigured(f"SIMULATION_PROFILES has no profile for '{cloud_type}'.") from None
+
+
+def _waits(cloud_type, sizes_gb):
+    rates = profile(cloud_type)
+    scale = settings.SIMULATION_TIME_SCALE
+    return [rates["setup_seconds"] * scale] + [
+        (rates["volume_overhead_seconds"] + size_gb / rates["bandwidth_gb_per_s"]) * scale for size_gb in sizes_gb
+    ]
+
+
+def simulated_seconds(cloud_type, sizes_gb):
+    """Return how long moving volumes of ``sizes_gb`` to ``cloud_type`` takes, in real seconds."""
+    return sum(_waits(cloud_type, sizes_gb))
+
+
+def simulate_transfer(cloud_type, mount_points, on_step=None, start=0):
+    """
+    Wait as long as transferring ``mount_points`` to ``cloud_type`` takes.
+
+    The setup and each mount point are a step of their own; the first
+    ``start`` steps are taken as done, e.g. by a run that was paused.
+
+    Args:
+        cloud_type (str): A ``MigrationTarget.CloudType`` value.
+        mount_points (list): ``{"name", "size_gb"}`` dicts, as in a source snapshot.
+        on_step (callable): Called with the number of steps done after each step.
+        start (int): Steps already done.
+
+    Returns:
+        float: The seconds waited.
+    """
+    waits = _waits(cloud_type, [mp["size_gb"] for mp in mount_points])[start:]
+    with span("migration.simulate", cloud_type=cloud_type, seconds=sum(waits)):
+        for done, seconds in enumerate(waits, start + 1):
+            time.sleep(seconds)
+            if on_step is not None:
+                on_step(done)
+    return sum(waits)
@@ -1,9 +1,9 @@
 """Celery tasks for the migration_manager application."""
 from uuid import UUID
 from celery import shared_task
-from django.core.exceptions import ObjectDoesNotExist
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from apps.common.db_routers import use_primary
 from .models import Migration
-from .services import run_migration_logic
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,8 +14,12 @@ def execute_migration_task(self, migration_id: str):
     A lean Celery task that fetches a migration object and delegates the
     business logic to the service layer.
     """
+    # Imported on first use so that worker startup does not pay for the service layer.
+    from .services import run_migration_logic
+
     try:
-        migration = Migration.objects.get(id=UUID(migration_id))
+        with use_primary():
+            migration = Migration.objects.get(id=UUID(migration_id))
         logger.info(f"Celery task picked up migration: {migration.id}")
         # Delegate the actual work to the service layer
         run_migration_logic(migration=migration)
@@ -23,6 +27,11 @@ def execute_migration_task(self, migration_id: str):
     except ObjectDoesNotExist:
         logger.error(f"Error: Migration with ID {migration_id} not found. Task will not be retried.")
         return f"Migration {migration_id} not found."
+    except ValidationError as exc:
+        # Pre-flight checks failed, e.g. the outbox relay delivered the task again
+        # for a migration that has already started. Retrying cannot help.
+        logger.warning(f"Migration {migration_id} was not started: {exc}")
+        return f"Migration {migration_id} not started."
     except Exception as exc:
         # If the service layer raised an error, Celery's retry mechanism will catch it.
         logger.error(f"Task for migration {migration_id} failed: {exc}. Retrying...")
@@ -0,0 +1,32 @@
+"""Tests for the check_query_plans management command."""
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from apps.migration_manager.management.commands import check_query_plans
+from apps.workloads.models import MountPoint
+
+
+class CheckQueryPlansCommandTests(TestCase):
+    """Test suite for the check_query_plans command."""
+
+    def test_access_patterns_use_indexes(self):
+        """With the composite and partial indexes no pattern scans a table."""
+        stdout = StringIO()
+        call_command("check_query_plans", fleet=200, min_rows=0, stdout=stdout)
+        self.assertIn("Every access pattern uses an index.", stdout.getvalue())
+
+    def test_sequential_scans_of_large_tables_fail(self):
+        """A pattern without an index is reported unless its table is small."""
+        patterns = {"mount_points.by_size": MountPoint.objects.filter(size_gb=10).order_by()}
+        call_command("generate_fleet", workloads=20, stdout=StringIO())
+        with mock.patch.object(check_query_plans, "access_patterns", return_value=patterns):
+            stdout = StringIO()
+            with self.assertRaisesMessage(CommandError, "1 access pattern(s)"):
+                call_command("check_query_plans", min_rows=0, stdout=stdout)
+            self.assertIn("sequential scan of workloads_mountpoint", stdout.getvalue())
+
+            call_command("check_query_plans", stdout=StringIO())
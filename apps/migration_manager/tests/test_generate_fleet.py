@@ -0,0 +1,83 @@
+"""Tests for the generate_fleet management command."""
+import csv
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.migration_manager.management.commands.generate_fleet import FleetGenerator, _CopyWriter
+from apps.migration_manager.models import Migration, MigrationTarget
+from apps.workloads.models import Credentials, MountPoint, Workload
+
+
+def _snapshot():
+    """A content fingerprint of the generated inventory, independent of timestamps."""
+    return {
+        "workloads": sorted(Workload.objects.values_list("id", "name", "ip_address", "credentials_id")),
+        "mount_points": sorted(MountPoint.objects.values_list("id", "workload_id", "name", "size_gb")),
+        "migrations": sorted(Migration.objects.values_list("id", "source_id", "target__target_vm_id", "state")),
+    }
+
+
+class GenerateFleetCommandTests(TestCase):
+    """Test suite for the generate_fleet command."""
+
+    def _generate(self, **options):
+        call_command("generate_fleet", stdout=StringIO(), **options)
+
+    def test_generation_is_deterministic(self):
+        """The same seed produces the same inventory, whatever the chunk size."""
+        self._generate(workloads=60, seed=7, chunk_size=25)
+        first = _snapshot()
+
+        Migration.objects.all().delete()
+        MigrationTarget.objects.all().delete()
+        Workload.objects.all().delete()
+        Credentials.objects.all().delete()
+
+        self._generate(workloads=60, seed=7, chunk_size=60)
+        self.assertEqual(_snapshot(), first)
+
+    def test_generated_fleet_is_consistent(self):
+        """Every source has a C:\\ volume and every migration selects it."""
+        self._generate(workloads=100, seed=1, migration_ratio=1.0)
+
+        sources = Workload.objects.filter(source_migrations__isnull=False)
+        self.assertEqual(sources.count(), 100)
+        self.assertFalse(sources.exclude(mount_points__name="C:\\").exists())
+        self.assertFalse(Migration.objects.exclude(selected_mount_points__name="C:\\").exists())
+        self.assertEqual(MigrationTarget.objects.count(), 100)
+
+        # Successful migrations leave exactly the selected volumes on the target VM.
+        migration = Migration.objects.filter(state=Migration.MigrationState.SUCCESS).first()
+        self.assertEqual(
+            set(migration.target.target_vm.mount_points.values_list("name", flat=True)),
+            set(migration.selected_mount_points.values_list("name", flat=True)),
+        )
+
+    def test_copy_method_requires_postgres(self):
+        """Forcing COPY on another backend is rejected."""
+        with self.assertRaises(CommandError):
+            self._generate(workloads=1, method="copy")
+
+    def test_copy_writer_fills_columns_the_rows_leave_out(self):
+        """Migration rows only set a few columns; COPY gets every column, the rest with defaults."""
+        generator = FleetGenerator(workloads=5, seed=7, migration_ratio=1, credentials_pool=1, network="10.0.0.0/16")
+        rows = generator.chunk(0, 5, timezone.now())[Migration]
+        self.assertTrue(rows)
+
+        with patch.object(connection, "cursor") as cursor:
+            _CopyWriter().write(Migration, rows)
+        sql, buffer = cursor.return_value.__enter__.return_value.copy_expert.call_args.args
+
+        columns = sql[sql.index("(") + 1:sql.index(")")].replace('"', "").split(", ")
+        self.assertIn("source_snapshot", columns)
+        self.assertIn("stop_request", columns)
+        copied = [dict(zip(columns, values)) for values in csv.reader(buffer)]
+        self.assertEqual(len(copied), len(rows))
+        self.assertEqual(copied[0]["source_snapshot"], _CopyWriter.NULL)
+        self.assertEqual(copied[0]["stop_request"], "")
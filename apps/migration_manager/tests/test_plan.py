@@ -0,0 +1,122 @@
+"""Tests for migration plans (dry runs) and their endpoints."""
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from drf_spectacular.generators import SchemaGenerator
+from rest_framework.test import APIClient
+
+from apps.common.models import OutboxMessage
+from apps.migration_manager.models import Migration, MigrationTarget
+from apps.migration_manager.serializers import MigrationPlanBatchSerializer
+from apps.migration_manager.services import plan_migrations
+from apps.workloads.models import Credentials, MountPoint, Workload
+
+
+@override_settings(SIMULATION_TIME_SCALE=1)
+class MigrationPlanTests(TestCase):
+    """Test suite for plan_migrations() and the plan endpoints."""
+
+    @classmethod
+    def setUpTestData(cls):
+        credentials = Credentials.objects.create(username="svc", password="secret")
+        source = Workload.objects.create(name="src", ip_address="10.0.0.1", credentials=credentials)
+        c, d, e = (
+            MountPoint.objects.create(workload=source, name=name, size_gb=size)
+            for name, size in (("C:\\", 100), ("D:\\", 500), ("E:\\", 20))
+        )
+        vm = Workload.objects.create(name="vm", ip_address="10.1.0.1", credentials=credentials)
+        MountPoint.objects.create(workload=vm, name="C:\\", size_gb=100)
+        MountPoint.objects.create(workload=vm, name="D:\\", size_gb=50)
+        MountPoint.objects.create(workload=vm, name="X:\\", size_gb=1)
+        target = MigrationTarget.objects.create(cloud_type="aws", cloud_credentials=credentials, target_vm=vm)
+        cls.ready = Migration.objects.create(source=source, target=target)
+        cls.ready.selected_mount_points.set([c, d, e])
+
+        other_vm = Workload.objects.create(name="vm-2", ip_address="10.1.0.2", credentials=credentials)
+        other_target = MigrationTarget.objects.create(
+            cloud_type="azure", cloud_credentials=credentials, target_vm=other_vm
+        )
+        cls.without_c = Migration.objects.create(source=source, target=other_target)
+        cls.without_c.selected_mount_points.set([d])
+        cls.user = User.objects.create_user("api", password="password")
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_plan_predicts_the_sync_report(self):
+        ids = [self.ready.id, self.without_c.id, uuid.uuid4()]
+        plan_migrations(ids)
+        # Once the run-time calibrations are cached.
+        with self.assertNumQueries(1):
+            plans = plan_migrations(ids)
+
+        self.assertEqual(set(plans), {self.ready.id, self.without_c.id})
+        self.assertEqual(
+            plans[self.ready.id],
+            {
+                "id": str(self.ready.id),
+                "state": "not_started",
+                "target_vm": str(self.ready.target.target_vm_id),
+                "preflight": {"passed": True, "errors": []},
+                "mount_points": {"created": ["E:\\"], "updated": ["D:\\"], "deleted": ["X:\\"], "unchanged": 1},
+                "transfer_gb": 620,
+                # 60 s setup, 3 * 10 s per volume and 620 GB at 0.25 GB/s.
+                "estimated_seconds": 2570.0,
+            },
+        )
+        self.assertEqual(
+            plans[self.without_c.id]["preflight"],
+            {"passed": False, "errors": ["Cannot start migration: The system mount point 'C:\\' is not selected."]},
+        )
+
+    def test_plan_endpoint_changes_nothing(self):
+        response = self.client.post(f"/api/v1/migrations/{self.ready.id}/plan/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["transfer_gb"], 620)
+
+        self.ready.refresh_from_db()
+        self.assertEqual(self.ready.state, Migration.MigrationState.NOT_STARTED)
+        self.assertFalse(OutboxMessage.objects.exists())
+        self.assertEqual(self.client.post(f"/api/v1/migrations/{uuid.uuid4()}/plan/").status_code, 404)
+        self.assertEqual(self.client.post("/api/v1/migrations/not-a-uuid/plan/").status_code, 404)
+
+    @override_settings(MIGRATION_PLAN_BATCH_SIZE=1)
+    def test_batch_plan_reports_totals(self):
+        missing = uuid.uuid4()
+        response = self.client.post(
+            "/api/v1/migrations/plan/",
+            {"ids": [str(self.ready.id), str(missing), str(self.without_c.id)]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual([plan["id"] for plan in body["results"]], [str(self.ready.id), str(self.without_c.id)])
+        self.assertEqual(body["not_found"], [str(missing)])
+        self.assertTrue(MigrationPlanBatchSerializer(data=body).is_valid())
+        self.assertEqual(
+            body["totals"],
+            {
+                "migrations": 2,
+                "preflight_passed": 1,
+                "preflight_failed": 1,
+                "transfer_gb": 1120,
+                "estimated_seconds": 2570.0 + 2605.0,
+                "mount_points_created": 2,
+                "mount_points_updated": 1,
+                "mount_points_deleted": 1,
+            },
+        )
+        self.assertEqual(self.client.post("/api/v1/migrations/plan/", {"ids": []}, format="json").status_code, 400)
+
+    def test_plan_endpoints_are_documented_apart(self):
+        paths = SchemaGenerator().get_schema(request=None, public=True)["paths"]
+        detail = paths["/api/v1/migrations/{id}/plan/"]["post"]
+        batch = paths["/api/v1/migrations/plan/"]["post"]
+        self.assertEqual((detail["operationId"], batch["operationId"]), ("migrations_plan", "migrations_plan_batch"))
+        self.assertNotIn("requestBody", detail)
+        self.assertIn("MigrationPlanRequest", str(batch["requestBody"]))
+        self.assertIn("MigrationPlanBatch", str(batch["responses"]["200"]))
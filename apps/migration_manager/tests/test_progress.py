@@ -0,0 +1,126 @@
+"""Tests for live migration progress, its flusher and its endpoint."""
+import io
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from drf_spectacular.generators import SchemaGenerator
+from rest_framework.test import APIClient
+
+from apps.migration_manager import progress
+from apps.migration_manager.models import Migration, MigrationTarget
+from apps.migration_manager.serializers import MigrationProgressSerializer
+from apps.migration_manager.services import run_migration_logic
+from apps.workloads.models import Credentials, MountPoint, Workload
+
+
+@override_settings(PROGRESS_REDIS_URL="")
+class ProgressTests(TestCase):
+    """Test suite for apps.migration_manager.progress and the flush_progress command."""
+
+    @classmethod
+    def setUpTestData(cls):
+        credentials = Credentials.objects.create(username="svc", password="secret")
+        cls.source = Workload.objects.create(name="src", ip_address="10.0.0.1", credentials=credentials)
+        cls.volumes = [
+            MountPoint.objects.create(workload=cls.source, name=name, size_gb=10) for name in ("C:\\", "D:\\")
+        ]
+        vm = Workload.objects.create(name="vm", ip_address="10.1.0.1", credentials=credentials)
+        cls.target = MigrationTarget.objects.create(cloud_type="aws", cloud_credentials=credentials, target_vm=vm)
+        cls.user = User.objects.create_user("api", password="password")
+
+    def setUp(self):
+        progress._store.cache_clear()
+
+    def _running(self, count):
+        return [
+            Migration.objects.create(source=self.source, target=self.target, state=Migration.MigrationState.RUNNING)
+            for _ in range(count)
+        ]
+
+    def test_run_reports_each_step_and_saves_the_final_progress(self):
+        migration = Migration.objects.create(source=self.source, target=self.target)
+        migration.selected_mount_points.set(self.volumes)
+        seen = []
+
+        def record_progress(seconds):
+            live, _ = progress.read([migration.id])[migration.id]
+            seen.append((live["phase"], live["step"]))
+
+        with patch("time.sleep", side_effect=record_progress):
+            run_migration_logic(migration)
+
+        self.assertEqual(seen, [("transfer", 0), ("transfer", 1), ("transfer", 2)])
+        migration.refresh_from_db()
+        self.assertEqual(migration.progress, {"phase": "done", "step": 4, "steps": 4, "percent": 100.0})
+        self.assertIsNotNone(migration.heartbeat_at)
+        self.assertEqual(progress.read([migration.id]), {})
+        self.assertEqual(progress.flush(), 0)
+
+    def test_flush_writes_running_migrations_in_one_query(self):
+        running, finished, second = self._running(3)
+        with self.assertNumQueries(0):
+            for migration in (running, finished, second):
+                progress.report(migration.id, "transfer", 1, 4)
+        Migration.objects.filter(pk=finished.pk).update(state=Migration.MigrationState.SUCCESS)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(progress.flush(batch_size=10), 2)
+        running.refresh_from_db()
+        self.assertEqual(running.progress, {"phase": "transfer", "step": 1, "steps": 4, "percent": 25.0})
+        self.assertIsNotNone(running.heartbeat_at)
+        finished.refresh_from_db()
+        self.assertIsNone(finished.progress)
+        self.assertEqual(progress.flush(), 0)
+
+    def test_flush_writes_at_most_a_batch(self):
+        for migration in self._running(5):
+            progress.report(migration.id, "transfer", 0, 4)
+        stdout = io.StringIO()
+        call_command("flush_progress", "--once", "--batch-size", "3", stdout=stdout)
+        self.assertIn("Flushed the progress of 3 migration(s).", stdout.getvalue())
+        self.assertEqual(Migration.objects.filter(progress__isnull=False).count(), 3)
+        self.assertEqual(progress.flush(batch_size=3), 2)
+
+    def test_flusher_logs_failed_flushes_and_keeps_going(self):
+        stdout = io.StringIO()
+        with patch(
+            "apps.migration_manager.management.commands.flush_progress.flush", side_effect=[ConnectionError("down"), 2]
+        ), patch("time.sleep", side_effect=[None, KeyboardInterrupt]), self.assertLogs(
+            "apps.migration_manager.management.commands.flush_progress", "ERROR"
+        ), self.assertRaises(KeyboardInterrupt):
+            call_command("flush_progress", "--interval", "0", stdout=stdout)
+        self.assertIn("Flushed the progress of 2 migration(s).", stdout.getvalue())
+
+    def test_unavailable_store_does_not_fail_the_run(self):
+        migration = Migration.objects.create(source=self.source, target=self.target)
+        migration.selected_mount_points.set(self.volumes)
+        with patch.object(progress.LocalProgressStore, "write", side_effect=ConnectionError("down")), patch(
+            "time.sleep", return_value=None
+        ), self.assertLogs("apps.migration_manager.progress", "WARNING"):
+            run_migration_logic(migration)
+        migration.refresh_from_db()
+        self.assertEqual(migration.state, Migration.MigrationState.SUCCESS)
+
+    def test_endpoint_reads_live_progress_of_running_migrations(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        (running,) = self._running(1)
+        progress.report(running.id, "copy", 3, 4)
+
+        response = client.get(f"/api/v1/migrations/{running.id}/progress/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["progress"], {"phase": "copy", "step": 3, "steps": 4, "percent": 75.0})
+        self.assertIsNotNone(response.json()["heartbeat_at"])
+        self.assertTrue(MigrationProgressSerializer(data=response.json()).is_valid())
+
+        Migration.objects.filter(pk=running.pk).update(state=Migration.MigrationState.ERROR)
+        response = client.get(f"/api/v1/migrations/{running.id}/progress/")
+        self.assertEqual(response.json()["progress"], None)
+        self.assertEqual(client.get("/api/v1/migrations/not-a-uuid/progress/").status_code, 404)
+
+    def test_endpoint_documents_the_progress_shape(self):
+        paths = SchemaGenerator().get_schema(request=None, public=True)["paths"]
+        response = paths["/api/v1/migrations/{id}/progress/"]["get"]["responses"]["200"]
+        self.assertIn("MigrationProgress", str(response))
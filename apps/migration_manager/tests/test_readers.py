@@ -0,0 +1,78 @@
+"""Contract tests: the values-based readers must match the serializers byte for byte."""
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from apps.common.renderers import ORJSONRenderer
+from apps.migration_manager.models import Migration, MigrationTarget
+from apps.migration_manager.readers import MigrationReader, MigrationTargetReader
+from apps.migration_manager.serializers import MigrationSerializer, MigrationTargetSerializer
+from apps.migration_manager.services import capture_source_snapshot
+from apps.migration_manager.views import MigrationTargetViewSet, MigrationViewSet
+from apps.workloads.models import Credentials, MountPoint, Workload
+
+
+class MigrationReaderContractTests(TestCase):
+    """Test suite for MigrationTargetReader and MigrationReader."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create two migrations, one with several selected volumes and one with none."""
+        credentials = Credentials.objects.create(username="admin", password="password", domain="CORP")
+        for index in range(2):
+            source = Workload.objects.create(name=f"src-{index}", ip_address=f"10.0.0.{index + 1}", credentials=credentials)
+            volumes = [
+                MountPoint.objects.create(workload=source, name=name, size_gb=10 * (i + 1))
+                for i, name in enumerate(("C:\\", "D:\\", "E:\\"))
+            ]
+            target_vm = Workload.objects.create(name=f"vm-{index}", ip_address=f"10.1.0.{index + 1}", credentials=credentials)
+            MountPoint.objects.create(workload=target_vm, name="C:\\", size_gb=10)
+            target = MigrationTarget.objects.create(
+                cloud_type=MigrationTarget.CloudType.AZURE, cloud_credentials=credentials, target_vm=target_vm
+            )
+            migration = Migration.objects.create(source=source, target=target)
+            if index == 0:
+                migration.selected_mount_points.set([volumes[2], volumes[0]])
+                migration.sync_report = {"created": ["E:\\"], "updated": [], "deleted": ["D:\\"], "unchanged": 1}
+                migration.source_snapshot = capture_source_snapshot(migration)
+                migration.started_at = migration.created_at
+                migration.finished_at = migration.created_at + timedelta(seconds=42)
+                migration.estimated_seconds = 37.5
+                migration.progress = {"phase": "done", "step": 4, "steps": 4, "percent": 100.0}
+                migration.heartbeat_at = migration.finished_at
+                migration.save(
+                    update_fields=[
+                        "sync_report",
+                        "source_snapshot",
+                        "started_at",
+                        "finished_at",
+                        "estimated_seconds",
+                        "progress",
+                        "heartbeat_at",
+                    ]
+                )
+        cls.user = User.objects.create_user("api", password="password")
+
+    def _assert_contract(self, reader_class, serializer_class, queryset):
+        expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+        self.assertEqual(JSONRenderer().render(reader_class().read(queryset)), expected)
+        self.assertEqual(ORJSONRenderer().render(reader_class(native_values=True).read(queryset)), expected)
+
+    def test_target_reader_matches_serializer(self):
+        self._assert_contract(MigrationTargetReader, MigrationTargetSerializer, MigrationTargetViewSet.queryset.all())
+
+    def test_migration_reader_matches_serializer(self):
+        self._assert_contract(MigrationReader, MigrationSerializer, MigrationViewSet.queryset.all())
+
+    def test_list_endpoints_output_is_unchanged(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        for url in ("/api/v1/migrations/", "/api/v1/migration-targets/"):
+            fast = client.get(url)
+            with override_settings(API_FAST_LIST_ENABLED=False):
+                slow = client.get(url)
+            self.assertEqual(fast.status_code, 200)
+            self.assertEqual(fast.content, slow.content, url)
@@ -1,13 +1,15 @@
 """Tests for the service layer of the migration_manager application."""
 from unittest.mock import patch
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.core.exceptions import ValidationError
 
 from apps.workloads.models import Credentials, Workload, MountPoint
+from apps.migration_manager import progress
 from apps.migration_manager.models import MigrationTarget, Migration
-from apps.migration_manager.services import run_migration_logic
+from apps.migration_manager.services import run_migration_logic, sync_mount_points, target_vm_lock
 
 
+@override_settings(PROGRESS_REDIS_URL="")
 class MigrationServiceTests(TestCase):
     """Test suite for the migration service logic."""
 
@@ -55,6 +57,8 @@ class MigrationServiceTests(TestCase):
         # Assertions
         migration.refresh_from_db()
         self.assertEqual(migration.state, Migration.MigrationState.SUCCESS)
+        self.assertLessEqual(migration.started_at, migration.finished_at)
+        self.assertIsNotNone(migration.estimated_seconds)
 
         self.target_workload.refresh_from_db()
         target_mps = self.target_workload.mount_points.all()
@@ -63,8 +67,9 @@ class MigrationServiceTests(TestCase):
         target_mp_names = {mp.name for mp in target_mps}
         self.assertEqual(target_mp_names, {"C:\\", "D:\\"})
         
-        # Check that the mock was called, confirming simulation happened
-        mock_sleep.assert_called_once()
+        # Check that the mock was called, confirming simulation happened:
+        # once for the setup and once per mount point.
+        self.assertEqual(mock_sleep.call_count, 3)
 
     def test_run_migration_fails_without_c_drive(self):
         """
@@ -87,3 +92,122 @@ class MigrationServiceTests(TestCase):
         # Verify the migration state is unchanged (or correctly set to error if implemented)
         migration.refresh_from_db()
         self.assertEqual(migration.state, Migration.MigrationState.NOT_STARTED)
+
+    def _run_while_the_target_vm_is_locked(self, on_wait):
+        """
+        Run a migration while another holds its target VM's lock.
+
+        ``on_wait`` is called at each wait for the lock, with a callable that
+        releases it.
+        """
+        migration = Migration.objects.create(source=self.source_workload, target=self.migration_target)
+        migration.selected_mount_points.set([self.mp_c])
+        lock = target_vm_lock(self.target_workload.id)
+        held = [lock]
+        report = progress.report
+
+        def release():
+            if held:
+                held.pop().__exit__(None, None, None)
+
+        def report_waits(migration_id, phase, step, steps):
+            if phase == "waiting":
+                on_wait(release)
+            return report(migration_id, phase, step, steps)
+
+        lock.__enter__()
+        try:
+            with patch("time.sleep", return_value=None), patch.object(progress, "report", side_effect=report_waits):
+                run_migration_logic(migration)
+        finally:
+            release()
+        migration.refresh_from_db()
+        return migration
+
+    @override_settings(LOCK_BACKEND="local", LOCK_WAIT_TIMEOUT=0.05)
+    def test_copy_waits_in_line_for_other_migrations_to_the_same_vm(self):
+        """The copy phase holds the target VM's lock; a migration that cannot get it yet waits for it."""
+        waits = []
+
+        def release_on_second_wait(release):
+            waits.append(release)
+            if len(waits) == 2:
+                release()
+
+        migration = self._run_while_the_target_vm_is_locked(release_on_second_wait)
+        self.assertEqual(len(waits), 2)
+        self.assertEqual(migration.state, Migration.MigrationState.SUCCESS)
+        self.assertEqual(list(self.target_workload.mount_points.values_list("name", flat=True)), ["C:\\"])
+
+    @override_settings(LOCK_BACKEND="local", LOCK_WAIT_TIMEOUT=0.05)
+    def test_migration_waiting_for_the_target_vm_can_be_cancelled(self):
+        def cancel(release):
+            Migration.objects.filter(state=Migration.MigrationState.RUNNING).update(
+                stop_request=Migration.StopRequest.CANCEL
+            )
+
+        migration = self._run_while_the_target_vm_is_locked(cancel)
+        self.assertEqual(migration.state, Migration.MigrationState.CANCELLED)
+        self.assertFalse(self.target_workload.mount_points.exists())
+
+    @patch("time.sleep", return_value=None)
+    def test_copy_syncs_the_target_incrementally(self, mock_sleep):
+        """Existing target mount points are updated or deleted in place, not recreated."""
+        kept = MountPoint.objects.create(workload=self.target_workload, name="C:\\", size_gb=100)
+        resized = MountPoint.objects.create(workload=self.target_workload, name="D:\\", size_gb=50)
+        MountPoint.objects.create(workload=self.target_workload, name="X:\\", size_gb=1)
+        mp_e = MountPoint.objects.create(workload=self.source_workload, name="E:\\", size_gb=20)
+        migration = Migration.objects.create(source=self.source_workload, target=self.migration_target)
+        migration.selected_mount_points.set([self.mp_c, self.mp_d, mp_e])
+
+        run_migration_logic(migration)
+
+        migration.refresh_from_db()
+        self.assertEqual(
+            migration.sync_report,
+            {"created": ["E:\\"], "updated": ["D:\\"], "deleted": ["X:\\"], "unchanged": 1},
+        )
+        target_mps = {mp.name: mp for mp in self.target_workload.mount_points.all()}
+        self.assertEqual({name: mp.size_gb for name, mp in target_mps.items()}, {"C:\\": 100, "D:\\": 500, "E:\\": 20})
+        self.assertEqual((target_mps["C:\\"].pk, target_mps["D:\\"].pk), (kept.pk, resized.pk))
+
+    def test_sync_is_idempotent(self):
+        """Syncing the same selection twice changes nothing the second time."""
+        selected = [{"name": "C:\\", "size_gb": 100}, {"name": "D:\\", "size_gb": 500}]
+        sync_mount_points(self.target_workload.id, selected)
+        ids = set(self.target_workload.mount_points.values_list("id", flat=True))
+
+        with self.assertNumQueries(1):
+            report = sync_mount_points(self.target_workload.id, selected)
+        self.assertEqual(report, {"created": [], "updated": [], "deleted": [], "unchanged": 2})
+        self.assertEqual(set(self.target_workload.mount_points.values_list("id", flat=True)), ids)
+
+    def test_run_works_from_the_snapshot_taken_when_it_starts(self):
+        """Edits made to the source while the migration runs do not reach the target."""
+        migration = Migration.objects.create(source=self.source_workload, target=self.migration_target)
+        migration.selected_mount_points.set([self.mp_c, self.mp_d])
+
+        def edit_source(seconds):
+            MountPoint.objects.filter(pk=self.mp_d.pk).update(size_gb=1)
+            Workload.objects.filter(pk=self.source_workload.pk).update(name="Renamed")
+            migration.selected_mount_points.remove(self.mp_c)
+
+        with patch("time.sleep", side_effect=edit_source):
+            run_migration_logic(migration)
+
+        migration.refresh_from_db()
+        snapshot = migration.source_snapshot
+        self.assertEqual(
+            snapshot["source"],
+            {"id": str(self.source_workload.id), "name": "Source Server", "ip_address": "192.168.1.10"},
+        )
+        self.assertEqual(snapshot["target_vm"], str(self.target_workload.id))
+        self.assertEqual(
+            snapshot["mount_points"],
+            [
+                {"id": str(self.mp_c.id), "name": "C:\\", "size_gb": 100},
+                {"id": str(self.mp_d.id), "name": "D:\\", "size_gb": 500},
+            ],
+        )
+        target_mps = dict(self.target_workload.mount_points.values_list("name", "size_gb"))
+        self.assertEqual(target_mps, {"C:\\": 100, "D:\\": 500})
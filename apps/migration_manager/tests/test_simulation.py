@@ -0,0 +1,88 @@
+"""Tests for the transfer simulation model and the run-time estimates."""
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.migration_manager.eta import calibration, estimate_seconds
+from apps.migration_manager.models import Migration, MigrationTarget
+from apps.migration_manager.simulation import simulate_transfer, simulated_seconds
+from apps.workloads.models import Credentials, Workload
+
+PROFILES = {"aws": {"bandwidth_gb_per_s": 0.5, "setup_seconds": 30, "volume_overhead_seconds": 5}}
+
+
+@override_settings(SIMULATION_PROFILES=PROFILES, SIMULATION_TIME_SCALE=1, ETA_MIN_SAMPLES=3)
+class SimulationTests(TestCase):
+    """Test suite for apps.migration_manager.simulation and apps.migration_manager.eta."""
+
+    @classmethod
+    def setUpTestData(cls):
+        credentials = Credentials.objects.create(username="svc", password="secret")
+        cls.source = Workload.objects.create(name="src", ip_address="10.0.0.1", credentials=credentials)
+        vm = Workload.objects.create(name="vm", ip_address="10.1.0.1", credentials=credentials)
+        cls.target = MigrationTarget.objects.create(cloud_type="aws", cloud_credentials=credentials, target_vm=vm)
+
+    def setUp(self):
+        cache.clear()
+
+    def _finished_run(self, sizes_gb, seconds, state=Migration.MigrationState.SUCCESS, paused_seconds=0):
+        started_at = timezone.now() - timedelta(hours=1)
+        return Migration.objects.create(
+            source=self.source,
+            target=self.target,
+            state=state,
+            source_snapshot={"mount_points": [{"name": f"V{i}:\\", "size_gb": size} for i, size in enumerate(sizes_gb)]},
+            started_at=started_at,
+            finished_at=started_at + timedelta(seconds=seconds + paused_seconds),
+            active_seconds=seconds,
+        )
+
+    def test_duration_follows_the_volumes_and_the_time_scale(self):
+        # 30 s setup, then 5 s plus size / 0.5 GB/s per volume.
+        self.assertEqual(simulated_seconds("aws", [10, 100]), 30 + 25 + 205)
+        self.assertEqual(simulated_seconds("aws", []), 30)
+        with override_settings(SIMULATION_TIME_SCALE=0.5):
+            self.assertEqual(simulated_seconds("aws", [10, 100]), 130)
+        with self.assertRaises(ImproperlyConfigured):
+            simulated_seconds("vcloud", [10])
+
+    @patch("time.sleep", return_value=None)
+    def test_simulate_transfer_waits_for_the_modelled_time(self, mock_sleep):
+        steps = []
+        mount_points = [{"name": "C:\\", "size_gb": 10}, {"name": "D:\\", "size_gb": 100}]
+        self.assertEqual(simulate_transfer("aws", mount_points, on_step=steps.append), 260)
+        self.assertEqual([call.args for call in mock_sleep.call_args_list], [(30,), (25,), (205,)])
+        self.assertEqual(steps, [1, 2, 3])
+
+    def test_estimate_is_the_model_until_there_is_enough_history(self):
+        self._finished_run([10], 110)
+        self._finished_run([10], 110)
+        self.assertEqual(calibration("aws"), 1.0)
+        self.assertEqual(estimate_seconds("aws", [10]), 55.0)
+
+    def test_estimate_is_calibrated_on_recent_successful_runs(self):
+        # Runs of 55 modelled seconds that took twice, twice and four times as long.
+        for seconds in (110, 110, 220):
+            self._finished_run([10], seconds)
+        self._finished_run([10], 1000, state=Migration.MigrationState.ERROR)
+        self.assertEqual(estimate_seconds("aws", [10, 100]), 520.0)
+
+        # Factors are cached until ETA_CACHE_SECONDS have passed.
+        self._finished_run([10], 1000)
+        self._finished_run([10], 1000)
+        with self.assertNumQueries(0):
+            self.assertEqual(calibration("aws"), 2.0)
+
+    def test_time_spent_paused_is_not_calibrated_on(self):
+        for seconds in (110, 110, 110):
+            self._finished_run([10], seconds, paused_seconds=3600)
+        self.assertEqual(calibration("aws"), 2.0)
+
+        # Runs saved before active_seconds was recorded use their wall-clock time.
+        Migration.objects.update(active_seconds=None)
+        cache.clear()
+        self.assertGreater(calibration("aws"), 60)
@@ -0,0 +1,170 @@
+"""Tests for cancelling, pausing and resuming migrations."""
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.common.models import OutboxMessage
+from apps.migration_manager import progress
+from apps.migration_manager.models import Migration, MigrationTarget
+from apps.migration_manager.services import request_cancel, request_pause, request_resume, run_migration_logic
+from apps.workloads.models import Credentials, MountPoint, Workload
+
+
+@override_settings(PROGRESS_REDIS_URL="")
+class StopRequestTests(TestCase):
+    """Test suite for the cancel, pause and resume requests and endpoints."""
+
+    @classmethod
+    def setUpTestData(cls):
+        credentials = Credentials.objects.create(username="svc", password="secret")
+        cls.source = Workload.objects.create(name="src", ip_address="10.0.0.1", credentials=credentials)
+        cls.volumes = [
+            MountPoint.objects.create(workload=cls.source, name=name, size_gb=10) for name in ("C:\\", "D:\\")
+        ]
+        cls.vm = Workload.objects.create(name="vm", ip_address="10.1.0.1", credentials=credentials)
+        cls.target = MigrationTarget.objects.create(cloud_type="aws", cloud_credentials=credentials, target_vm=cls.vm)
+        cls.user = User.objects.create_user("api", password="password")
+
+    def setUp(self):
+        progress._store.cache_clear()
+        self.migration = Migration.objects.create(source=self.source, target=self.target)
+        self.migration.selected_mount_points.set(self.volumes)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _run_requesting(self, request, at_sleep, shared=True):
+        """
+        Run the migration, calling ``request`` during its ``at_sleep``-th wait.
+
+        With ``shared``, the progress store acts as one shared by every
+        process, as Redis is.
+
+        Returns:
+            tuple: The waits, and the number of times the saved ``stop_request`` was read.
+        """
+        waits = []
+
+        def sleep(seconds):
+            waits.append(seconds)
+            if len(waits) == at_sleep:
+                request(self.migration.pk)
+
+        with patch("time.sleep", side_effect=sleep), patch.object(
+            progress.LocalProgressStore, "shared", shared
+        ), CaptureQueriesContext(connection) as queries:
+            run_migration_logic(self.migration)
+        self.migration.refresh_from_db()
+        selects = [query["sql"] for query in queries if query["sql"].startswith("SELECT")]
+        return waits, len([sql for sql in selects if "stop_request" in sql])
+
+    def test_cancel_stops_a_running_migration_at_the_next_step(self):
+        waits, reads = self._run_requesting(request_cancel, at_sleep=2)
+
+        self.assertEqual(len(waits), 2)
+        # The cancel came with the report; only the boundary before the transfer read the row.
+        self.assertEqual(reads, 1)
+        self.assertEqual(self.migration.state, Migration.MigrationState.CANCELLED)
+        self.assertEqual(self.migration.stop_request, "")
+        self.assertEqual(self.migration.progress["phase"], "cancelled")
+        self.assertIsNotNone(self.migration.finished_at)
+        self.assertFalse(self.vm.mount_points.exists())
+
+    def test_paused_migration_resumes_after_its_last_step(self):
+        waits, _ = self._run_requesting(request_pause, at_sleep=2)
+        self.assertEqual(len(waits), 2)
+        self.assertEqual(self.migration.state, Migration.MigrationState.PAUSED)
+        self.assertEqual(self.migration.progress["step"], 2)
+        self.assertIsNone(self.migration.finished_at)
+        # The migration sat paused for an hour.
+        started_at = self.migration.started_at - timedelta(hours=1)
+        Migration.objects.filter(pk=self.migration.pk).update(started_at=started_at)
+        self.migration.refresh_from_db()
+
+        request_resume(self.migration)
+        self.assertEqual(OutboxMessage.objects.get().kwargs, {"migration_id": str(self.migration.id)})
+        with patch("time.sleep", return_value=None) as mock_sleep:
+            run_migration_logic(self.migration)
+
+        # Only the last mount point was left to transfer.
+        self.assertEqual(mock_sleep.call_count, 1)
+        self.migration.refresh_from_db()
+        self.assertEqual(self.migration.state, Migration.MigrationState.SUCCESS)
+        self.assertEqual(self.migration.started_at, started_at)
+        # Only the time spent running counts as active.
+        self.assertLess(self.migration.active_seconds, 60)
+        self.assertEqual(set(self.vm.mount_points.values_list("name", flat=True)), {"C:\\", "D:\\"})
+
+    def test_withdrawn_pause_lets_the_run_finish(self):
+        def pause_and_resume(migration_id):
+            request_pause(migration_id)
+            request_resume(self.migration)
+
+        _, reads = self._run_requesting(pause_and_resume, at_sleep=1)
+        self.assertEqual(self.migration.state, Migration.MigrationState.SUCCESS)
+        self.assertEqual(self.migration.stop_request, "")
+        # The stop request is read from the row at the two phase boundaries only.
+        self.assertEqual(reads, 2)
+
+    def test_request_made_in_another_process_stops_the_run(self):
+        # The API process saved the request, but this process's store never saw it.
+        def cancel_elsewhere(migration_id):
+            Migration.objects.filter(pk=migration_id).update(stop_request=Migration.StopRequest.CANCEL)
+
+        waits, _ = self._run_requesting(cancel_elsewhere, at_sleep=2, shared=False)
+        self.assertEqual(len(waits), 2)
+        self.assertEqual(self.migration.state, Migration.MigrationState.CANCELLED)
+
+    def test_request_the_store_missed_stops_the_run_before_the_copy(self):
+        with patch.object(progress.LocalProgressStore, "set_stop", side_effect=ConnectionError("down")):
+            waits, _ = self._run_requesting(request_pause, at_sleep=2)
+        self.assertEqual(len(waits), 3)
+        self.assertEqual(self.migration.state, Migration.MigrationState.PAUSED)
+        self.assertFalse(self.vm.mount_points.exists())
+
+    def test_cancelled_migration_is_not_started_by_a_queued_task(self):
+        self.assertTrue(request_cancel(self.migration.pk))
+        with self.assertRaises(ValidationError):
+            run_migration_logic(self.migration)
+        self.migration.refresh_from_db()
+        self.assertEqual(self.migration.state, Migration.MigrationState.CANCELLED)
+        self.assertIsNotNone(self.migration.finished_at)
+
+    def test_duplicate_delivery_keeps_the_running_migrations_request(self):
+        # A second delivery of the task read the migration before it started.
+        stale = Migration.objects.get(pk=self.migration.pk)
+        Migration.objects.filter(pk=self.migration.pk).update(state=Migration.MigrationState.RUNNING)
+        self.assertFalse(request_cancel(self.migration.pk))
+
+        with self.assertRaises(ValidationError):
+            run_migration_logic(stale)
+        self.assertEqual(progress.get_store().write(self.migration.pk, {}), Migration.StopRequest.CANCEL)
+
+    def test_endpoints(self):
+        url = f"/api/v1/migrations/{self.migration.id}"
+        self.assertEqual(self.client.post(f"{url}/pause/").status_code, 400)
+        self.assertEqual(self.client.post(f"{url}/resume/").status_code, 400)
+
+        Migration.objects.filter(pk=self.migration.pk).update(state=Migration.MigrationState.RUNNING)
+        response = self.client.post(f"{url}/pause/")
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()["stop_request"], "pause")
+        response = self.client.post(f"{url}/resume/")
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()["stop_request"], "")
+
+        response = self.client.post(f"{url}/cancel/")
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()["stop_request"], "cancel")
+        # A cancel is not downgraded to a pause.
+        self.assertEqual(self.client.post(f"{url}/pause/").status_code, 400)
+
+        Migration.objects.filter(pk=self.migration.pk).update(state=Migration.MigrationState.SUCCESS)
+        response = self.client.post(f"{url}/cancel/")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"error": "Only migrations that have not finished can be cancelled."})
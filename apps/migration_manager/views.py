@@ -1,15 +1,34 @@
 """
 Views for the migration_manager REST API.
 """
+import uuid
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from drf_spectacular.utils import extend_schema
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 
+from apps.common.exports import ExportMixin
+from apps.common.readers import FastListMixin
+from . import progress
 from .models import MigrationTarget, Migration
-from .serializers import MigrationTargetSerializer, MigrationSerializer
+from .readers import MigrationReader, MigrationTargetReader
+from .serializers import (
+    MigrationPlanBatchSerializer,
+    MigrationPlanRequestSerializer,
+    MigrationPlanSerializer,
+    MigrationProgressSerializer,
+    MigrationTargetSerializer,
+    MigrationSerializer,
+)
+from .services import plan_migrations, request_cancel, request_pause, request_resume
 
 
-class MigrationTargetViewSet(viewsets.ModelViewSet):
+class MigrationTargetViewSet(FastListMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows Migration Targets to be viewed or edited.
     """
@@ -17,9 +36,11 @@ class MigrationTargetViewSet(viewsets.ModelViewSet):
         'cloud_credentials', 'target_vm'
     )
     serializer_class = MigrationTargetSerializer
+    # Lists are built from .values() rows (see apps.common.readers).
+    reader_class = MigrationTargetReader
 
 
-class MigrationViewSet(viewsets.ModelViewSet):
+class MigrationViewSet(ExportMixin, FastListMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows Migrations to be viewed, edited, and run.
     """
@@ -27,6 +48,22 @@ class MigrationViewSet(viewsets.ModelViewSet):
         'source', 'target'
     ).prefetch_related('selected_mount_points')
     serializer_class = MigrationSerializer
+    # Lists and exports are built from .values() rows (see apps.common.readers).
+    reader_class = MigrationReader
+    export_columns = (
+        'id',
+        'state',
+        'source',
+        'source_details.name',
+        'source_details.ip_address',
+        'target',
+        'target_details.cloud_type',
+        'target_details.target_vm_details.name',
+        'target_details.target_vm_details.ip_address',
+        'selected_mount_points',
+        'created_at',
+        'updated_at',
+    )
 
     @action(detail=True, methods=['post'], url_path='run')
     def run_migration(self, request, pk=None):
@@ -50,3 +87,115 @@ class MigrationViewSet(viewsets.ModelViewSet):
         # Return the serialized migration data with a 202 Accepted status
         serializer = self.get_serializer(migration)
         return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+    def _after_request(self, migration, accepted):
+        migration.refresh_from_db()
+        serializer = self.get_serializer(migration)
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED if accepted else status.HTTP_200_OK)
+
+    @action(detail=True, methods=['post'], url_path='cancel')
+    def cancel(self, request, pk=None):
+        """
+        Cancel a migration that has not finished.
+
+        A running migration is stopped by its worker at its next step, so the
+        response is 202 Accepted; others are cancelled at once.
+        """
+        migration = self.get_object()
+        try:
+            cancelled = request_cancel(migration.pk)
+        except ValidationError as e:
+            return Response({'error': ' '.join(e.messages)}, status=status.HTTP_400_BAD_REQUEST)
+        return self._after_request(migration, accepted=not cancelled)
+
+    @action(detail=True, methods=['post'], url_path='pause')
+    def pause(self, request, pk=None):
+        """Pause a running migration at its next step, freeing its worker."""
+        migration = self.get_object()
+        try:
+            request_pause(migration.pk)
+        except ValidationError as e:
+            return Response({'error': ' '.join(e.messages)}, status=status.HTTP_400_BAD_REQUEST)
+        return self._after_request(migration, accepted=True)
+
+    @action(detail=True, methods=['post'], url_path='resume')
+    def resume(self, request, pk=None):
+        """
+        Queue a paused migration again, to continue after its last completed step.
+
+        For a migration that has not paused yet, the pause request is withdrawn.
+        """
+        migration = self.get_object()
+        try:
+            request_resume(migration)
+        except ValidationError as e:
+            return Response({'error': ' '.join(e.messages)}, status=status.HTTP_400_BAD_REQUEST)
+        return self._after_request(migration, accepted=True)
+
+    @extend_schema(responses=MigrationProgressSerializer)
+    @action(detail=True, methods=['get'], url_path='progress')
+    def live_progress(self, request, pk=None):
+        """
+        Live progress of a migration.
+
+        A running migration's progress and heartbeat come from the progress
+        store (see apps.migration_manager.progress); otherwise they are the
+        ones saved on the migration.
+        """
+        row = get_object_or_404(Migration.objects.values('id', 'state', 'progress', 'heartbeat_at'), pk=pk)
+        progress.overlay([row])
+        return Response(row)
+
+    @extend_schema(operation_id='migrations_plan', request=None, responses=MigrationPlanSerializer)
+    @action(detail=True, methods=['post'], url_path='plan')
+    def plan(self, request, pk=None):
+        """
+        Dry run of a migration: what running it would do to its target VM.
+
+        Nothing is changed and no task is queued.
+        """
+        try:
+            plans = plan_migrations([uuid.UUID(str(pk))])
+        except ValueError:
+            raise Http404
+        if not plans:
+            raise Http404
+        return Response(next(iter(plans.values())))
+
+    @extend_schema(
+        operation_id='migrations_plan_batch',
+        request=MigrationPlanRequestSerializer,
+        responses=MigrationPlanBatchSerializer,
+    )
+    @action(detail=False, methods=['post'], url_path='plan')
+    def plan_batch(self, request):
+        """
+        Dry run of many migrations, e.g. a wave, with its capacity totals.
+
+        The body is ``{"ids": [...]}``. Migrations are planned
+        ``MIGRATION_PLAN_BATCH_SIZE`` at a time, one query per batch.
+        """
+        serializer = MigrationPlanRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = list(dict.fromkeys(serializer.validated_data['ids']))
+
+        plans = {}
+        batch_size = settings.MIGRATION_PLAN_BATCH_SIZE
+        for start in range(0, len(ids), batch_size):
+            plans.update(plan_migrations(ids[start:start + batch_size]))
+
+        results = [plans[migration_id] for migration_id in ids if migration_id in plans]
+        totals = {
+            'migrations': len(results),
+            'preflight_passed': sum(plan['preflight']['passed'] for plan in results),
+            'preflight_failed': sum(not plan['preflight']['passed'] for plan in results),
+            'transfer_gb': sum(plan['transfer_gb'] for plan in results),
+            'estimated_seconds': round(sum(plan['estimated_seconds'] for plan in results), 1),
+        }
+        for change in ('created', 'updated', 'deleted'):
+            totals[f'mount_points_{change}'] = sum(len(plan['mount_points'][change]) for plan in results)
+        return Response({
+            'results': results,
+            'not_found': [str(migration_id) for migration_id in ids if migration_id not in plans],
+            'totals': totals,
+        })
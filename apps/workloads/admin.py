@@ -7,6 +7,7 @@ usability for administrators, such as adding search, filtering, and inline
 editing capabilities.
 """
 from django.contrib import admin
+from apps.common.admin import ScalableModelAdmin
 from .models import Credentials, Workload, MountPoint
 
 
@@ -23,31 +24,40 @@ class MountPointInline(admin.TabularInline):
 
 
 @admin.register(Credentials)
-class CredentialsAdmin(admin.ModelAdmin):
+class CredentialsAdmin(ScalableModelAdmin):
     """Admin configuration for the Credentials model."""
     list_display = ('id', 'username', 'domain', 'updated_at')
     search_fields = ('username', 'domain')
+    autocomplete_only = ('username', 'domain')
     readonly_fields = ('created_at', 'updated_at', 'id')
 
 
 @admin.register(Workload)
-class WorkloadAdmin(admin.ModelAdmin):
+class WorkloadAdmin(ScalableModelAdmin):
     """
     Admin configuration for the Workload model.
 
     Includes an inline for managing associated MountPoints directly.
     """
     list_display = ('name', 'ip_address', 'credentials', 'updated_at')
-    search_fields = ('name', 'ip_address')
+    search_fields = ('name',)
+    ip_search_fields = ('ip_address',)
     list_select_related = ('credentials',)  # Optimize query performance
+    autocomplete_fields = ('credentials',)
+    autocomplete_only = ('name', 'ip_address')
     readonly_fields = ('created_at', 'updated_at', 'id')
     inlines = [MountPointInline]
 
 
 @admin.register(MountPoint)
-class MountPointAdmin(admin.ModelAdmin):
+class MountPointAdmin(ScalableModelAdmin):
     """Admin configuration for the MountPoint model."""
     list_display = ('name', 'workload', 'size_gb', 'updated_at')
-    search_fields = ('name', 'workload__name', 'workload__ip_address')
+    search_fields = ('name', 'workload__name')
+    ip_search_fields = ('workload__ip_address',)
     list_select_related = ('workload',)
+    autocomplete_fields = ('workload',)
+    # MountPoint.__str__ reads the workload's name.
+    autocomplete_select_related = ('workload',)
+    autocomplete_only = ('name', 'size_gb', 'workload__name')
     readonly_fields = ('created_at', 'updated_at', 'id')
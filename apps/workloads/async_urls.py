@@ -0,0 +1,13 @@
+"""
+URL configuration for the async workload read endpoints.
+"""
+from django.urls import path
+
+from .async_views import workload_detail, workload_lookup
+
+app_name = "workloads_async"
+
+urlpatterns = [
+    path("workloads/lookup/", workload_lookup, name="workload-lookup"),
+    path("workloads/<uuid:pk>/", workload_detail, name="workload-detail"),
+]
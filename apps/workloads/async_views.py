@@ -0,0 +1,35 @@
+"""
+Async read views for workloads (see :mod:`apps.common.async_views`).
+"""
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.validators import validate_ipv46_address
+from django.http import Http404
+
+from apps.common.async_views import NATIVE_VALUES, ValidationError, async_read_view
+from .models import Workload
+from .readers import WorkloadReader
+
+
+async def _read_one(queryset):
+    workloads = await WorkloadReader(NATIVE_VALUES).aread(queryset)
+    if not workloads:
+        raise Http404
+    return workloads[0]
+
+
+@async_read_view
+async def workload_detail(request, pk):
+    """The workload as ``GET /api/v1/workloads/<id>/`` returns it."""
+    return await _read_one(Workload.objects.filter(pk=pk))
+
+
+@async_read_view
+async def workload_lookup(request):
+    """The workload with the IP address given by the ``ip`` query parameter."""
+    ip_address = request.GET.get("ip", "").strip()
+    try:
+        validate_ipv46_address(ip_address)
+    except DjangoValidationError as exc:
+        raise ValidationError({"ip": exc.messages})
+    # GenericIPAddressField normalises IPv6 lookups the way it stores them.
+    return await _read_one(Workload.objects.filter(ip_address=ip_address))
@@ -0,0 +1,46 @@
+"""
+Trigram indexes serving the admin's name searches on PostgreSQL.
+
+Django compares ``UPPER("name"::text)`` for case-insensitive lookups, so the
+indexes are built on that expression. A GIN trigram index answers both the
+prefix searches of ``apps.common.admin.ScalableModelAdmin`` and ``icontains``.
+The indexes are created concurrently, so the tables stay writable; on other
+databases the migration does nothing.
+"""
+from django.db import migrations
+
+INDEXES = {
+    "workloads_workload_name_trgm": "workloads_workload",
+    "workloads_mountpoint_name_trgm": "workloads_mountpoint",
+}
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table in INDEXES.items():
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{name}" ON "{table}" '
+            f'USING gin ((UPPER("name"::text)) gin_trgm_ops)'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name in INDEXES:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("workloads", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
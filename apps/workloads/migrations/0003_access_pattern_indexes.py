@@ -0,0 +1,44 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:38
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("workloads", "0002_trigram_name_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="mountpoint",
+            index=models.Index(
+                fields=["workload", "-created_at"],
+                name="mountpoint_workload_recent_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mountpoint",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="mountpoint_recent_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="workload",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="workload_recent_idx"
+            ),
+        ),
+        # The indexes above cover the single-column indexes dropped here.
+        migrations.AlterField(
+            model_name="mountpoint",
+            name="workload",
+            field=models.ForeignKey(
+                db_index=False,
+                help_text="The workload this mount point is attached to.",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="mount_points",
+                to="workloads.workload",
+            ),
+        ),
+    ]
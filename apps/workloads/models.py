@@ -79,6 +79,10 @@ class Workload(DirtyFieldsMixin, TimestampedModel):
     class Meta(TimestampedModel.Meta):
         verbose_name = "Workload"
         verbose_name_plural = "Workloads"
+        indexes = [
+            # Lists and the admin changelist, newest first.
+            models.Index(fields=["-created_at", "-id"], name="workload_recent_idx"),
+        ]
 
 
 class MountPoint(TimestampedModel):
@@ -94,6 +98,8 @@ class MountPoint(TimestampedModel):
         Workload,
         on_delete=models.CASCADE,
         related_name="mount_points",
+        # Covered by the (workload, name) constraint and the index below.
+        db_index=False,
         help_text="The workload this mount point is attached to."
     )
     name = models.CharField(
@@ -113,3 +119,9 @@ class MountPoint(TimestampedModel):
         unique_together = ('workload', 'name')
         verbose_name = "Mount Point"
         verbose_name_plural = "Mount Points"
+        indexes = [
+            # A workload's mount points, newest first.
+            models.Index(fields=["workload", "-created_at"], name="mountpoint_workload_recent_idx"),
+            # The admin changelist, newest first.
+            models.Index(fields=["-created_at", "-id"], name="mountpoint_recent_idx"),
+        ]
@@ -0,0 +1,101 @@
+"""
+Values-based readers mirroring the workloads serializers.
+
+See :mod:`apps.common.readers`. Any change to ``WorkloadSerializer``,
+``CredentialsSerializer`` or ``MountPointSerializer`` fields must be mirrored
+here; ``tests/test_readers.py`` fails otherwise.
+"""
+from apps.common.readers import ValuesReader, batched
+
+from .models import MountPoint, Workload
+
+
+class WorkloadReader(ValuesReader):
+    """Builds ``WorkloadSerializer`` output for reads."""
+
+    columns = (
+        "id",
+        "name",
+        "ip_address",
+        "created_at",
+        "updated_at",
+        "credentials_id",
+        "credentials__username",
+        "credentials__domain",
+        "credentials__created_at",
+        "credentials__updated_at",
+    )
+
+    def load_related(self, rows):
+        return {"mount_points": self.mount_points([row["id"] for row in rows])}
+
+    async def aload_related(self, rows):
+        return {"mount_points": await self.amount_points([row["id"] for row in rows])}
+
+    def build(self, rows, related):
+        mount_points = related["mount_points"]
+        credentials = {}
+        result = []
+        for row in rows:
+            credentials_id = row["credentials_id"]
+            if credentials_id not in credentials:
+                credentials[credentials_id] = {
+                    "id": credentials_id,
+                    "username": row["credentials__username"],
+                    "domain": row["credentials__domain"],
+                    "created_at": self.datetime(row["credentials__created_at"]),
+                    "updated_at": self.datetime(row["credentials__updated_at"]),
+                }
+            result.append(
+                {
+                    "id": row["id"],
+                    "name": row["name"],
+                    "ip_address": row["ip_address"],
+                    "credentials_details": credentials[credentials_id],
+                    "mount_points": mount_points.get(row["id"], []),
+                    "created_at": self.datetime(row["created_at"]),
+                    "updated_at": self.datetime(row["updated_at"]),
+                }
+            )
+        return result
+
+    def read_by_id(self, ids):
+        """Return ``{workload_id: representation}`` for the given ids."""
+        result = {}
+        for batch in batched(list(ids)):
+            for workload in self.read(Workload.objects.filter(id__in=batch)):
+                result[workload["id"]] = workload
+        return result
+
+    async def aread_by_id(self, ids):
+        """Async ORM version of :meth:`read_by_id`."""
+        result = {}
+        for batch in batched(list(ids)):
+            for workload in await self.aread(Workload.objects.filter(id__in=batch)):
+                result[workload["id"]] = workload
+        return result
+
+    @staticmethod
+    def mount_points(workload_ids):
+        """Return ``{workload_id: [mount point representation]}`` in model order."""
+        grouped = {}
+        for batch in batched(workload_ids):
+            _group_mount_points(grouped, _mount_point_rows(batch))
+        return grouped
+
+    @staticmethod
+    async def amount_points(workload_ids):
+        """Async ORM version of :meth:`mount_points`."""
+        grouped = {}
+        for batch in batched(workload_ids):
+            _group_mount_points(grouped, [row async for row in _mount_point_rows(batch)])
+        return grouped
+
+
+def _mount_point_rows(workload_ids):
+    return MountPoint.objects.filter(workload_id__in=workload_ids).values_list("workload_id", "id", "name", "size_gb")
+
+
+def _group_mount_points(grouped, rows):
+    for workload_id, mount_point_id, name, size_gb in rows:
+        grouped.setdefault(workload_id, []).append({"id": mount_point_id, "name": name, "size_gb": size_gb})
@@ -0,0 +1,59 @@
+"""Contract tests: the values-based readers must match the serializers byte for byte."""
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from apps.common.renderers import ORJSONRenderer
+from apps.workloads.models import Credentials, MountPoint, Workload
+from apps.workloads.readers import WorkloadReader
+from apps.workloads.serializers import WorkloadSerializer
+from apps.workloads.views import WorkloadViewSet
+
+
+class WorkloadReaderContractTests(TestCase):
+    """Test suite for WorkloadReader."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create workloads covering shared credentials, IPv6 and empty relations."""
+        corp = Credentials.objects.create(username="admin", password="password", domain="CORP")
+        local = Credentials.objects.create(username="root", password="password")
+        db = Workload.objects.create(name="Database ü", ip_address="10.0.0.1", credentials=corp)
+        for name, size_gb in (("C:\\", 100), ("D:\\", 2000), ("E:\\", 1)):
+            MountPoint.objects.create(workload=db, name=name, size_gb=size_gb)
+        Workload.objects.create(name="Web", ip_address="2001:db8::1", credentials=corp)
+        web = Workload.objects.create(name="Cache", ip_address="10.0.0.3", credentials=local)
+        MountPoint.objects.create(workload=web, name="/var", size_gb=50)
+        cls.user = User.objects.create_user("api", password="password")
+
+    def test_reader_matches_serializer(self):
+        queryset = WorkloadViewSet.queryset.all()
+        expected = JSONRenderer().render(WorkloadSerializer(queryset, many=True).data)
+        self.assertEqual(JSONRenderer().render(WorkloadReader().read(queryset)), expected)
+        self.assertEqual(ORJSONRenderer().render(WorkloadReader(native_values=True).read(queryset)), expected)
+
+    def test_reader_matches_serializer_in_other_timezones(self):
+        queryset = WorkloadViewSet.queryset.all()
+        with timezone.override("America/New_York"):
+            expected = JSONRenderer().render(WorkloadSerializer(queryset, many=True).data)
+            self.assertIn(b"-0", expected)
+            self.assertEqual(JSONRenderer().render(WorkloadReader().read(queryset)), expected)
+            self.assertEqual(ORJSONRenderer().render(WorkloadReader(native_values=True).read(queryset)), expected)
+
+    def test_list_endpoint_output_is_unchanged(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        fast = client.get("/api/v1/workloads/")
+        with override_settings(API_FAST_LIST_ENABLED=False):
+            slow = client.get("/api/v1/workloads/")
+        self.assertEqual(fast.status_code, 200)
+        self.assertEqual(fast.content, slow.content)
+
+    def test_list_runs_constant_number_of_queries(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        client.get("/api/v1/workloads/")  # Load the user and content types.
+        with self.assertNumQueries(2):  # Workloads joined with credentials, then mount points.
+            client.get("/api/v1/workloads/")
@@ -6,7 +6,10 @@ Workload and Credentials resources, linking them to the appropriate
 serializers and models.
 """
 from rest_framework import viewsets, permissions
+from apps.common.exports import ExportMixin
+from apps.common.readers import FastListMixin
 from .models import Credentials, Workload
+from .readers import WorkloadReader
 from .serializers import CredentialsSerializer, WorkloadSerializer
 
 
@@ -20,7 +23,7 @@ class CredentialsViewSet(viewsets.ModelViewSet):
     # permission_classes = [permissions.IsAdminUser]
 
 
-class WorkloadViewSet(viewsets.ModelViewSet):
+class WorkloadViewSet(ExportMixin, FastListMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows workloads to be viewed or edited.
     
@@ -28,6 +31,19 @@ class WorkloadViewSet(viewsets.ModelViewSet):
     creation and updates of their associated MountPoints.
     """
     serializer_class = WorkloadSerializer
+    # Lists and exports are built from .values() rows (see apps.common.readers).
+    reader_class = WorkloadReader
+    export_columns = (
+        'id',
+        'name',
+        'ip_address',
+        'credentials_details.id',
+        'credentials_details.username',
+        'credentials_details.domain',
+        'mount_points',
+        'created_at',
+        'updated_at',
+    )
     # queryset is optimized to prevent N+1 query problems by pre-fetching
     # related objects that will be used by the serializer.
     queryset = Workload.objects.all().select_related(
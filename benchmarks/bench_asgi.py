@@ -0,0 +1,198 @@
+"""
+Concurrent-connection capacity of the WSGI and ASGI deployments.
+
+A small fleet is generated in a throwaway database and served by gunicorn
+twice, each time with ``BENCH_SERVER_WORKERS`` workers: once with sync
+workers (``config.wsgi``, the DRF migration detail) and once with uvicorn
+workers (``config.asgi``, the async detail and status views). For each
+``BENCH_CONCURRENCY`` level, that many clients request the endpoint in a
+loop for ``BENCH_DURATION`` seconds. The benchmark records throughput,
+latency percentiles and failed requests.
+
+Each level is run twice. Fast clients send their requests at once, so both
+deployments are bound by CPU. Slow clients pause ``BENCH_CLIENT_DELAY``
+seconds before finishing the request headers, as clients on slow links or
+polling through proxies do. A sync worker is blocked for that time, while an
+ASGI worker keeps serving other connections.
+
+Requires gunicorn and uvicorn (``pip install gunicorn uvicorn``).
+
+Environment:
+    BENCH_CONCURRENCY: Comma-separated concurrent clients (default ``10,100,500``).
+    BENCH_DURATION: Seconds of load per level (default ``5``).
+    BENCH_CLIENT_DELAY: Pause of the slow clients in seconds (default ``0.1``).
+    BENCH_SERVER_WORKERS: Server worker processes (default ``2``).
+    BENCH_SERVER_DATABASE_URL: Database shared with the servers (default: a temporary SQLite file).
+"""
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("gunicorn")
+pytest.importorskip("uvicorn")
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CONCURRENCY = [int(level) for level in os.environ.get("BENCH_CONCURRENCY", "10,100,500").split(",")]
+DURATION = float(os.environ.get("BENCH_DURATION", "5"))
+CLIENT_DELAY = float(os.environ.get("BENCH_CLIENT_DELAY", "0.1"))
+WORKERS = int(os.environ.get("BENCH_SERVER_WORKERS", "2"))
+REQUEST_TIMEOUT = 30
+FLEET_SIZE = 1000
+
+# Runs in a child interpreter against the server database: prints a migration id and an access token.
+_FIXTURE_SCRIPT = """
+import json
+from django.contrib.auth import get_user_model
+from apps.common.authentication import TokenObtainPairSerializer
+from apps.migration_manager.models import Migration
+user, _ = get_user_model().objects.get_or_create(username="bench-asgi")
+print(json.dumps({
+    "migration": str(Migration.objects.order_by("created_at").values_list("id", flat=True).first()),
+    "token": str(TokenObtainPairSerializer.get_token(user).access_token),
+}))
+"""
+
+DEPLOYMENTS = {
+    "wsgi": ("config.wsgi:application", "sync", "/api/v1/migrations/{migration}/"),
+    "asgi": ("config.asgi:application", "uvicorn.workers.UvicornWorker", "/api/v1/async/migrations/{migration}/"),
+    "asgi_status": (
+        "config.asgi:application",
+        "uvicorn.workers.UvicornWorker",
+        "/api/v1/async/migrations/{migration}/status/",
+    ),
+}
+
+
+def _manage(env, *args):
+    return subprocess.run(
+        [sys.executable, "manage.py", *args], cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with status {process.returncode}.")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server did not start listening on port {port}.")
+
+
+@pytest.fixture(scope="module")
+def server_env(tmp_path_factory):
+    """Environment for the servers, pointing at a migrated and populated database."""
+    database_url = os.environ.get("BENCH_SERVER_DATABASE_URL")
+    if not database_url:
+        database_url = f"sqlite:///{tmp_path_factory.mktemp('asgi') / 'bench.sqlite3'}"
+    env = {**os.environ, "DATABASE_URL": database_url, "DEBUG": "False", "ALLOWED_HOSTS": "127.0.0.1"}
+    _manage(env, "migrate", "--noinput")
+    _manage(env, "generate_fleet", "--workloads", str(FLEET_SIZE), "--network", "10.210.0.0/16")
+    return env, json.loads(_manage(env, "shell", "-c", _FIXTURE_SCRIPT))
+
+
+async def _client(port, request, delay, deadline, latencies, failures):
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection("127.0.0.1", port), REQUEST_TIMEOUT)
+            if delay:
+                writer.write(request[:-2])
+                await writer.drain()
+                await asyncio.sleep(delay)
+                writer.write(request[-2:])
+            else:
+                writer.write(request)
+            await writer.drain()
+            response = await asyncio.wait_for(reader.read(), REQUEST_TIMEOUT)
+            writer.close()
+        except (OSError, asyncio.TimeoutError):
+            failures.append(time.perf_counter() - start)
+            continue
+        if response.startswith(b"HTTP/1.1 200"):
+            latencies.append(time.perf_counter() - start)
+        else:
+            failures.append(time.perf_counter() - start)
+
+
+async def _load(port, path, token, concurrency, delay=0):
+    request = (
+        f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nAuthorization: Bearer {token}\r\nConnection: close\r\n\r\n"
+    ).encode()
+    latencies, failures = [], []
+    deadline = time.monotonic() + DURATION
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(port, request, delay, deadline, latencies, failures) for _ in range(concurrency)))
+    return latencies, failures, time.perf_counter() - start
+
+
+def _percentile(values, fraction):
+    if not values:
+        return None
+    return sorted(values)[min(len(values) - 1, int(len(values) * fraction))]
+
+
+@pytest.mark.parametrize("deployment", DEPLOYMENTS)
+def test_concurrent_capacity(bench, server_env, deployment):
+    """Serve ``CONCURRENCY`` parallel clients from each deployment."""
+    env, fixtures = server_env
+    application, worker_class, path = DEPLOYMENTS[deployment]
+    port = _free_port()
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "gunicorn", application,
+            "--workers", str(WORKERS),
+            "--worker-class", worker_class,
+            "--bind", f"127.0.0.1:{port}",
+            "--backlog", "4096",
+            "--log-level", "warning",
+        ],
+        cwd=PROJECT_ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_for_port(port, server)
+        path = path.format(**fixtures)
+        asyncio.run(_load(port, path, fixtures["token"], 1))  # Warm up every worker's connections.
+        for delay, concurrency in ((delay, level) for delay in (0, CLIENT_DELAY) for level in CONCURRENCY):
+            latencies, failures, elapsed = asyncio.run(_load(port, path, fixtures["token"], concurrency, delay))
+            bench.record(
+                "concurrent_capacity",
+                params={
+                    "deployment": deployment,
+                    "concurrency": concurrency,
+                    "client_delay_s": delay,
+                    "workers": WORKERS,
+                },
+                requests=len(latencies),
+                failures=len(failures),
+                requests_per_s=len(latencies) / elapsed,
+                median_s=statistics.median(latencies) if latencies else None,
+                p99_s=_percentile(latencies, 0.99),
+            )
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+            server.wait()
@@ -0,0 +1,61 @@
+"""
+Query counts per API endpoint.
+
+Each list endpoint is measured at two collection sizes; a count that grows
+with the size of the collection is an N+1 query pattern.
+"""
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.migration_manager.models import Migration
+
+from .fleet import build_migrations, build_workloads
+
+pytestmark = pytest.mark.django_db
+
+COLLECTION_SIZES = (10, 50)
+
+LIST_ENDPOINTS = (
+    "/api/v1/credentials/",
+    "/api/v1/workloads/",
+    "/api/v1/migration-targets/",
+    "/api/v1/migrations/",
+)
+
+
+@pytest.fixture
+def api_client():
+    client = APIClient()
+    client.force_authenticate(get_user_model().objects.create_user(username="bench", password="bench-password"))
+    return client
+
+
+def _count_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200, response.content
+    return len(queries)
+
+
+@pytest.mark.parametrize("size", COLLECTION_SIZES)
+def test_endpoint_query_counts(bench, api_client, size):
+    """Record the number of queries each endpoint runs for ``size`` migrations."""
+    sources = build_workloads(size, network="10.251.0.0/16", name_prefix="bench-endpoint")
+    migration = build_migrations(sources, network="172.30.0.0/16")[0]
+    source = migration.source
+    target = migration.target
+
+    detail_endpoints = (
+        f"/api/v1/credentials/{source.credentials_id}/",
+        f"/api/v1/workloads/{source.id}/",
+        f"/api/v1/migration-targets/{target.id}/",
+        f"/api/v1/migrations/{migration.id}/",
+    )
+    for url in LIST_ENDPOINTS + detail_endpoints:
+        endpoint = url.replace(str(source.credentials_id), "{id}").replace(str(source.id), "{id}")
+        endpoint = endpoint.replace(str(target.id), "{id}").replace(str(migration.id), "{id}")
+        bench.record(f"queries GET {endpoint}", params={"size": size}, queries=_count_queries(api_client, url))
+    assert Migration.objects.count() == size
@@ -0,0 +1,46 @@
+"""
+Benchmarks for the streaming export endpoints.
+
+The benchmark fleet is exported in full while ``tracemalloc`` tracks Python
+allocations. It records the peak after the first chunk and after the last
+one; if the second is much larger, the stream is buffering rows.
+"""
+import tracemalloc
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def api_client():
+    client = APIClient()
+    client.force_authenticate(get_user_model().objects.create_user(username="bench", password="bench-password"))
+    return client
+
+
+@pytest.mark.parametrize("export_format", ("ndjson", "csv"))
+def test_workload_export(bench, fleet, api_client, export_format):
+    """Stream every workload of the benchmark fleet."""
+    size = len(fleet)
+    peaks = {}
+
+    def export():
+        response = api_client.get("/api/v1/workloads/export/", {"format": export_format})
+        total = 0
+        tracemalloc.start()
+        try:
+            for part in response.streaming_content:
+                total += len(part)
+                peaks.setdefault("first_chunk_peak_mb", tracemalloc.get_traced_memory()[1] / 2**20)
+            peaks["peak_mb"] = tracemalloc.get_traced_memory()[1] / 2**20
+        finally:
+            tracemalloc.stop()
+        return total
+
+    exported_bytes = bench("workload_export", export, rounds=1, size=size, format=export_format)
+    bench.record(
+        "workload_export_memory", params={"size": size, "format": export_format}, bytes=exported_bytes, **peaks
+    )
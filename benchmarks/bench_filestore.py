@@ -0,0 +1,126 @@
+"""
+Cold-start benchmarks for the file-backed store.
+
+Each size is written once as a plain record log and once as a snapshot. A
+fresh interpreter then opens the store and serves one IP lookup. Startup time
+and peak RSS are measured in that child process, so earlier benchmarks do not
+affect them. The RSS probe reads ``/proc`` and needs Linux.
+"""
+import ipaddress
+import json
+import shutil
+import statistics
+import subprocess
+import sys
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from apps.filestore import FileStore
+
+from .conftest import BENCH_ROUNDS, BENCH_SIZES
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+BATCH_SIZE = 1000
+NEVER = 10**12
+
+# Runs in the child interpreter: argv is the store directory and the IP to look up.
+_STARTUP_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from apps.filestore import FileStore
+imported = time.perf_counter()
+store = FileStore(sys.argv[1], sync_interval=0, compact_min_entries=10**12)
+store.workloads.get_by_ip(sys.argv[2])
+ready = time.perf_counter()
+# VmHWM is the peak RSS of this process image; unlike ru_maxrss it is not inherited across exec.
+with open("/proc/self/status") as f:
+    peak_kb = next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+print(json.dumps({
+    "open_s": ready - imported,
+    "total_s": ready - start,
+    "peak_rss_mb": peak_kb / 1024,
+}))
+"""
+
+
+def _populate(directory, size):
+    """Write ``size`` workloads with two mount points each, bypassing validation."""
+    now = datetime.now(timezone.utc).isoformat()
+    network = ipaddress.ip_network("10.0.0.0/8")
+    stamp = {"created_at": now, "updated_at": now}
+    with FileStore(directory, sync_interval=0, compact_min_entries=NEVER) as store:
+        credentials = store.credentials.create(username="bench", password="bench-password")
+        for start in range(0, size, BATCH_SIZE):
+            operations = []
+            for index in range(start, min(start + BATCH_SIZE, size)):
+                workload_id = str(uuid.uuid4())
+                operations.append(
+                    (
+                        "put",
+                        "workloads",
+                        {
+                            "id": workload_id,
+                            "name": f"srv-{index:07d}",
+                            "ip_address": str(network[index + 1]),
+                            "credentials_id": credentials["id"],
+                            **stamp,
+                        },
+                    )
+                )
+                for name, size_gb in (("C:\\", 120), ("D:\\", 500)):
+                    operations.append(
+                        (
+                            "put",
+                            "mount_points",
+                            {"id": str(uuid.uuid4()), "workload_id": workload_id, "name": name, "size_gb": size_gb, **stamp},
+                        )
+                    )
+            store.commit(operations)
+
+
+def _probe(directory, ip_address):
+    completed = subprocess.run(
+        [sys.executable, "-c", _STARTUP_PROBE, str(directory), ip_address],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout)
+
+
+@pytest.fixture(scope="module")
+def store_directories(tmp_path_factory):
+    """``{size: {"log": dir, "snapshot": dir}}`` for every configured size."""
+    directories = {}
+    for size in BENCH_SIZES:
+        log_dir = tmp_path_factory.mktemp(f"filestore-log-{size}")
+        _populate(log_dir, size)
+        snapshot_dir = tmp_path_factory.mktemp(f"filestore-snapshot-{size}")
+        shutil.copytree(log_dir, snapshot_dir, dirs_exist_ok=True)
+        with FileStore(snapshot_dir, sync_interval=0, compact_min_entries=NEVER) as store:
+            store.compact()
+        directories[size] = {"log": log_dir, "snapshot": snapshot_dir}
+    return directories
+
+
+@pytest.mark.parametrize("mode", ("log", "snapshot"))
+@pytest.mark.parametrize("size", BENCH_SIZES)
+def test_cold_start(bench, store_directories, size, mode):
+    """Open the store in a fresh process and serve the first lookup."""
+    directory = store_directories[size][mode]
+    last_ip = str(ipaddress.ip_network("10.0.0.0/8")[size])
+    probes = [_probe(directory, last_ip) for _ in range(BENCH_ROUNDS)]
+
+    bench.record(
+        "filestore_cold_start",
+        params={"workloads": size, "mode": mode},
+        rounds=len(probes),
+        median_s=statistics.median(probe["open_s"] for probe in probes),
+        min_s=min(probe["open_s"] for probe in probes),
+        total_median_s=statistics.median(probe["total_s"] for probe in probes),
+        peak_rss_mb=max(probe["peak_rss_mb"] for probe in probes),
+    )
@@ -0,0 +1,62 @@
+"""Benchmarks for nested create and update of mount points through the serializer."""
+import pytest
+
+from apps.workloads.models import Credentials
+from apps.workloads.serializers import WorkloadSerializer
+
+pytestmark = pytest.mark.django_db
+
+MOUNT_POINT_COUNTS = (10, 100)
+
+
+def _mount_points(count, size_gb=100):
+    return [{"name": f"/mnt/volume-{i}", "size_gb": size_gb} for i in range(count)]
+
+
+@pytest.mark.parametrize("count", MOUNT_POINT_COUNTS)
+def test_create_workload_with_mount_points(bench, count):
+    """Create a workload with ``count`` nested mount points."""
+    credentials = Credentials.objects.create(username="bench", password="bench-password")
+    counter = iter(range(1_000_000))
+
+    def create():
+        serializer = WorkloadSerializer(
+            data={
+                "name": "bench-create",
+                "ip_address": f"192.0.{next(counter)}.1",
+                "credentials": str(credentials.id),
+                "mount_points": _mount_points(count),
+            }
+        )
+        serializer.is_valid(raise_exception=True)
+        return serializer.save()
+
+    workload = bench("workload_create_nested", create, mount_points=count)
+    assert workload.mount_points.count() == count
+
+
+@pytest.mark.parametrize("count", MOUNT_POINT_COUNTS)
+def test_update_workload_mount_points(bench, count):
+    """Replace the ``count`` nested mount points of an existing workload."""
+    credentials = Credentials.objects.create(username="bench", password="bench-password")
+    serializer = WorkloadSerializer(
+        data={
+            "name": "bench-update",
+            "ip_address": "192.0.2.1",
+            "credentials": str(credentials.id),
+            "mount_points": _mount_points(count),
+        }
+    )
+    serializer.is_valid(raise_exception=True)
+    workload = serializer.save()
+    sizes = iter(range(1, 1_000_000))
+
+    def update():
+        serializer = WorkloadSerializer(
+            workload, data={"mount_points": _mount_points(count, size_gb=next(sizes))}, partial=True
+        )
+        serializer.is_valid(raise_exception=True)
+        return serializer.save()
+
+    bench("workload_update_nested", update, mount_points=count)
+    assert workload.mount_points.count() == count
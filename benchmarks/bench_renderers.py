@@ -0,0 +1,107 @@
+"""
+Benchmarks for the JSON renderers and parsers.
+
+The payloads have the shape of ``WorkloadSerializer`` list output, either as
+the serializer emits it (UUIDs and datetimes already converted to strings) or
+with native ``uuid.UUID`` and ``datetime`` values, as a values-based read path
+hands them to the renderer.
+"""
+import io
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from apps.common.renderers import NDJSONRenderer, ORJSONParser, ORJSONRenderer
+
+from .conftest import BENCH_ROUNDS, BENCH_SEED, BENCH_SIZES
+
+RENDERERS = {"drf": JSONRenderer, "orjson": ORJSONRenderer, "ndjson": NDJSONRenderer}
+PARSERS = {"drf": JSONParser, "orjson": ORJSONParser}
+
+
+def _payload(size, native):
+    rng = random.Random(BENCH_SEED)
+    epoch = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def uid():
+        value = uuid.UUID(int=rng.getrandbits(128), version=4)
+        return value if native else str(value)
+
+    def timestamp():
+        value = epoch + timedelta(seconds=rng.randrange(10**7), microseconds=rng.randrange(10**6))
+        return value if native else value.isoformat().replace("+00:00", "Z")
+
+    credentials = {
+        "id": uid(),
+        "username": "svc_fleet_00001",
+        "domain": "FLEET",
+        "created_at": timestamp(),
+        "updated_at": timestamp(),
+    }
+    return [
+        {
+            "id": uid(),
+            "name": f"srv-{index:07d}",
+            "ip_address": f"10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}",
+            "credentials_details": credentials,
+            "mount_points": [
+                {"id": uid(), "name": name, "size_gb": rng.randint(1, 2000)} for name in ("C:\\", "D:\\")[: rng.randint(1, 2)]
+            ],
+            "created_at": timestamp(),
+            "updated_at": timestamp(),
+        }
+        for index in range(size)
+    ]
+
+
+def _rounds_for(size):
+    return max(1, min(BENCH_ROUNDS, 100_000 // size))
+
+
+@pytest.mark.parametrize("renderer", RENDERERS)
+@pytest.mark.parametrize("size", BENCH_SIZES)
+def test_render_serialized_list(bench, size, renderer):
+    """Render serializer-shaped output (all values already strings)."""
+    data = _payload(size, native=False)
+    rendered = bench(
+        "render_serialized_list",
+        lambda: RENDERERS[renderer]().render(data, "application/json"),
+        rounds=_rounds_for(size),
+        size=size,
+        renderer=renderer,
+    )
+    assert rendered
+
+
+@pytest.mark.parametrize("renderer", RENDERERS)
+@pytest.mark.parametrize("size", BENCH_SIZES)
+def test_render_native_list(bench, size, renderer):
+    """Render rows holding native UUIDs and datetimes."""
+    data = _payload(size, native=True)
+    rendered = bench(
+        "render_native_list",
+        lambda: RENDERERS[renderer]().render(data, "application/json"),
+        rounds=_rounds_for(size),
+        size=size,
+        renderer=renderer,
+    )
+    assert rendered
+
+
+@pytest.mark.parametrize("parser", PARSERS)
+@pytest.mark.parametrize("size", BENCH_SIZES)
+def test_parse_list(bench, size, parser):
+    """Parse a JSON array body of ``size`` workloads."""
+    body = ORJSONRenderer().render(_payload(size, native=False))
+    parsed = bench(
+        "parse_list",
+        lambda: PARSERS[parser]().parse(io.BytesIO(body), parser_context={"encoding": "utf-8"}),
+        rounds=_rounds_for(size),
+        size=size,
+        parser=parser,
+    )
+    assert len(parsed) == size
@@ -0,0 +1,80 @@
+"""
+Benchmarks for list serialization of workloads and deeply nested migrations,
+through the DRF serializers and through the values-based readers.
+"""
+import pytest
+
+from apps.migration_manager.readers import MigrationReader
+from apps.migration_manager.serializers import MigrationSerializer
+from apps.migration_manager.views import MigrationViewSet
+from apps.workloads.readers import WorkloadReader
+from apps.workloads.serializers import WorkloadSerializer
+from apps.workloads.views import WorkloadViewSet
+
+from .conftest import BENCH_SIZES, BENCH_ROUNDS
+
+pytestmark = pytest.mark.django_db
+
+
+def _rounds_for(size):
+    # Keep the 100k-row runs to a single round.
+    return max(1, min(BENCH_ROUNDS, 10_000 // size))
+
+
+@pytest.mark.parametrize("size", BENCH_SIZES)
+def test_workload_list_serialization(bench, fleet, size):
+    """Fetch and serialize ``size`` workloads with the list-endpoint queryset."""
+    queryset = WorkloadViewSet.queryset.filter(name__startswith="bench-source-")
+
+    def fetch():
+        return list(queryset[:size])
+
+    workloads = bench("workload_list_fetch", fetch, rounds=_rounds_for(size), size=size)
+    data = bench(
+        "workload_list_serialize",
+        lambda: WorkloadSerializer(workloads, many=True).data,
+        rounds=_rounds_for(size),
+        size=size,
+    )
+    assert len(data) == size
+
+
+def test_migration_nested_serialization(bench, migration_fleet):
+    """Serialize migrations, including source, target and target VM details."""
+    size = len(migration_fleet)
+    queryset = MigrationViewSet.queryset.all()
+
+    data = bench(
+        "migration_list_fetch_and_serialize",
+        lambda: MigrationSerializer(list(queryset), many=True).data,
+        rounds=_rounds_for(size),
+        size=size,
+    )
+    assert len(data) == size
+
+
+@pytest.mark.parametrize("native", (False, True), ids=("strings", "native"))
+@pytest.mark.parametrize("size", BENCH_SIZES)
+def test_workload_list_reader(bench, fleet, size, native):
+    """Fetch and build ``size`` workload representations with WorkloadReader."""
+    queryset = WorkloadViewSet.queryset.filter(name__startswith="bench-source-")[:size]
+    data = bench(
+        "workload_list_reader",
+        lambda: WorkloadReader(native_values=native).read(queryset),
+        rounds=_rounds_for(size),
+        size=size,
+        native=native,
+    )
+    assert len(data) == size
+
+
+def test_migration_list_reader(bench, migration_fleet):
+    """Fetch and build nested migration representations with MigrationReader."""
+    size = len(migration_fleet)
+    data = bench(
+        "migration_list_reader",
+        lambda: MigrationReader().read(MigrationViewSet.queryset.all()),
+        rounds=_rounds_for(size),
+        size=size,
+    )
+    assert len(data) == size
@@ -0,0 +1,36 @@
+"""Throughput benchmark for the migration service with the simulation disabled."""
+import time
+
+import pytest
+
+from apps.migration_manager import services
+from apps.migration_manager.models import Migration
+
+from .fleet import build_migrations, build_workloads
+
+pytestmark = pytest.mark.django_db
+
+MIGRATION_COUNT = 200
+
+
+def test_run_migration_logic_throughput(bench, settings):
+    """Run ``MIGRATION_COUNT`` migrations back to back and report migrations/s."""
+    sources = build_workloads(MIGRATION_COUNT, network="10.250.0.0/16", name_prefix="bench-throughput")
+    migration_ids = [migration.id for migration in build_migrations(sources, network="172.31.0.0/16")]
+    migrations = list(Migration.objects.filter(id__in=migration_ids))
+
+    settings.SIMULATION_TIME_SCALE = 0
+    # Progress stays in this process, as without a Redis server.
+    settings.PROGRESS_REDIS_URL = ""
+    start = time.perf_counter()
+    for migration in migrations:
+        services.run_migration_logic(migration)
+    elapsed = time.perf_counter() - start
+
+    bench.record(
+        "run_migration_logic_throughput",
+        params={"migrations": MIGRATION_COUNT},
+        seconds=elapsed,
+        migrations_per_s=MIGRATION_COUNT / elapsed,
+    )
+    assert not Migration.objects.filter(id__in=migration_ids).exclude(state=Migration.MigrationState.SUCCESS).exists()
@@ -0,0 +1,64 @@
+"""
+Compare two benchmark result files and flag regressions.
+
+Usage:
+    python -m benchmarks.compare BASELINE.json CANDIDATE.json [--threshold 0.10]
+
+Timings are compared by median and peak memory by its maximum; query counts
+must not grow. The exit status
+is 1 when any benchmark regressed beyond the threshold, so the command can
+gate CI.
+"""
+import argparse
+import json
+import sys
+
+
+def _key(result):
+    params = ",".join(f"{k}={v}" for k, v in sorted(result.get("params", {}).items()))
+    return f"{result['group']}::{result['name']}[{params}]"
+
+
+def _load(path):
+    with open(path) as f:
+        return {_key(result): result for result in json.load(f)["results"]}
+
+
+def compare(baseline, candidate, threshold):
+    """
+    Yield ``(key, metric, old, new, regressed)`` for every shared measurement.
+    """
+    for key in sorted(baseline.keys() & candidate.keys()):
+        old, new = baseline[key], candidate[key]
+        if "median_s" in old and "median_s" in new:
+            yield key, "median_s", old["median_s"], new["median_s"], new["median_s"] > old["median_s"] * (1 + threshold)
+        if "queries" in old and "queries" in new:
+            yield key, "queries", old["queries"], new["queries"], new["queries"] > old["queries"]
+        if "migrations_per_s" in old and "migrations_per_s" in new:
+            regressed = new["migrations_per_s"] < old["migrations_per_s"] * (1 - threshold)
+            yield key, "migrations_per_s", old["migrations_per_s"], new["migrations_per_s"], regressed
+        if "peak_rss_mb" in old and "peak_rss_mb" in new:
+            regressed = new["peak_rss_mb"] > old["peak_rss_mb"] * (1 + threshold)
+            yield key, "peak_rss_mb", old["peak_rss_mb"], new["peak_rss_mb"], regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed relative slowdown (default 0.10).")
+    args = parser.parse_args(argv)
+
+    regressions = 0
+    for key, metric, old, new, regressed in compare(_load(args.baseline), _load(args.candidate), args.threshold):
+        change = (new - old) / old * 100 if old else 0.0
+        marker = "REGRESSION" if regressed else ""
+        regressions += regressed
+        print(f"{key:<80} {metric:<17} {old:>12.4f} -> {new:>12.4f} ({change:+7.1f}%) {marker}")
+
+    print(f"\n{regressions} regression(s) beyond {args.threshold:.0%}.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""
+Shared fixtures for the benchmark suite.
+
+Run with ``python -m pytest benchmarks`` against the database configured by
+``DATABASE_URL`` (SQLite by default, Postgres recommended). Every benchmark
+records its timings through the ``bench`` fixture; at the end of the session
+the results are written as JSON to ``BENCHMARK_OUTPUT`` (default:
+``benchmarks/results/<timestamp>-<commit>.json``) so that two runs can be
+compared with ``python -m benchmarks.compare``.
+
+Environment:
+    BENCH_SIZES: Comma-separated list sizes (default ``1000,10000,100000``).
+    BENCH_ROUNDS: Maximum timed rounds per benchmark (default ``5``).
+    BENCH_SEED: Seed for the generated data (default ``0``).
+"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from pathlib import Path
+
+import django
+import pytest
+from django.db import connection, connections, transaction
+
+from .fleet import build_migrations, build_workloads
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+BENCH_SIZES = [int(size) for size in os.environ.get("BENCH_SIZES", "1000,10000,100000").split(",")]
+BENCH_ROUNDS = int(os.environ.get("BENCH_ROUNDS", "5"))
+BENCH_SEED = int(os.environ.get("BENCH_SEED", "0"))
+
+_results = []
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+class _QueryCounter:
+    """Execute wrapper counting queries without the 9000-entry query log limit."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Benchmark:
+    """Times a callable over several rounds and records the result."""
+
+    def __init__(self, group):
+        self.group = group
+
+    def __call__(self, name, func, rounds=None, warmup=0, **params):
+        """
+        Run ``func`` ``warmup`` times untimed, then ``rounds`` times timed.
+
+        The queries issued by the last round are counted. Extra keyword
+        arguments are stored with the result as benchmark parameters.
+
+        Returns:
+            The return value of the last timed call.
+        """
+        rounds = rounds or BENCH_ROUNDS
+        for _ in range(warmup):
+            func()
+
+        timings = []
+        result = None
+        for _ in range(rounds):
+            queries = _QueryCounter()
+            with connection.execute_wrapper(queries):
+                start = time.perf_counter()
+                result = func()
+                timings.append(time.perf_counter() - start)
+
+        _results.append(
+            {
+                "group": self.group,
+                "name": name,
+                "params": params,
+                "rounds": rounds,
+                "min_s": min(timings),
+                "median_s": statistics.median(timings),
+                "mean_s": statistics.fmean(timings),
+                "max_s": max(timings),
+                "queries": queries.count,
+            }
+        )
+        return result
+
+    def record(self, name, **values):
+        """Record a non-timing measurement (e.g. a query count or throughput)."""
+        _results.append({"group": self.group, "name": name, "params": {}, **values})
+
+
+@pytest.fixture
+def bench(request):
+    """A :class:`Benchmark` grouped under the requesting module's name."""
+    return Benchmark(group=request.module.__name__.rsplit(".", 1)[-1])
+
+
+@pytest.fixture(scope="module")
+def fleet(django_db_setup, django_db_blocker):
+    """
+    Source workloads for the largest configured size, created once per module.
+
+    Tests slice the first ``size`` workloads from it. The data is rolled back
+    when the module finishes so it cannot skew other benchmarks.
+    """
+    with django_db_blocker.unblock(), transaction.atomic():
+        yield build_workloads(max(BENCH_SIZES), seed=BENCH_SEED)
+        transaction.set_rollback(True)
+
+
+@pytest.fixture(scope="module")
+def migration_fleet(django_db_setup, django_db_blocker):
+    """One migration per source workload for a 1000-workload fleet, rolled back per module."""
+    with django_db_blocker.unblock(), transaction.atomic():
+        sources = build_workloads(1000, seed=BENCH_SEED, network="10.200.0.0/16", name_prefix="bench-migration")
+        yield build_migrations(sources, seed=BENCH_SEED)
+        transaction.set_rollback(True)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not _results:
+        return
+    output = os.environ.get("BENCHMARK_OUTPUT")
+    commit = _git_commit()
+    if output:
+        path = Path(output)
+    else:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        path = RESULTS_DIR / f"{time.strftime('%Y%m%dT%H%M%S')}-{commit}.json"
+
+    document = {
+        "commit": commit,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "database": connections["default"].vendor,
+        "sizes": BENCH_SIZES,
+        "seed": BENCH_SEED,
+        "results": _results,
+    }
+    path.write_text(json.dumps(document, indent=2))
+    session.config.pluginmanager.get_plugin("terminalreporter").write_line(f"Benchmark results written to {path}")
@@ -0,0 +1,100 @@
+"""
+Deterministic test-data builders shared by the benchmark modules.
+
+Rows are inserted with ``bulk_create`` so that building a 100k-workload fleet
+takes seconds rather than minutes, and the content depends only on the seed.
+"""
+import ipaddress
+import random
+
+from apps.migration_manager.models import Migration, MigrationTarget
+from apps.workloads.models import Credentials, MountPoint, Workload
+
+BATCH_SIZE = 2000
+EXTRA_VOLUME_NAMES = ("D:\\", "E:\\", "F:\\", "G:\\")
+
+
+def _ip(network, index):
+    return str(network[index + 1])
+
+
+def build_workloads(count, seed=0, network="10.0.0.0/8", name_prefix="bench-source"):
+    """
+    Create ``count`` workloads, each with a C:\\ volume and up to four more.
+
+    Returns:
+        list[Workload]: The created workloads, in creation order.
+    """
+    rng = random.Random(seed)
+    network = ipaddress.ip_network(network)
+    credentials = Credentials.objects.create(username=f"{name_prefix}-user", password="bench-password")
+
+    workloads = Workload.objects.bulk_create(
+        [
+            Workload(name=f"{name_prefix}-{i}", ip_address=_ip(network, i), credentials=credentials)
+            for i in range(count)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+    mount_points = []
+    for workload in workloads:
+        mount_points.append(MountPoint(workload=workload, name="C:\\", size_gb=rng.randint(60, 250)))
+        for name in EXTRA_VOLUME_NAMES[: rng.randint(0, len(EXTRA_VOLUME_NAMES))]:
+            mount_points.append(MountPoint(workload=workload, name=name, size_gb=rng.randint(10, 4000)))
+        if len(mount_points) >= BATCH_SIZE:
+            MountPoint.objects.bulk_create(mount_points)
+            mount_points = []
+    MountPoint.objects.bulk_create(mount_points)
+    return workloads
+
+
+def build_migrations(sources, seed=0, network="172.16.0.0/12"):
+    """
+    Create one migration (with its own target VM) per source workload.
+
+    Every migration selects the source's C:\\ volume plus a random subset of
+    the remaining volumes, so it passes the service pre-flight checks.
+
+    Returns:
+        list[Migration]: The created migrations, all in the NOT_STARTED state.
+    """
+    rng = random.Random(seed)
+    network = ipaddress.ip_network(network)
+    credentials = Credentials.objects.create(username="bench-target-user", password="bench-password")
+
+    target_vms = Workload.objects.bulk_create(
+        [
+            Workload(name=f"bench-target-{i}", ip_address=_ip(network, i), credentials=credentials)
+            for i in range(len(sources))
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    targets = MigrationTarget.objects.bulk_create(
+        [
+            MigrationTarget(
+                cloud_type=rng.choice(MigrationTarget.CloudType.values),
+                cloud_credentials=credentials,
+                target_vm=target_vm,
+            )
+            for target_vm in target_vms
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    migrations = Migration.objects.bulk_create(
+        [Migration(source=source, target=target) for source, target in zip(sources, targets)],
+        batch_size=BATCH_SIZE,
+    )
+
+    mount_points_by_workload = {}
+    for mount_point in MountPoint.objects.filter(workload__in=sources).only("id", "name", "workload_id"):
+        mount_points_by_workload.setdefault(mount_point.workload_id, []).append(mount_point)
+
+    through = Migration.selected_mount_points.through
+    selections = []
+    for migration in migrations:
+        for mount_point in mount_points_by_workload.get(migration.source_id, []):
+            if mount_point.name == "C:\\" or rng.random() < 0.5:
+                selections.append(through(migration_id=migration.id, mountpoint_id=mount_point.id))
+    through.objects.bulk_create(selections, batch_size=BATCH_SIZE)
+    return migrations
@@ -0,0 +1,134 @@
+"""
+Measure the import cost of the web and worker entry points.
+
+Usage:
+    python -m benchmarks.import_profile [web worker worker-lean] [--top 15] [--output FILE.json]
+
+Each entry point is started in a fresh interpreter under
+``python -X importtime``:
+
+    web          config.wsgi with the URLconf resolved, as a WSGI worker boots.
+    worker       The Celery app with its tasks loaded, using config.settings.
+    worker-lean  The same with config.settings_worker.
+
+The report lists the total import time, the top-level packages and the
+modules that cost the most, by self time (the module's own code) and
+cumulative time (including the modules it imported).
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+_WORKER_SCRIPT = """
+import django
+django.setup()
+from config.celery import app
+app.loader.import_default_modules()
+"""
+
+_WEB_SCRIPT = """
+from config.wsgi import application
+from django.urls import get_resolver
+get_resolver().url_patterns
+"""
+
+ENTRY_POINTS = {
+    "web": ("config.settings", _WEB_SCRIPT),
+    "worker": ("config.settings", _WORKER_SCRIPT),
+    "worker-lean": ("config.settings_worker", _WORKER_SCRIPT),
+}
+
+
+def parse_importtime(stderr):
+    """
+    Return ``[(module, self_us, cumulative_us, depth)]`` from ``-X importtime`` output.
+
+    Depth 0 marks the modules imported directly by the script; their
+    cumulative times add up to the total.
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2 - 1
+        modules.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return modules
+
+
+def profile(entry_point):
+    """Run ``entry_point`` under ``-X importtime`` and return its parsed modules."""
+    settings_module, script = ENTRY_POINTS[entry_point]
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings_module}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def summarise(modules, top):
+    """Return the total, per-package and top-module import times in milliseconds."""
+    packages = defaultdict(int)
+    for name, self_us, _, _ in modules:
+        packages[name.split(".")[0]] += self_us
+    return {
+        "total_ms": sum(cumulative for _, _, cumulative, depth in modules if depth == 0) / 1000,
+        "modules": len(modules),
+        "packages": [
+            {"package": package, "self_ms": self_us / 1000}
+            for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]
+        ],
+        "top_self": [
+            {"module": name, "self_ms": self_us / 1000}
+            for name, self_us, _, _ in sorted(modules, key=lambda module: -module[1])[:top]
+        ],
+        "top_cumulative": [
+            {"module": name, "cumulative_ms": cumulative_us / 1000}
+            for name, _, cumulative_us, _ in sorted(modules, key=lambda module: -module[2])[:top]
+        ],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "entry_points", nargs="*", metavar="ENTRY_POINT", help=f"One of {', '.join(ENTRY_POINTS)} (default: all)."
+    )
+    parser.add_argument("--top", type=int, default=15, help="Packages and modules to list (default 15).")
+    parser.add_argument("--output", help="Also write the report to this JSON file.")
+    args = parser.parse_args(argv)
+    unknown = set(args.entry_points) - ENTRY_POINTS.keys()
+    if unknown:
+        parser.error(f"unknown entry point(s): {', '.join(sorted(unknown))}")
+
+    report = {}
+    for entry_point in args.entry_points or ENTRY_POINTS:
+        summary = report[entry_point] = summarise(profile(entry_point), args.top)
+        print(f"== {entry_point}: {summary['total_ms']:.1f} ms, {summary['modules']} modules")
+        print("  packages (self):")
+        for row in summary["packages"]:
+            print(f"    {row['package']:<60} {row['self_ms']:>9.1f} ms")
+        print("  modules (cumulative):")
+        for row in summary["top_cumulative"]:
+            print(f"    {row['module']:<60} {row['cumulative_ms']:>9.1f} ms")
+        print()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
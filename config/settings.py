@@ -12,6 +12,7 @@ from pathlib import Path
 from decouple import config, Csv
 import dj_database_url
 from datetime import timedelta
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -64,6 +65,12 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Creates the per-request trace id used by logs, spans and Celery tasks.
+    "apps.common.tracing.TraceContextMiddleware",
+    # Opt-in; removes itself from the stack unless PROFILING_ENABLED is set.
+    "apps.common.middleware.RequestProfilingMiddleware",
+    # Routes safe API reads and admin changelists to the read replicas, if any.
+    "apps.common.db_routers.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -78,22 +85,110 @@ ROOT_URLCONF = "config.urls"
 
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
-    # Set JWT as the default authentication mechanism
-    'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-    ),
     # Enforce that all endpoints require authentication by default
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
 }
 
+# --- API Rendering ---
+# "stdlib" uses DRF's JSONRenderer/JSONParser; "orjson" uses the faster
+# apps.common.renderers classes (requires the optional orjson package).
+API_JSON_BACKEND = config("API_JSON_BACKEND", default="stdlib")
+
+# Offer newline-delimited JSON (Accept: application/x-ndjson or ?format=ndjson).
+API_NDJSON_ENABLED = config("API_NDJSON_ENABLED", default=True, cast=bool)
+
+# Serve list endpoints from .values() readers instead of the serializers
+# (see apps.common.readers). The output is identical.
+API_FAST_LIST_ENABLED = config("API_FAST_LIST_ENABLED", default=True, cast=bool)
+
+# Rows fetched and hydrated per chunk by the streaming /export/ endpoints.
+API_EXPORT_CHUNK_SIZE = config("API_EXPORT_CHUNK_SIZE", default=2000, cast=int)
+
+if API_JSON_BACKEND == "orjson":
+    _json_renderer, _json_parser = "apps.common.renderers.ORJSONRenderer", "apps.common.renderers.ORJSONParser"
+elif API_JSON_BACKEND == "stdlib":
+    _json_renderer, _json_parser = "rest_framework.renderers.JSONRenderer", "rest_framework.parsers.JSONParser"
+else:
+    raise ImproperlyConfigured(f"API_JSON_BACKEND must be 'stdlib' or 'orjson', not '{API_JSON_BACKEND}'.")
+
+REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = (
+    _json_renderer,
+    *(("apps.common.renderers.NDJSONRenderer",) if API_NDJSON_ENABLED else ()),
+    "rest_framework.renderers.BrowsableAPIRenderer",
+)
+REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'] = (
+    _json_parser,
+    "rest_framework.parsers.FormParser",
+    "rest_framework.parsers.MultiPartParser",
+)
+
+# --- Request Profiling ---
+# See apps.common.middleware.RequestProfilingMiddleware.
+
+PROFILING_ENABLED = config("PROFILING_ENABLED", default=False, cast=bool)
+
+# Requests slower than this (in milliseconds) are logged as slow.
+PROFILING_SLOW_REQUEST_MS = config("PROFILING_SLOW_REQUEST_MS", default=500, cast=float)
+
+# Requests running at least this many SQL queries are logged as query-heavy.
+PROFILING_QUERY_THRESHOLD = config("PROFILING_QUERY_THRESHOLD", default=50, cast=int)
+
+# Fraction (0.0 - 1.0) of requests that are run under cProfile and dumped to disk.
+PROFILING_SAMPLE_RATE = config("PROFILING_SAMPLE_RATE", default=0.0, cast=float)
+
+# Directory receiving the sampled pstats dumps.
+PROFILING_DUMP_DIR = config("PROFILING_DUMP_DIR", default=str(BASE_DIR / "profiles"))
+
+# --- Authentication ---
+# "database" loads the user row on every request (simplejwt's JWTAuthentication).
+# "cached" builds the user from the token claims and checks it against a short-lived
+# user state cache (see apps.common.authentication).
+JWT_AUTH_MODE = config("JWT_AUTH_MODE", default="database")
+
+if JWT_AUTH_MODE == "cached":
+    _authentication_class = "apps.common.authentication.CachedJWTAuthentication"
+elif JWT_AUTH_MODE == "database":
+    _authentication_class = "rest_framework_simplejwt.authentication.JWTAuthentication"
+else:
+    raise ImproperlyConfigured(f"JWT_AUTH_MODE must be 'database' or 'cached', not '{JWT_AUTH_MODE}'.")
+
+# Set JWT as the default authentication mechanism
+REST_FRAMEWORK['DEFAULT_AUTHENTICATION_CLASSES'] = (_authentication_class,)
+
+# Seconds a user's active flag, password hash, roles and revocation time are cached.
+AUTH_USER_CACHE_TTL = config("AUTH_USER_CACHE_TTL", default=60, cast=int)
+
+# Cache shared by every process (e.g. redis://localhost:6379/1). When unset the
+# user state cache is per-process and revocations elsewhere apply within the TTL.
+AUTH_CACHE_URL = config("AUTH_CACHE_URL", default="")
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "auth": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": AUTH_CACHE_URL,
+        "KEY_PREFIX": "auth",
+    } if AUTH_CACHE_URL else {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "auth",
+    },
+}
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=15),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "ROTATE_REFRESH_TOKENS": False,
     "BLACKLIST_AFTER_ROTATION": False,
-    "UPDATE_LAST_LOGIN": True,
+    # Writes auth_user.last_login on every token obtain.
+    "UPDATE_LAST_LOGIN": config("JWT_UPDATE_LAST_LOGIN", default=True, cast=bool),
+    # Tokens carry a hash of the password hash and stop working when it changes.
+    "CHECK_REVOKE_TOKEN": True,
+    "TOKEN_OBTAIN_SERIALIZER": "apps.common.authentication.TokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "apps.common.authentication.TokenRefreshSerializer",
 }
 
 
@@ -104,6 +199,24 @@ SPECTACULAR_SETTINGS = {
     'SERVE_INCLUDE_SCHEMA': False,
 }
 
+# --- OpenAPI Schema Cache ---
+# See apps.common.schema. The schema is generated once per code version and
+# served from memory; "manage.py build_schema" pre-renders it into this directory.
+OPENAPI_SCHEMA_CACHE = config("OPENAPI_SCHEMA_CACHE", default=True, cast=bool)
+OPENAPI_SCHEMA_DIR = config("OPENAPI_SCHEMA_DIR", default=str(BASE_DIR / "openapi"))
+
+# Version the cached schema is keyed on (e.g. the deployed git commit). When
+# empty, a hash of the project's sources is used.
+OPENAPI_SCHEMA_VERSION = config("OPENAPI_SCHEMA_VERSION", default="")
+
+# --- Admin ---
+# See apps.common.admin. Above this many rows (by the PostgreSQL planner's
+# estimate) changelists show the estimate instead of running COUNT(*).
+ADMIN_EXACT_COUNT_LIMIT = config("ADMIN_EXACT_COUNT_LIMIT", default=10000, cast=int)
+
+# A search on a related field matching more rows than this falls back to a join.
+ADMIN_SEARCH_RELATED_LIMIT = config("ADMIN_SEARCH_RELATED_LIMIT", default=1000, cast=int)
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
@@ -138,6 +251,24 @@ DATABASES = {
     )
 }
 
+# Optional read replicas (comma-separated URLs). Each becomes a "replica_<n>"
+# alias; safe API requests and admin changelists read from them (see
+# apps.common.db_routers), everything else uses the primary above.
+DATABASE_REPLICA_URLS = config("DATABASE_REPLICA_URLS", default="", cast=Csv())
+
+for _index, _url in enumerate(DATABASE_REPLICA_URLS):
+    DATABASES[f"replica_{_index}"] = {
+        **dj_database_url.parse(_url, conn_max_age=600),
+        # Tests read the rows they write through the primary's connection.
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["apps.common.db_routers.ReplicaRouter"]
+
+# Seconds a client reads from the primary after a write, so it sees its own changes.
+REPLICA_STICKY_SECONDS = config("REPLICA_STICKY_SECONDS", default=10, cast=int)
+REPLICA_STICKY_COOKIE = "db_primary"
+
 
 # --- Password Validation ---
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -187,26 +318,98 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
+# --- Transactional Outbox ---
+# See apps.common.outbox. Tasks are queued in the database and published by
+# "manage.py relay_outbox".
+OUTBOX_BATCH_SIZE = config("OUTBOX_BATCH_SIZE", default=100, cast=int)
+OUTBOX_POLL_INTERVAL = config("OUTBOX_POLL_INTERVAL", default=0.2, cast=float)
+OUTBOX_RETENTION_HOURS = config("OUTBOX_RETENTION_HOURS", default=24, cast=int)
+
+# --- Locks ---
+# See apps.common.locks. "auto" uses PostgreSQL advisory locks on PostgreSQL and
+# per-process locks otherwise; "redis" uses LOCK_REDIS_URL.
+LOCK_BACKEND = config("LOCK_BACKEND", default="auto")
+LOCK_REDIS_URL = config("LOCK_REDIS_URL", default=CELERY_BROKER_URL)
+
+# Seconds a migration waits for another migration to the same target VM.
+LOCK_WAIT_TIMEOUT = config("LOCK_WAIT_TIMEOUT", default=300, cast=float)
+
+# Seconds after which a Redis lock expires if its holder died.
+LOCK_REDIS_TTL = config("LOCK_REDIS_TTL", default=600, cast=int)
+
+
+# --- Migration Simulation ---
+# See apps.migration_manager.simulation. Per cloud type: transfer bandwidth in
+# GB/s, setup latency in seconds and overhead per mount point in seconds.
+SIMULATION_PROFILES = {
+    "aws": {"bandwidth_gb_per_s": 0.25, "setup_seconds": 60, "volume_overhead_seconds": 10},
+    "azure": {"bandwidth_gb_per_s": 0.2, "setup_seconds": 90, "volume_overhead_seconds": 15},
+    "vsphere": {"bandwidth_gb_per_s": 1.0, "setup_seconds": 20, "volume_overhead_seconds": 5},
+    "vcloud": {"bandwidth_gb_per_s": 0.5, "setup_seconds": 30, "volume_overhead_seconds": 8},
+}
+
+# Real seconds per modelled second: 0.01 runs a 40-minute transfer in 24 s,
+# 1 in real time and 0 skips the wait.
+SIMULATION_TIME_SCALE = config("SIMULATION_TIME_SCALE", default=0.01, cast=float)
+
+# Run-time estimates (apps.migration_manager.eta) are calibrated on the last
+# ETA_HISTORY_SIZE successful runs per cloud type, once there are
+# ETA_MIN_SAMPLES, and recalibrated every ETA_CACHE_SECONDS.
+ETA_HISTORY_SIZE = config("ETA_HISTORY_SIZE", default=200, cast=int)
+ETA_MIN_SAMPLES = config("ETA_MIN_SAMPLES", default=10, cast=int)
+ETA_CACHE_SECONDS = config("ETA_CACHE_SECONDS", default=300, cast=int)
+
+
+# --- Migration Progress ---
+# See apps.migration_manager.progress. Workers report progress to Redis and
+# "manage.py flush_progress" writes it to the database. The URL defaults to
+# the broker (e.g. redis://localhost:6379/2 for a database of its own). When
+# empty, progress is only visible in the process running the migration.
+PROGRESS_REDIS_URL = config("PROGRESS_REDIS_URL", default=CELERY_BROKER_URL)
+PROGRESS_TTL = config("PROGRESS_TTL", default=86400, cast=int)
+PROGRESS_FLUSH_INTERVAL = config("PROGRESS_FLUSH_INTERVAL", default=5, cast=float)
+PROGRESS_FLUSH_BATCH_SIZE = config("PROGRESS_FLUSH_BATCH_SIZE", default=1000, cast=int)
+
+
+# --- Migration Plans ---
+# Dry runs of POST /migrations/plan/: most ids per request, and ids planned per query.
+MIGRATION_PLAN_MAX_IDS = config("MIGRATION_PLAN_MAX_IDS", default=10000, cast=int)
+MIGRATION_PLAN_BATCH_SIZE = config("MIGRATION_PLAN_BATCH_SIZE", default=1000, cast=int)
+
+
+# --- Tracing ---
+# See apps.common.tracing. Trace ids are always propagated and logged; span
+# export is enabled by choosing an exporter: "none", "stdout" or "file".
+
+TRACING_EXPORTER = config("TRACING_EXPORTER", default="none")
+TRACING_EXPORT_PATH = config("TRACING_EXPORT_PATH", default=str(BASE_DIR / "traces.jsonl"))
+
 
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
+    "filters": {
+        "trace_context": {
+            "()": "apps.common.tracing.TraceContextFilter",
+        },
+    },
     "formatters": {
         "verbose": {
-            "format": "%(levelname)s %(asctime)s %(module)s %(process)d %(thread)d %(message)s",
+            "format": "%(levelname)s %(asctime)s %(module)s %(process)d %(thread)d [trace=%(trace_id)s] %(message)s",
         },
         "simple": {
             "format": "%(levelname)s %(message)s",
         },
         "json": {
             "class": "pythonjsonlogger.jsonlogger.JsonFormatter",
-            "format": "%(asctime)s %(name)s %(levelname)s %(message)s %(lineno)d",
+            "format": "%(asctime)s %(name)s %(levelname)s %(message)s %(lineno)d %(trace_id)s %(span_id)s",
         },
     },
     "handlers": {
         "console": {
             "level": "INFO",
             "class": "logging.StreamHandler",
+            "filters": ["trace_context"],
             "formatter": "json" if not DEBUG else "verbose",
         },
     },
@@ -0,0 +1,31 @@
+"""
+Lean Django settings for Celery workers.
+
+Workers only need the models and the ``tasks.py`` modules, so this profile
+drops the apps that exist for the HTTP API (admin, sessions, messages,
+static files, DRF, simplejwt and drf-spectacular) and the middleware. It
+inherits everything else (databases, Celery, caches, logging, encryption
+key) from :mod:`config.settings`.
+
+Start a worker with it:
+
+    DJANGO_SETTINGS_MODULE=config.settings_worker celery -A config worker -l info
+
+Compare the startup cost of both profiles with ``python -m benchmarks.import_profile``.
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS as _WEB_APPS
+
+# Needed by the models: auth and contenttypes for TokenRevocation.user, and
+# encrypted_model_fields for the credential passwords.
+WORKER_APPS = (
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "encrypted_model_fields",
+)
+
+INSTALLED_APPS = [app for app in _WEB_APPS if app in WORKER_APPS or app.startswith("apps.")]
+
+MIDDLEWARE = []
+ROOT_URLCONF = None
+TEMPLATES = []
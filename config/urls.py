@@ -4,10 +4,10 @@ URL configuration for the Migration Management project.
 from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import (
-    SpectacularAPIView,
     SpectacularRedocView,
     SpectacularSwaggerView,
 )
+from apps.common.schema import CachedSpectacularAPIView
 # Import Simple JWT views
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
@@ -20,12 +20,16 @@ api_v1_urls = [
     path("", include("apps.workloads.urls", namespace="workloads-api")),
     path("", include("apps.migration_manager.urls", namespace="migrations-api")),
     
+    # Async (ASGI) read endpoints for status polling and lookups
+    path("async/", include("apps.workloads.async_urls", namespace="workloads-async")),
+    path("async/", include("apps.migration_manager.async_urls", namespace="migrations-async")),
+
     # JWT Token endpoints
     path("token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     
     # OpenAPI 3 schema and documentation endpoints
-    path("schema/", SpectacularAPIView.as_view(), name="schema"),
+    path("schema/", CachedSpectacularAPIView.as_view(), name="schema"),
     path("schema/swagger-ui/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
     path("schema/redoc/", SpectacularRedocView.as_view(url_name="schema"), name="redoc"),
 ]
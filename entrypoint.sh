@@ -21,6 +21,14 @@ echo "PostgreSQL started"
 echo "Running database migrations..."
 python manage.py migrate --noinput
 
+# Pre-render the OpenAPI schema so that the API processes do not generate it.
+# Only one container per deployment does this (BUILD_OPENAPI_SCHEMA=1): the
+# build removes the files of other versions, and the worker settings have no API.
+if [ "${BUILD_OPENAPI_SCHEMA:-0}" = "1" ]; then
+  echo "Building the OpenAPI schema..."
+  python manage.py build_schema
+fi
+
 # Replace the current shell process with the command passed to the script (e.g., gunicorn).
 # Using 'exec' is crucial for ensuring that the main application process becomes PID 1,
 # allowing it to receive signals (like SIGTERM) from the Docker daemon correctly.